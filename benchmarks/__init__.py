@@ -0,0 +1,3 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 17/10/2026
@@ -0,0 +1,9 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 17/10/2026
+
+import sys
+
+from benchmarks.suite import main
+
+sys.exit(main())
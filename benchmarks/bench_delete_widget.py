@@ -0,0 +1,40 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 16/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PySide2 import QtWidgets
+from drive_cleanup import gui
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GUI thread time of delete list size updates")
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--updates", type=int, default=20000)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication(sys.argv[:1])
+    widget = gui.QDeleteWidget()
+    paths = ["/shows/show/scenes/shot_{0:05d}".format(i) for i in range(args.items)]
+    for path in paths:
+        widget._add(os.path.basename(path), None, path, int(), float())
+
+    start = time.time()
+    for i_update in range(args.updates):
+        widget._size_changed(paths[i_update % args.items], float(i_update * 1e+6), True)
+    elapsed = time.time() - start
+    print("{0:>10} {1:>14}".format("seconds", "updates/sec"))
+    print("{0:>10.2f} {1:>14.0f}".format(elapsed, args.updates / elapsed))
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
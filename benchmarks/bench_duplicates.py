@@ -0,0 +1,78 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 17/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import os
+import sys
+import time
+import shutil
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from drive_cleanup import convert_size
+from drive_cleanup.duplicates import DUPLICATE_BLOCK, DuplicateFinder, HashCache
+
+
+def make_plates(root, shows, plates, copies, size):
+    # Every plate is copied into `copies` shows. For each plate there is also a file of the same size that
+    # differs only in the middle, which only the full hash can tell apart, one that differs in its first
+    # block, and a hard link that must not count as a duplicate.
+    rng = random.Random(0)
+    for i_plate in range(plates):
+        data = bytearray(rng.getrandbits(8) for _ in range(256)) * (size // 256)
+        middle = bytearray(data)
+        middle[size // 2] ^= 0xFF
+        start = bytearray(data)
+        start[0] ^= 0xFF
+        for i_copy in range(copies):
+            folder = os.path.join(root, "show_{0:02d}".format((i_plate + i_copy) % shows), "scenes",
+                                  "sh{0:03d}".format(i_plate), "plates")
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+            with open(os.path.join(folder, "plate.exr"), "wb") as f_out:
+                f_out.write(data)
+        extra = os.path.join(root, "show_{0:02d}".format(i_plate % shows), "scenes", "sh{0:03d}".format(i_plate))
+        for name, content in (("middle.exr", middle), ("start.exr", start)):
+            with open(os.path.join(extra, name), "wb") as f_out:
+                f_out.write(content)
+        os.link(os.path.join(extra, "plates", "plate.exr"), os.path.join(extra, "plate_link.exr"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Duplicate detection cost per stage, cold and with the hash cache")
+    parser.add_argument("--shows", type=int, default=4)
+    parser.add_argument("--plates", type=int, default=50)
+    parser.add_argument("--copies", type=int, default=3)
+    parser.add_argument("--size", type=int, default=8 * 1024 ** 2, help="Bytes per plate")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--root", default=None, help="Directory to build the tree in, defaults to a temp dir")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="drive_cleanup_bench_", dir=args.root)
+    try:
+        make_plates(root, args.shows, args.plates, args.copies, max(args.size, 4 * DUPLICATE_BLOCK))
+        shows = [os.path.join(root, name) for name in sorted(os.listdir(root))]
+        print("{0:>8} {1:>6} {2:>8} {3:>8} {4:>9} {5:>9} {6:>7} {7:>12} {8:>8}".format(
+            "workers", "cache", "files", "size eq", "partial", "full", "groups", "reclaimable", "seconds"))
+        for workers in args.workers:
+            cache = HashCache(os.path.join(root, "hashes_{0}.sqlite".format(workers)))
+            for run in ("cold", "warm"):
+                finder = DuplicateFinder(workers=workers, cache=cache)
+                start = time.time()
+                groups = list(finder.find(shows))
+                elapsed = time.time() - start
+                stats = finder.stats
+                print("{0:>8} {1:>6} {2:>8} {3:>8} {4:>9} {5:>9} {6:>7} {7:>12} {8:>8.2f}".format(
+                    workers, run, stats["files"], stats["same_size"], stats["partial_hashed"],
+                    stats["full_hashed"], len(groups), convert_size(stats["reclaimable"])[0], elapsed))
+                assert len(groups) == args.plates and all(len(group.paths) == args.copies for group in groups)
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
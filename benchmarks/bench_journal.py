@@ -0,0 +1,68 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 16/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import drive_cleanup
+from drive_cleanup.journal import PurgeJournal
+from synthetic_tree import make_tree
+
+
+def per_file_logging(root):
+    # What the old _remove_item paid per file and directory with DEBUG off: the message is formatted
+    # before logging.debug gets to drop it. Timed over the same paths without deleting anything.
+    paths = []
+    for directory, dirs, files in os.walk(root):
+        paths.extend(os.path.join(directory, name) for name in files + dirs)
+    start = time.time()
+    for path in paths:
+        logging.debug("Deleting File: {0}".format(path))
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of the purge audit journal, 1M files by default")
+    parser.add_argument("--shots", type=int, default=20)
+    parser.add_argument("--dirs", type=int, default=50)
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=drive_cleanup.PURGE_WORKERS)
+    parser.add_argument("--root", default=None, help="Directory to build the tree in, defaults to a temp dir")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    print("{0:>16} {1:>10} {2:>10} {3:>12} {4:>12}".format("journal", "files", "seconds", "files/sec",
+                                                           "journal MB"))
+    for mode in ("none", "jsonl", "per-file debug"):
+        root = tempfile.mkdtemp(prefix="drive_cleanup_bench_", dir=args.root)
+        journal_dir = tempfile.mkdtemp(prefix="drive_cleanup_journal_")
+        try:
+            make_tree(root, args.shots, args.dirs, args.files)
+            journal = PurgeJournal(os.path.join(journal_dir, "purge.jsonl")) if mode == "jsonl" else None
+            logged = per_file_logging(root) if mode == "per-file debug" else float()
+            engine = drive_cleanup.PurgeEngine(workers=args.workers, journal=journal)
+            start = time.time()
+            result = engine.purge(root)
+            elapsed = time.time() - start + logged
+            size = float()
+            if journal is not None:
+                journal.close()
+                size = os.path.getsize(journal.path) / 1024 ** 2
+            print("{0:>16} {1:>10} {2:>10.2f} {3:>12.0f} {4:>12.1f}".format(mode, result.total_files, elapsed,
+                                                                         result.total_files / elapsed, size))
+        finally:
+            shutil.rmtree(root)
+            shutil.rmtree(journal_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 17/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import drive_cleanup
+from drive_cleanup.metrics import Metrics
+from synthetic_tree import make_tree
+
+
+def _walk(paths):
+    start = time.time()
+    for path in paths:
+        drive_cleanup.walk_size(path)
+    return time.time() - start
+
+
+def _purge(root, args):
+    paths = make_tree(root, args.shots, args.dirs, args.files, file_size=0)
+    engine = drive_cleanup.PurgeEngine()
+    start = time.time()
+    for path in paths:
+        engine.purge(path)
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="What collecting metrics costs the walker and the purge")
+    parser.add_argument("--shots", type=int, default=20)
+    parser.add_argument("--dirs", type=int, default=20)
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    metrics = Metrics.instance()
+    root = tempfile.mkdtemp(prefix="drive_cleanup_bench_")
+    try:
+        paths = make_tree(os.path.join(root, "walk"), args.shots, args.dirs, args.files)
+        files = args.shots * args.dirs * args.files
+        print("{0:>8} {1:>10} {2:>12} {3:>10} {4:>12}".format("metrics", "walk s", "walk files/s", "purge s",
+                                                             "purge files/s"))
+        for enabled in (False, True, False, True):
+            metrics.enable(enabled)
+            walk = min(_walk(paths) for _i_run in range(args.repeat))
+            purge = _purge(os.path.join(root, "purge_{0}".format(time.time())), args)
+            print("{0:>8} {1:>10.3f} {2:>12.0f} {3:>10.3f} {4:>12.0f}".format("on" if enabled else "off", walk,
+                                                                              files / walk, purge, files / purge))
+        print()
+        print(metrics.to_prometheus())
+    finally:
+        metrics.enable(False)
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
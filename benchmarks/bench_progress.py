@@ -0,0 +1,113 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 16/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PySide2 import QtCore
+from PySide2 import QtWidgets
+import drive_cleanup
+from drive_cleanup import gui
+from synthetic_tree import make_tree
+
+
+class Emitter(QtCore.QObject):
+    itemSizeUpdated = QtCore.Signal(str, float, bool)
+
+
+class Counters(object):
+    def __init__(self):
+        self.finished = int()
+        self.emitted = int()
+        self.delivered = int()
+        self.backlog = int()
+        self.stall = float()
+
+
+def run(app, paths, mode, step):
+    widget = gui.QDeleteWidget()
+    for path in paths:
+        widget._add(os.path.basename(path), None, path, int(), float())
+    counters = Counters()
+    size_changed = widget._size_changed
+
+    def _size_changed(*args):
+        counters.delivered += 1
+        size_changed(*args)
+    widget._size_changed = _size_changed
+
+    emitter = Emitter()
+    emitter.itemSizeUpdated.connect(widget._size_changed, QtCore.Qt.QueuedConnection)
+    table = widget._scan_progress
+
+    def _report(path, size, final):
+        counters.emitted += 1
+        if mode == "signals":
+            emitter.itemSizeUpdated.emit(path, float(size), not final)
+        else:
+            table.update(path, size=float(size), files=int(), final=final)
+
+    def _scan(path):
+        result = drive_cleanup.walk_size(path, progress=lambda size: _report(path, size, False), step=step)
+        _report(path, result.size, True)
+        counters.finished += 1
+
+    executor = drive_cleanup.ScanExecutor(max_workers=8, volume_workers=8)
+    start = time.time()
+    for path in paths:
+        executor.submit(path, _scan, [path])
+
+    last = [time.time()]
+
+    def _probe():
+        now = time.time()
+        counters.stall = max(counters.stall, now - last[0])
+        backlog = counters.emitted - counters.delivered if mode == "signals" else len(table)
+        counters.backlog = max(counters.backlog, backlog)
+        last[0] = now
+    probe = QtCore.QTimer()
+    probe.setInterval(10)
+    probe.timeout.connect(_probe)
+    probe.start()
+
+    while counters.finished < len(paths) or \
+            (counters.emitted != counters.delivered if mode == "signals" else len(table)):
+        app.processEvents()
+    elapsed = time.time() - start
+    probe.stop()
+    executor.shutdown()
+    return elapsed, counters
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GUI responsiveness while sizing many items at once")
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--file-size", type=int, default=2 * 1024 * 1024)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication(sys.argv[:1])
+    root = tempfile.mkdtemp(prefix="drive_cleanup_bench_")
+    try:
+        paths = make_tree(root, args.items, 1, args.files, args.file_size)
+        print("{0:>8} {1:>9} {2:>9} {3:>10} {4:>11} {5:>13}".format(
+            "mode", "seconds", "updates", "gui calls", "max backlog", "max stall ms"))
+        for mode in ("signals", "table"):
+            elapsed, counters = run(app, paths, mode, 1e+6)
+            print("{0:>8} {1:>9.2f} {2:>9} {3:>10} {4:>11} {5:>13.1f}".format(
+                mode, elapsed, counters.emitted, counters.delivered, counters.backlog, counters.stall * 1000))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 16/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import drive_cleanup
+from synthetic_tree import make_tree
+
+
+def _small_items(args):
+    # Many small shots purged one after the other, what a cleanup of short lived folders looks like. The
+    # engine's workers are shared by the items, rmtree is the floor.
+    print("{0:>10} {1:>10} {2:>12}".format("engine", "seconds", "items/sec"))
+    for name in ["rmtree"] + ["workers={0}".format(workers) for workers in args.workers]:
+        root = tempfile.mkdtemp(prefix="drive_cleanup_bench_", dir=args.root)
+        try:
+            paths = make_tree(root, args.small_items, 1, 5, file_size=0)
+            start = time.time()
+            if name == "rmtree":
+                for path in paths:
+                    shutil.rmtree(path)
+            else:
+                engine = drive_cleanup.PurgeEngine(workers=int(name.partition("=")[2]), batch_size=args.batch_size)
+                for path in paths:
+                    engine.purge(path, remove_root=True)
+            elapsed = time.time() - start
+            print("{0:>10} {1:>10.2f} {2:>12.0f}".format(name, elapsed, len(paths) / elapsed))
+        finally:
+            shutil.rmtree(root)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deletion throughput against purge worker count")
+    parser.add_argument("--shots", type=int, default=20)
+    parser.add_argument("--dirs", type=int, default=25)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--batch-size", type=int, default=drive_cleanup.PURGE_BATCH_SIZE)
+    parser.add_argument("--plan", action="store_true",
+                        help="Plan each purge first and execute the plan, the estimate uses the previous run's rate")
+    parser.add_argument("--root", default=None, help="Directory to build the tree in, defaults to a temp dir")
+    parser.add_argument("--small-items", type=int, default=0, metavar="COUNT",
+                        help="Purge COUNT small shots one by one instead, against shutil.rmtree")
+    args = parser.parse_args()
+    if args.small_items:
+        return _small_items(args)
+
+    print("{0:>8} {1:>10} {2:>12} {3:>8} {4:>10} {5:>10}".format("workers", "seconds", "files/sec", "errors",
+                                                                "plan sec", "estimate"))
+    for workers in args.workers:
+        root = tempfile.mkdtemp(prefix="drive_cleanup_bench_", dir=args.root)
+        try:
+            make_tree(root, args.shots, args.dirs, args.files)
+            engine = drive_cleanup.PurgeEngine(workers=workers, batch_size=args.batch_size)
+            planned = estimate = float()
+            if args.plan:
+                start = time.time()
+                plan = engine.plan(root)
+                planned = time.time() - start
+                estimate = plan.eta
+            start = time.time()
+            result = engine.execute(plan) if args.plan else engine.purge(root)
+            elapsed = time.time() - start
+            print("{0:>8} {1:>10.2f} {2:>12.0f} {3:>8} {4:>10.2f} {5:>10.2f}".format(
+                workers, elapsed, result.total_files / elapsed, result.total_errors, planned, estimate))
+        finally:
+            shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
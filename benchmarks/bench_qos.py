@@ -0,0 +1,125 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 17/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import drive_cleanup
+from drive_cleanup.qos import IOBudget, IOScheduler
+from latency import LatentFilesystem, queue_latency
+from synthetic_tree import make_tree
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)] if values else float("nan")
+
+
+class Render(object):
+    # Another client of the NAS, a render reading frames at a steady rate, and the latency it gets.
+    def __init__(self, filesystem, path, rate):
+        self._filesystem = filesystem
+        self._path = path
+        self._rate = rate
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self.latencies = []
+
+    def _run(self):
+        while not self._stopped.is_set():
+            start = time.time()
+            self._filesystem.delay("stat", self._path)
+            self.latencies.append(time.time() - start)
+            self._stopped.wait(1 / self._rate)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        self._thread.join()
+
+
+def _run(root, args, scheduler, throttled):
+    # Sizes then purges a fresh tree on the loaded NAS while the render reads from it.
+    paths = make_tree(root, args.shots, args.dirs, args.files, file_size=0)
+    scheduler.enable(throttled)
+    timeline = []
+    with LatentFilesystem(root, queue_latency(args.capacity, args.round_trip)) as filesystem:
+        with Render(filesystem, root + "/render", args.render_rate) as render:
+            executor = drive_cleanup.ScanExecutor(max_workers=4, volume_workers=4)
+            start = time.time()
+            try:
+                scanned = sum(result.files for _path, result in drive_cleanup.scan_items(
+                    paths, drive_cleanup.SizeIndex(os.path.join(root, "index.sqlite")), executor))
+            finally:
+                executor.shutdown()
+            scan_seconds = time.time() - start
+            engine = drive_cleanup.PurgeEngine(workers=args.workers)
+
+            def _sample(batch):
+                state = scheduler.snapshot()
+                if state:
+                    rate, limit, latency, _budget = list(state.values())[0]
+                    timeline.append((time.time() - start, rate, limit, latency))
+            start_purge = time.time()
+            purged = sum(engine.purge(path, progress=_sample).total_files for path in paths)
+            purge_seconds = time.time() - start_purge
+    scheduler.enable(False)
+    return scanned / scan_seconds, purged / purge_seconds, render.latencies, timeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scans and purges on a NAS that slows down under load, flat out "
+                                                 "against paced by the I/O scheduler, and what a render reading "
+                                                 "from the same NAS sees meanwhile")
+    parser.add_argument("--shots", type=int, default=16)
+    parser.add_argument("--dirs", type=int, default=5)
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent unlink calls of the purge")
+    parser.add_argument("--capacity", type=float, default=1500.0, help="Calls per second the NAS serves")
+    parser.add_argument("--round-trip", type=float, default=0.0005)
+    parser.add_argument("--render-rate", type=float, default=100.0, help="Reads per second of the render")
+    parser.add_argument("--target", type=float, default=0.005, help="Latency the scheduler holds the NAS to")
+    parser.add_argument("--rate", type=float, default=0, help="Ops/sec budget, 0 is unlimited")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent calls budget")
+    args = parser.parse_args()
+
+    scheduler = IOScheduler.instance()
+    scheduler.configure(target=args.target, budgets=[IOBudget(0, 24, args.rate, args.concurrency)])
+    root = tempfile.mkdtemp(prefix="drive_cleanup_bench_")
+    try:
+        print("{0:>10} {1:>10} {2:>10} {3:>12} {4:>12}".format("scheduler", "scan f/s", "purge f/s",
+                                                               "render p50", "render p90"))
+        for throttled in (False, True):
+            scan_rate, purge_rate, render, timeline = _run(os.path.join(root, str(throttled)), args, scheduler,
+                                                           throttled)
+            print("{0:>10} {1:>10.0f} {2:>10.0f} {3:>10.1f}ms {4:>10.1f}ms".format(
+                "on" if throttled else "off", scan_rate, purge_rate, _percentile(render, 0.5) * 1000,
+                _percentile(render, 0.9) * 1000))
+        print("\nscheduler during the purge, target {0:.1f}ms".format(args.target * 1000))
+        print("{0:>8} {1:>10} {2:>6} {3:>12}".format("seconds", "ops/sec", "calls", "p90 latency"))
+        shown = None
+        for seconds, rate, limit, latency in timeline:
+            if (rate, limit) != shown and latency is not None:
+                shown = (rate, limit)
+                print("{0:>8.2f} {1:>10} {2:>6} {3:>10.1f}ms".format(seconds, "{0:.0f}".format(rate) if rate else "-",
+                                                                     limit, latency * 1000))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
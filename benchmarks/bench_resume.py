@@ -0,0 +1,105 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 17/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PACKAGE_ROOT)
+from drive_cleanup import core
+from drive_cleanup.journal import PurgeCheckpoint
+from synthetic_tree import make_tree
+
+
+def tree_state(root):
+    dirs = set()
+    files = int()
+    for directory, _dirs, names in os.walk(root):
+        dirs.add(directory.replace("\\", "/"))
+        files += len(names)
+    return dirs, files
+
+
+def resume(checkpoint_dir, index_path):
+    # Resumes in this process with the directory listings counted.
+    listed = []
+    scandir = core._scandir
+
+    def _counted(path):
+        listed.append(path)
+        return scandir(path)
+
+    core._scandir = _counted
+    skipped = set()
+    try:
+        checkpoints = PurgeCheckpoint.interrupted(checkpoint_dir)
+        for checkpoint in checkpoints:
+            skipped |= checkpoint.done
+            list(core.purge_items(checkpoint.resume(), index=core.SizeIndex(index_path),
+                                  remove_root=checkpoint.remove_root, checkpoint=checkpoint))
+    finally:
+        core._scandir = scandir
+    return len(checkpoints), listed, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kill purges at random points and check the resumes")
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument("--shots", type=int, default=6)
+    parser.add_argument("--dirs", type=int, default=40)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--max-delay", type=float, default=0.6, help="Latest kill, in seconds after launch")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--root", default=None, help="Directory to build the trees in, defaults to a temp dir")
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    print("{0:>6} {1:>8} {2:>10} {3:>8} {4:>8} {5:>8} {6:>8} {7:>6}".format(
+        "trial", "killed", "files left", "existing", "listed", "skipped", "extra", "ok"))
+    failures = int()
+    for i_trial in range(args.trials):
+        work = tempfile.mkdtemp(prefix="drive_cleanup_bench_", dir=args.root)
+        try:
+            root = os.path.join(work, "tree")
+            checkpoint_dir = os.path.join(work, "checkpoints")
+            index_path = os.path.join(work, "index.sqlite")
+            shots = make_tree(root, args.shots, args.dirs, args.files)
+            _dirs, total_files = tree_state(root)
+
+            delay = random.uniform(0, args.max_delay)
+            env = dict(os.environ, PYTHONPATH=PACKAGE_ROOT)
+            process = subprocess.Popen([sys.executable, "-m", "drive_cleanup", "purge", root, "--yes", "--no-journal",
+                                        "--index", index_path, "--checkpoints", checkpoint_dir, "--purge-workers", "4",
+                                        "--output", os.devnull], env=env)
+            time.sleep(delay)
+            process.kill()
+            process.wait()
+
+            existing, files_left = tree_state(root)
+            operations, listed, skipped = resume(checkpoint_dir, index_path)
+            # Only directories that still existed and were not finished may be listed again.
+            extra = [path for path in listed if path in skipped or path not in existing]
+            _dirs, files_after = tree_state(root)
+            finished = files_after == 0 and all(not os.listdir(shot) for shot in shots)
+            # A purge killed before it began has nothing to resume and must not have removed anything.
+            ok = not extra and (finished if operations else files_left in (0, total_files))
+            failures += not ok
+            print("{0:>6} {1:>8.2f} {2:>10} {3:>8} {4:>8} {5:>8} {6:>8} {7:>6}".format(
+                i_trial, delay, files_left, len(existing), len(listed), len(skipped), len(extra), str(ok)))
+        finally:
+            shutil.rmtree(work)
+    print("{0} of {1} resumes failed".format(failures, args.trials))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,53 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 16/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import drive_cleanup
+from synthetic_tree import make_tree
+
+
+def run(paths, entries, workers):
+    executor = drive_cleanup.ScanExecutor(max_workers=workers, volume_workers=workers)
+    # A fresh index per run, otherwise every run after the first is served from the cache.
+    db_dir = tempfile.mkdtemp(prefix="drive_cleanup_index_")
+    index = drive_cleanup.SizeIndex(os.path.join(db_dir, "index.sqlite"))
+    start = time.time()
+    for _path, _result in drive_cleanup.scan_items(paths, index=index, executor=executor):
+        pass
+    elapsed = time.time() - start
+    executor.shutdown()
+    shutil.rmtree(db_dir, ignore_errors=True)
+    return entries / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Directory entries per second against scan pool size")
+    parser.add_argument("--shots", type=int, default=100)
+    parser.add_argument("--dirs", type=int, default=10)
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="drive_cleanup_bench_")
+    try:
+        paths = make_tree(root, args.shots, args.dirs, args.files)
+        entries = args.shots * args.dirs * (args.files + 1)
+        print("{0:>8} {1:>14}".format("workers", "entries/sec"))
+        for workers in args.workers:
+            print("{0:>8} {1:>14.0f}".format(workers, run(paths, entries, workers)))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
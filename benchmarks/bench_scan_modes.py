@@ -0,0 +1,55 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 16/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import drive_cleanup
+from synthetic_tree import make_tree
+
+
+def run(root, workers, processes):
+    scanner = drive_cleanup.ShardScanner(workers=workers, processes=processes)
+    try:
+        # Pool start up is not part of the scan.
+        scanner.scan(root)
+        start = time.time()
+        result = scanner.scan(root)
+        return time.time() - start, result
+    finally:
+        scanner.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Thread pool against process pool scans of one large tree")
+    parser.add_argument("--shots", type=int, default=100)
+    parser.add_argument("--dirs", type=int, default=20)
+    parser.add_argument("--files", type=int, default=1000, help="Files per directory, 2M files with the defaults")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, multiprocessing.cpu_count()])
+    parser.add_argument("--root", default=None, help="Directory to build the tree in, defaults to a temp dir")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="drive_cleanup_bench_", dir=args.root)
+    try:
+        make_tree(root, shots=args.shots, dirs_per_shot=args.dirs, files_per_dir=args.files, file_size=64)
+        print("{0} files, {1} CPUs".format(args.shots * args.dirs * args.files, multiprocessing.cpu_count()))
+        print("{0:>8} {1:>8} {2:>10} {3:>12}".format("mode", "workers", "seconds", "files/sec"))
+        for workers in sorted(set(args.workers)):
+            for mode, processes in (("thread", False), ("process", True)):
+                elapsed, result = run(root, workers, processes)
+                print("{0:>8} {1:>8} {2:>10.2f} {3:>12.0f}".format(mode, workers, elapsed, result.files / elapsed))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
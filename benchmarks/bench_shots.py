@@ -0,0 +1,102 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 16/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import scandir
+from PySide2 import QtCore
+from PySide2 import QtWidgets
+from drive_cleanup import gui
+from synthetic_tree import make_tree
+
+
+class LegacyShotsThread(QtCore.QThread):
+    # GetShotsThread before paging: full listdir per folder and one signal per shot.
+    shotFound = QtCore.Signal(str, float, str)
+
+    def __init__(self, path):
+        super(LegacyShotsThread, self).__init__()
+        self._path = path
+
+    def run(self):
+        path = str(self._path).replace("\\", "/")
+        if not os.path.exists(path) or not os.listdir(path):
+            return
+
+        for entry in scandir.scandir(path):
+            if not entry.is_dir():
+                continue
+            path = entry.path.replace("\\", "/")
+            if not os.listdir(path):
+                continue
+            self.shotFound.emit(entry.name, os.path.getmtime(path), path)
+
+
+def wait(app, thread, widget, started):
+    first = None
+    while thread.isRunning() or first is None:
+        app.processEvents()
+        if first is None and widget.count():
+            first = time.time() - started
+        if not thread.isRunning() and not widget.count():
+            break
+    app.processEvents()
+    return first or float(), time.time() - started
+
+
+def legacy_list(app, root):
+    widget = gui.QShotWidget()
+    widget.show()
+    thread = LegacyShotsThread(root)
+    thread.shotFound.connect(lambda name, mtime, path: widget._model.addRecords(
+        [{"name": name, "mtime": mtime, "path": path}]))
+    started = time.time()
+    thread.start()
+    first, total = wait(app, thread, widget, started)
+    return first, total, widget.count()
+
+
+def paged_list(app, root):
+    widget = gui.QShotWidget()
+    widget.show()
+    started = time.time()
+    widget.fetchMore(root)
+    first, total = wait(app, widget._thread, widget, started)
+    return first, total, widget.count()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Contents list load time, per-shot signals vs paged batches")
+    parser.add_argument("--shots", type=int, default=5000)
+    parser.add_argument("--files", type=int, default=100, help="Files in each shot folder")
+    parser.add_argument("--root", default=None, help="Directory to build the tree in, defaults to a temp dir")
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+    root = tempfile.mkdtemp(dir=args.root)
+    try:
+        make_tree(root, shots=args.shots, dirs_per_shot=1, files_per_dir=0)
+        for name in os.listdir(root):
+            shot_path = os.path.join(root, name)
+            for i_file in range(args.files):
+                open(os.path.join(shot_path, "file.{0:04d}".format(i_file)), "w").close()
+
+        print("{0:>8} {1:>12} {2:>10} {3:>8}".format("mode", "first row", "seconds", "rows"))
+        for name, fn in (("legacy", legacy_list), ("paged", paged_list)):
+            first, total, rows = fn(app, root)
+            print("{0:>8} {1:>12.3f} {2:>10.2f} {3:>8}".format(name, first, total, rows))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
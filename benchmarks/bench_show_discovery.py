@@ -0,0 +1,61 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 16/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import drive_cleanup
+from latency import LatentFilesystem
+
+
+def make_shows(root, shows, base_paths):
+    bases = [os.path.join(root, "base_{0}".format(i_base)).replace("\\", "/") for i_base in range(base_paths)]
+    records = []
+    for i_show in range(shows):
+        name = "show_{0:04d}".format(i_show)
+        # Each show lives on one base path, the probes on the others miss.
+        scenes = os.path.join(bases[i_show % base_paths], name, "scenes", "shot_0000")
+        os.makedirs(scenes)
+        records.append({"code": name, "sg_status": "active"})
+    return bases, records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show discovery time on a mount with simulated latency")
+    parser.add_argument("--shows", type=int, default=500)
+    parser.add_argument("--base-paths", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds added to each stat and listing")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, drive_cleanup.SHOW_PROBE_WORKERS])
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="drive_cleanup_bench_")
+    try:
+        bases, records = make_shows(root, args.shows, args.base_paths)
+        provider = drive_cleanup.StaticShowProvider(records)
+        print("{0:>8} {1:>12} {2:>10} {3:>8}".format("workers", "first show", "full list", "shows"))
+        for workers in args.workers:
+            with LatentFilesystem(root, args.latency):
+                start = time.time()
+                first = None
+                found = int()
+                for _show in drive_cleanup.discover_shows(provider, base_paths=bases, local_storage="",
+                                                          workers=workers):
+                    found += 1
+                    if first is None:
+                        first = time.time() - start
+                total = time.time() - start
+            print("{0:>8} {1:>12.3f} {2:>10.3f} {3:>8}".format(workers, first or float(), total, found))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 16/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PySide2 import QtWidgets
+from drive_cleanup import gui
+
+
+class DrainingShotWidget(gui.QShotWidget):
+    # New listings wait for the previous walk to run to the end instead of cancelling it.
+    def cancel(self, wait=False):
+        for thread in self._threads:
+            thread.wait()
+
+
+def make_shows(root, shows, shots):
+    paths = []
+    for i_show in range(shows):
+        show_path = os.path.join(root, "show_{0:02d}".format(i_show), "scenes")
+        for i_shot in range(shots):
+            shot_path = os.path.join(show_path, "shot_{0:04d}".format(i_shot))
+            os.makedirs(shot_path)
+            open(os.path.join(shot_path, "scene.ma"), "w").close()
+        paths.append(show_path.replace("\\", "/"))
+    return paths
+
+
+def click_through(app, widget, paths, interval):
+    latencies = []
+    for path in paths:
+        clicked = time.time()
+        widget.fetchMore(path)
+        first = None
+        while time.time() - clicked < interval or (path is paths[-1] and first is None):
+            app.processEvents()
+            if first is None and widget.count():
+                first = time.time() - clicked
+        latencies.append(first)
+    widget.cancel(wait=True)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Click to first row latency when switching shows quickly")
+    parser.add_argument("--shows", type=int, default=20)
+    parser.add_argument("--shots", type=int, default=3000)
+    parser.add_argument("--interval", type=float, default=0.05, help="Seconds between clicks")
+    parser.add_argument("--root", default=None, help="Directory to build the tree in, defaults to a temp dir")
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+    root = tempfile.mkdtemp(dir=args.root)
+    try:
+        paths = make_shows(root, args.shows, args.shots)
+        print("{0:>10} {1:>8} {2:>10} {3:>10} {4:>10}".format("mode", "shown", "median ms", "max ms", "last ms"))
+        for name, widget_class in (("drain", DrainingShotWidget), ("supersede", gui.QShotWidget)):
+            widget = widget_class()
+            widget.show()
+            latencies = click_through(app, widget, paths, args.interval)
+            shown = sorted(latency for latency in latencies if latency is not None)
+            median = shown[len(shown) // 2] if shown else float("nan")
+            maximum = shown[-1] if shown else float("nan")
+            print("{0:>10} {1:>5}/{2:<2} {3:>10.1f} {4:>10.1f} {5:>10.1f}".format(
+                name, len(shown), len(paths), median * 1000, maximum * 1000, latencies[-1] * 1000))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 16/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import os
+import sys
+import math
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import drive_cleanup
+from drive_cleanup import sizes
+
+
+def legacy_convert_size(_bytes):
+    # convert_size before it compared against SIZE_POWERS.
+    if _bytes == 0:
+        return "0B", 0
+    size_str = ("B", "KB", "MB", "GB", "TB", "PB", "EB", "ZB", "YB")
+    log = int(math.floor(math.log(_bytes, 1024)))
+    powered = math.pow(1024, log)
+    size = round(_bytes / powered, 2)
+    gigabyte = round(_bytes / math.pow(1024, 3), 2)
+    return "{0} {1}".format(size, size_str[log]), gigabyte
+
+
+def per_value(fn, values):
+    return [fn(value) for value in values]
+
+
+def bulk(values):
+    return sizes.format_sizes(values), sizes.gigabytes(values)
+
+
+def bulk_without_numpy(values):
+    numpy, sizes.numpy = sizes.numpy, None
+    try:
+        return bulk(values)
+    finally:
+        sizes.numpy = numpy
+
+
+def check_rollup(values, shows=50):
+    # Show folders directly under the base paths, as list_items returns them, roll up one group per show.
+    bases = ["/mnt/projects", "/mnt/archive"]
+    items = [("{0}/show_{1:03d}".format(bases[i_value % 2], i_value % shows),
+              drive_cleanup.ScanResult(value, 1, 1, float(i_value))) for i_value, value in enumerate(values)]
+    start = time.time()
+    groups = sizes.rollup_by_show(items, bases)
+    elapsed = time.time() - start
+    assert sorted(group.group for group in groups) == ["show_{0:03d}".format(i_show) for i_show in range(shows)]
+    assert sum(group.size for group in groups) == sum(values)
+    print("{0:>20} {1:>10.2f} {2:>14.0f}".format("rollup by show", elapsed, len(values) / elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per value convert_size against bulk size formatting")
+    parser.add_argument("--values", type=int, default=1000000)
+    args = parser.parse_args()
+
+    random.seed(1)
+    values = [int(random.lognormvariate(16, 4)) for _i in range(args.values)]
+    expected = [drive_cleanup.convert_size(value)[0] for value in values]
+
+    print("{0:>20} {1:>10} {2:>14}".format("implementation", "seconds", "values/sec"))
+    runs = [("legacy convert_size", lambda: per_value(legacy_convert_size, values)),
+            ("convert_size", lambda: per_value(drive_cleanup.convert_size, values)),
+            ("bulk, no numpy", lambda: bulk_without_numpy(values))]
+    if sizes.numpy is not None:
+        runs.append(("bulk, numpy", lambda: bulk(values)))
+    for name, fn in runs:
+        start = time.time()
+        result = fn()
+        elapsed = time.time() - start
+        if name.startswith("bulk"):
+            assert list(result[0]) == expected, name
+        print("{0:>20} {1:>10.2f} {2:>14.0f}".format(name, elapsed, len(values) / elapsed))
+    check_rollup(values)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 16/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import re
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PySide2 import QtCore
+from PySide2 import QtWidgets
+import drive_cleanup
+from drive_cleanup import gui
+
+
+class LegacyTreeWidgetItem(QtWidgets.QTreeWidgetItem):
+    def __lt__(self, other_item):
+        column = self.treeWidget().sortColumn()
+        if str(self.text(column)).isdigit():
+            return int(str(self.text(column))) < int(str(other_item.text(column)))
+        elif "GB" in self.text(column):
+            regex = r"<(.+)>"
+            value = re.findall(regex, self.text(column))
+            other_value = re.findall(regex, other_item.text(column))
+            return value < other_value
+        elif QtCore.QDateTime.fromString(str(self.text(column))).isValid():
+            current_time = QtCore.QDateTime.fromString(str(self.text(column)))
+            other_time = QtCore.QDateTime.fromString(other_item.text(column))
+            return current_time > other_time
+        else:
+            return str(self.text(column)).lower() > str(other_item.text(column)).lower()
+
+
+def make_records(count):
+    rand = random.Random(count)
+    now = time.time()
+    return [{"name": "shot_{0:06d}".format(i), "size": float(rand.randint(0, 2 ** 40)),
+             "path": "/shows/show/scenes/shot_{0:06d}".format(i), "files": rand.randint(0, 100000),
+             "mtime": now - rand.randint(0, 3 * 365 * 86400), "enabled": True, "ready": True}
+            for i in range(count)]
+
+
+def legacy_sort(app, records, columns):
+    widget = QtWidgets.QTreeWidget()
+    widget.setHeaderLabels(["Name", "Size", "Path", "File Count", "Last Modified"])
+    for record in records:
+        size, gigabyte = drive_cleanup.convert_size(record["size"])
+        widget.addTopLevelItem(LegacyTreeWidgetItem([
+            record["name"], size + "\t<{0}> GB".format(gigabyte), record["path"], str(record["files"]),
+            gui._format_date(record["mtime"])]))
+    timings = []
+    for column in columns:
+        start = time.time()
+        widget.sortItems(column, QtCore.Qt.AscendingOrder)
+        timings.append(time.time() - start)
+    return timings
+
+
+def model_sort(app, records, columns):
+    widget = gui.QDeleteWidget()
+    widget.resize(1200, 600)
+    widget.show()
+    widget._model.addRecords(records)
+    app.processEvents()
+    timings = []
+    for column in columns:
+        start = time.time()
+        widget.sortByColumn(column, QtCore.Qt.AscendingOrder)
+        app.processEvents()
+        timings.append(time.time() - start)
+    widget.close()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete list sort time per column, tree items against the table model")
+    parser.add_argument("--legacy-rows", type=int, default=5000)
+    parser.add_argument("--rows", type=int, nargs="+", default=[5000, 100000])
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication(sys.argv[:1])
+    columns = [0, 1, 3, 4]
+    print("{0:>8} {1:>8} {2:>10} {3:>10} {4:>10} {5:>10}".format("impl", "rows", "name ms", "size ms", "count ms",
+                                                                 "date ms"))
+    runs = [("items", args.legacy_rows, legacy_sort)] + [("model", rows, model_sort) for rows in args.rows]
+    for name, rows, func in runs:
+        timings = func(app, make_records(rows), columns)
+        print("{0:>8} {1:>8} {2:>10.1f} {3:>10.1f} {4:>10.1f} {5:>10.1f}".format(
+            name, rows, *[timing * 1000 for timing in timings]))
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
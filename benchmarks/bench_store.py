@@ -0,0 +1,94 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 16/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import os
+import gc
+import sys
+import time
+import psutil
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from drive_cleanup import ScanResult, convert_size
+from drive_cleanup.store import ResultStore
+
+DIRS_PER_SHOT = 1000
+
+
+def directories(count):
+    # (shot path, directory name) pairs, DIRS_PER_SHOT render folders under each shot.
+    for i_dir in range(count):
+        shot = "/mnt/projects/show_{0:02d}/scenes/shot_{1:04d}".format(i_dir // 100000, i_dir // DIRS_PER_SHOT)
+        yield shot, "render_{0:03d}".format(i_dir % DIRS_PER_SHOT)
+
+
+def tree_items(count):
+    # One QTreeWidgetItem per directory with the text columns the lists used to keep.
+    from PySide2 import QtWidgets
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    mtime = time.ctime()
+    items = []
+    for i_dir, (shot, name) in enumerate(directories(count)):
+        size, gigabyte = convert_size(i_dir * 4096 + 1)
+        items.append(QtWidgets.QTreeWidgetItem([name, "{0}\t<{1}> GB".format(size, gigabyte), shot + "/" + name,
+                                                str(i_dir % 500), mtime]))
+    return app, items
+
+
+def dict_records(count):
+    return [{"name": name, "size": float(i_dir * 4096 + 1), "path": shot + "/" + name, "files": i_dir % 500,
+             "mtime": 1.7e9 + i_dir, "enabled": True, "ready": True}
+            for i_dir, (shot, name) in enumerate(directories(count))]
+
+
+def result_store(count):
+    store = ResultStore()
+    shot_ids = {}
+    for i_dir, (shot, name) in enumerate(directories(count)):
+        if shot not in shot_ids:
+            shot_ids[shot] = store.add(shot)
+        store.add(shot + "/" + name, ScanResult(i_dir * 4096 + 1, i_dir % 500, 0, 1.7e9 + i_dir), shot_ids[shot])
+    return store
+
+
+BUILDERS = {"tree items": tree_items, "dict records": dict_records, "result store": result_store}
+
+
+def measure(name, count):
+    process = psutil.Process()
+    gc.collect()
+    before = process.memory_info().rss
+    start = time.time()
+    kept = BUILDERS[name](count)
+    elapsed = time.time() - start
+    gc.collect()
+    used = process.memory_info().rss - before
+    print("{0:>14} {1:>10} {2:>12.1f} {3:>14.1f} {4:>8.2f}".format(name, count, used / 1024 ** 2,
+                                                               used / 1024 ** 2 * 1e6 / count, elapsed))
+    if name == "result store":
+        print("{0:>14} {1:>10} {2:>12.1f} {3:>14.1f}".format("  (nbytes)", count, kept.nbytes() / 1024 ** 2,
+                                                             kept.nbytes() / 1024 ** 2 * 1e6 / count))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory per million directories for each way of keeping results")
+    parser.add_argument("--dirs", type=int, default=1000000)
+    parser.add_argument("--only", choices=sorted(BUILDERS), default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.only:
+        measure(args.only, args.dirs)
+        return
+    print("{0:>14} {1:>10} {2:>12} {3:>14} {4:>8}".format("storage", "dirs", "RSS MB", "MB per 1M", "seconds"))
+    sys.stdout.flush()
+    # Each builder runs in its own process so the RSS deltas do not share freed memory.
+    for name in ("tree items", "dict records", "result store"):
+        subprocess.call([sys.executable, os.path.abspath(__file__), "--dirs", str(args.dirs), "--only", name])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 16/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PySide2 import QtCore
+import drive_cleanup
+from synthetic_tree import make_tree
+
+
+def qt_calc_size(path):
+    size = float()
+    num = int()
+    file_iter = QtCore.QDirIterator(path, QtCore.QDirIterator.Subdirectories)
+    while file_iter.hasNext():
+        obj_file = QtCore.QFileInfo(file_iter.next())
+        if obj_file.isFile():
+            num += 1
+            size += obj_file.size()
+    return size, num
+
+
+def scandir_calc_size(path):
+    result = drive_cleanup.walk_size(path)
+    return result.size, result.files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="QDirIterator/QFileInfo against the scandir walker")
+    parser.add_argument("--shots", type=int, default=100)
+    parser.add_argument("--dirs", type=int, default=100)
+    parser.add_argument("--files", type=int, default=100)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="drive_cleanup_bench_")
+    try:
+        make_tree(root, args.shots, args.dirs, args.files)
+        files = args.shots * args.dirs * args.files
+        print("{0:>10} {1:>10} {2:>12}".format("walker", "seconds", "files/sec"))
+        for name, func in (("qt", qt_calc_size), ("scandir", scandir_calc_size)):
+            start = time.time()
+            size, num = func(root)
+            elapsed = time.time() - start
+            assert num == files, (name, num, files)
+            print("{0:>10} {1:>10.2f} {2:>12.0f}".format(name, elapsed, num / elapsed))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 17/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from drive_cleanup import list_shots
+from drive_cleanup.watcher import DirectoryWatcher
+
+
+class Recorder(object):
+    def __init__(self):
+        self.batches = []
+        self.last = None
+        self._lock = threading.Lock()
+
+    def __call__(self, events):
+        with self._lock:
+            self.batches.append(events)
+            self.last = time.time()
+
+    def events(self):
+        with self._lock:
+            return sum(len(batch) for batch in self.batches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="What a render burst costs the lists: a full relisting of the show "
+                                                 "against the coalesced changes of the folder watcher")
+    parser.add_argument("--shots", type=int, default=2000)
+    parser.add_argument("--renders", type=int, default=8, help="Shots written to at the same time")
+    parser.add_argument("--frames", type=int, default=500, help="Frames written into each rendering shot")
+    parser.add_argument("--new-shots", type=int, default=20, help="Shot folders created during the burst")
+    parser.add_argument("--backends", nargs="+", default=["inotify", "poll"])
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--root", default=None, help="Directory to build the tree in, defaults to a temp dir")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="drive_cleanup_bench_", dir=args.root)
+    try:
+        show = os.path.join(root, "scenes").replace("\\", "/")
+        for i_shot in range(args.shots):
+            os.makedirs(os.path.join(show, "sh{0:05d}".format(i_shot), "comp"))
+        start = time.time()
+        shots = list_shots(show)
+        print("full relisting of {0} shots: {1:.3f}s".format(len(shots), time.time() - start))
+
+        print("{0:>8} {1:>8} {2:>9} {3:>8} {4:>10}".format("backend", "writes", "callbacks", "events", "settled s"))
+        for i_run, backend in enumerate(args.backends):
+            recorder = Recorder()
+            watcher = DirectoryWatcher(recorder, poll_interval=args.poll_interval, backend=backend)
+            watcher.watch([show] + shots)
+            time.sleep(args.poll_interval * 2)
+            writes = 0
+            for i_frame in range(args.frames):
+                for i_shot in range(args.renders):
+                    path = os.path.join(shots[i_shot], "r{0}_{1:05d}.exr".format(i_run, i_frame))
+                    open(path, "w").close()
+                    writes += 1
+                if i_frame < args.new_shots:
+                    os.makedirs(os.path.join(show, "new{0}_{1:03d}".format(i_run, i_frame), "comp"))
+                    writes += 1
+            burst_end = time.time()
+            time.sleep(args.poll_interval * 2 + 4)
+            watcher.close()
+            settled = recorder.last - burst_end if recorder.last else float("nan")
+            print("{0:>8} {1:>8} {2:>9} {3:>8} {4:>10.2f}".format(backend, writes, len(recorder.batches),
+                                                                  recorder.events(), settled))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 17/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import os
+import sys
+import time
+import random
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from drive_cleanup import core
+
+OPERATIONS = ("stat", "scandir", "remove", "rmdir")
+
+
+def fixed_latency(seconds):
+    return lambda operation, path: seconds
+
+
+def nas_latency(round_trip=0.0005, jitter=0.5, slow_every=200, slow=0.02, seed=0):
+    # A NAS round trip per call, +/- jitter of it, and a stall every slow_every calls on average.
+    rand = random.Random(seed)
+    lock = threading.Lock()
+
+    def _latency(operation, path):
+        with lock:
+            delay = round_trip * (1 + rand.uniform(-jitter, jitter))
+            if slow_every and rand.randrange(slow_every) == 0:
+                delay += slow
+        return delay
+    return _latency
+
+
+def queue_latency(capacity=2000.0, round_trip=0.0005):
+    # A NAS that serves capacity calls per second in turn: each call waits for the ones ahead of it, so
+    # the latency every client sees climbs with the load once it is pushed past what it can serve.
+    lock = threading.Lock()
+    state = {"free": float()}
+
+    def _latency(operation, path):
+        with lock:
+            now = time.time()
+            state["free"] = max(state["free"], now) + 1 / capacity
+            return round_trip + state["free"] - now
+    return _latency
+
+
+def latency_model(spec):
+    # "0.001" for a fixed delay per call, "nas" or "nas:<round trip>" for a jittery NAS, "queue:<calls/sec>"
+    # for a NAS that slows down under load, None for no delay.
+    if not spec:
+        return None
+    if spec.startswith("nas"):
+        return nas_latency(float(spec.partition(":")[2] or 0.0005))
+    if spec.startswith("queue"):
+        return queue_latency(float(spec.partition(":")[2] or 2000.0))
+    return fixed_latency(float(spec))
+
+
+class _LatentEntry(object):
+    # A scandir entry whose stat goes through the latency, d_type checks stay free as on a real share.
+    __slots__ = ("_entry", "_filesystem", "name", "path")
+
+    def __init__(self, entry, filesystem):
+        self._entry = entry
+        self._filesystem = filesystem
+        self.name = entry.name
+        self.path = entry.path
+
+    def is_dir(self, follow_symlinks=True):
+        return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def is_file(self, follow_symlinks=True):
+        return self._entry.is_file(follow_symlinks=follow_symlinks)
+
+    def is_symlink(self):
+        return self._entry.is_symlink()
+
+    def inode(self):
+        return self._entry.inode()
+
+    def stat(self, follow_symlinks=True):
+        self._filesystem.delay("stat", self.path)
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+
+class LatentFilesystem(object):
+    # Adds a delay to every stat, listing, unlink and rmdir under root, standing in for a slow mount.
+    # latency is seconds per call or a callable(operation, path) returning them, one of OPERATIONS.
+    # Process pool scans run in other processes and are not slowed down.
+    def __init__(self, root, latency):
+        self._root = str(root).replace("\\", "/")
+        self._latency = latency if callable(latency) else fixed_latency(latency)
+        self._saved = {}
+        self.calls = dict((operation, int()) for operation in OPERATIONS)
+
+    def delay(self, operation, path):
+        if str(path).replace("\\", "/").startswith(self._root):
+            self.calls[operation] += 1
+            seconds = self._latency(operation, path)
+            if seconds > 0:
+                time.sleep(seconds)
+
+    def __enter__(self):
+        stat, lstat, remove, rmdir, scandir = os.stat, os.lstat, os.remove, os.rmdir, core._scandir
+
+        def _stat(path, *args, **kwargs):
+            self.delay("stat", path)
+            return stat(path, *args, **kwargs)
+
+        def _lstat(path, *args, **kwargs):
+            self.delay("stat", path)
+            return lstat(path, *args, **kwargs)
+
+        def _remove(path, *args, **kwargs):
+            self.delay("remove", path)
+            return remove(path, *args, **kwargs)
+
+        def _rmdir(path, *args, **kwargs):
+            self.delay("rmdir", path)
+            return rmdir(path, *args, **kwargs)
+
+        def _read(path, entries):
+            self.delay("scandir", path)
+            for entry in entries:
+                yield _LatentEntry(entry, self)
+
+        def _scandir(path="."):
+            # Opened right away so a missing folder still fails here, but charged once the listing is read,
+            # as on a share where opendir is cheap and readdir is not.
+            return _read(path, scandir(path))
+
+        self._saved = {(os, "stat"): stat, (os, "lstat"): lstat, (os, "remove"): remove, (os, "unlink"): os.unlink,
+                       (os, "rmdir"): rmdir, (core, "_scandir"): scandir}
+        os.stat, os.lstat, os.remove, os.unlink, os.rmdir = _stat, _lstat, _remove, _remove, _rmdir
+        core._scandir = _scandir
+        # The GUI lists shots with its own reference to the walker's scandir.
+        gui = sys.modules.get("drive_cleanup.gui")
+        if gui is not None:
+            self._saved[(gui, "_scandir")] = gui._scandir
+            gui._scandir = _scandir
+        return self
+
+    def __exit__(self, *exc_info):
+        for (module, name), function in self._saved.items():
+            setattr(module, name, function)
@@ -0,0 +1,315 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 17/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import socket
+import argparse
+import platform
+import tempfile
+import subprocess
+import collections
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+import drive_cleanup
+from drive_cleanup import sizes
+from latency import LatentFilesystem, latency_model
+from synthetic_tree import SHAPES, make_show_tree
+
+# setup(tree, args) builds what one run needs outside the timing, run(state) returns the items it went
+# through and cleanup(state) removes what setup made. Filesystem cases run under the injected latency.
+Case = collections.namedtuple("Case", ["name", "unit", "setup", "run", "cleanup", "filesystem"])
+
+_QT = {}
+
+
+def _application():
+    if "app" not in _QT:
+        from PySide2 import QtWidgets
+        from drive_cleanup import gui
+        _QT["app"] = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+        _QT["gui"] = gui
+    return _QT["app"], _QT["gui"]
+
+
+def _no_state(tree, args):
+    return tree
+
+
+def _no_cleanup(state):
+    pass
+
+
+def _fresh_index(tree, args):
+    db_dir = tempfile.mkdtemp(prefix="drive_cleanup_index_")
+    return tree, db_dir, drive_cleanup.SizeIndex(os.path.join(db_dir, "index.sqlite"))
+
+
+def _warm_index(tree, args):
+    state = _fresh_index(tree, args)
+    for show_path in tree.show_paths:
+        state[2].scan(show_path)
+    return state
+
+
+def _remove_index(state):
+    shutil.rmtree(state[1], ignore_errors=True)
+
+
+def run_walk_size(tree):
+    return sum(drive_cleanup.walk_size(shot).files for shot in tree.shot_paths)
+
+
+def run_index_scan(state):
+    tree, _db_dir, index = state
+    return sum(index.scan(show_path).files for show_path in tree.show_paths)
+
+
+def run_scan_items(state):
+    tree, _db_dir, index = state
+    executor = drive_cleanup.ScanExecutor()
+    try:
+        return sum(result.files for _path, result in drive_cleanup.scan_items(tree.shot_paths, index, executor))
+    finally:
+        executor.shutdown()
+
+
+def run_list_shots(tree):
+    return sum(len(drive_cleanup.list_shots(show_path)) for show_path in tree.show_paths)
+
+
+def run_discover_shows(tree):
+    provider = drive_cleanup.StaticShowProvider(tree.shows)
+    return len(list(drive_cleanup.discover_shows(provider, base_paths=[tree.root], local_storage="")))
+
+
+def run_shot_widget(tree):
+    app, gui = _application()
+    rows = int()
+    for show_path in tree.show_paths:
+        widget = gui.QShotWidget()
+        widget.fetchMore(show_path)
+        while widget._thread.isRunning():
+            app.processEvents()
+        app.processEvents()
+        # Every page the view would ask for while scrolling to the end.
+        while widget._model.canFetchMore():
+            widget._model.fetchMore()
+        rows += widget.count()
+        widget.deleteLater()
+    return rows
+
+
+def _sort_model(tree, args):
+    _app, gui = _application()
+    rand = random.Random(len(tree.shot_paths))
+    now = time.time()
+    model = gui.PathTableModel([("Name", "name"), ("Size", "size"), ("Last Modified", "mtime"), ("Path", "path")],
+                               page_size=args.sort_rows)
+    model.addRecords([{"name": "sh{0:06d}".format(i_row), "size": rand.randint(0, 2 ** 40),
+                       "mtime": now - rand.randint(0, 3 * 365 * 86400), "path": "/show/scenes/sh{0:06d}".format(i_row)}
+                      for i_row in range(args.sort_rows)])
+    return model
+
+
+def run_sort(model):
+    for column in range(model.columnCount()):
+        model.sort(column, 1)
+        model.sort(column, 0)
+    return model.rowCount() * model.columnCount() * 2
+
+
+def _size_values(tree, args):
+    rand = random.Random(args.values)
+    return [rand.randint(0, 2 ** 50) for _i_value in range(args.values)]
+
+
+def run_convert_size(values):
+    for value in values:
+        drive_cleanup.convert_size(value)
+    return len(values)
+
+
+def run_format_sizes(values):
+    return len(sizes.format_sizes(values))
+
+
+def _tree_copy(tree, args):
+    # Deletes need a tree of their own per run, built again from the same shape.
+    root = tempfile.mkdtemp(prefix="drive_cleanup_bench_", dir=args.root)
+    return make_show_tree(root, args.shape)
+
+
+def run_purge(tree):
+    engine = drive_cleanup.PurgeEngine()
+    return sum(engine.purge(shot).total_files for shot in tree.shot_paths)
+
+
+def _remove_copy(tree):
+    shutil.rmtree(tree.root, ignore_errors=True)
+
+
+CASES = [
+    Case("scan.walk_size", "files", _no_state, run_walk_size, _no_cleanup, True),
+    Case("scan.index_cold", "files", _fresh_index, run_index_scan, _remove_index, True),
+    Case("scan.index_warm", "files", _warm_index, run_index_scan, _remove_index, True),
+    Case("scan.items", "files", _fresh_index, run_scan_items, _remove_index, True),
+    Case("list.shots", "shots", _no_state, run_list_shots, _no_cleanup, True),
+    Case("list.shows", "shows", _no_state, run_discover_shows, _no_cleanup, True),
+    Case("list.shot_widget", "rows", _no_state, run_shot_widget, _no_cleanup, True),
+    Case("sort.model", "rows", _sort_model, run_sort, _no_cleanup, False),
+    Case("format.convert_size", "values", _size_values, run_convert_size, _no_cleanup, False),
+    Case("format.bulk", "values", _size_values, run_format_sizes, _no_cleanup, False),
+    Case("delete.purge", "files", _tree_copy, run_purge, _remove_copy, True),
+]
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+
+
+def run_case(case, tree, args, latency):
+    seconds = []
+    items = int()
+    for _i_run in range(args.repeat):
+        state = case.setup(tree, args)
+        try:
+            if case.filesystem and latency is not None:
+                # A copied tree lives under its own root.
+                root = state.root if hasattr(state, "root") else tree.root
+                with LatentFilesystem(root, latency):
+                    start = time.time()
+                    items = case.run(state)
+                    seconds.append(time.time() - start)
+            else:
+                start = time.time()
+                items = case.run(state)
+                seconds.append(time.time() - start)
+        finally:
+            case.cleanup(state)
+    median = _median(seconds)
+    return {"seconds": median, "best": min(seconds), "runs": len(seconds), "items": items, "unit": case.unit,
+            "rate": items / median if median else None}
+
+
+def metadata(args):
+    commit = None
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                         stderr=subprocess.STDOUT).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    return collections.OrderedDict([
+        ("commit", commit), ("time", time.strftime("%Y-%m-%dT%H:%M:%S")), ("host", socket.gethostname()),
+        ("python", platform.python_version()), ("platform", platform.platform()),
+        ("cpus", multiprocessing.cpu_count()), ("latency", args.latency), ("repeat", args.repeat),
+        ("shapes", dict((name, SHAPES[name]._asdict()) for name in args.shapes))])
+
+
+def compare(results, baseline, tolerance, min_seconds):
+    # Prints each case against the same case in baseline, returns the ids that got slower than tolerance.
+    # Cases faster than min_seconds both times are mostly timer noise, they are shown but never flagged.
+    previous = dict((result["id"], result) for result in baseline["results"] if "seconds" in result)
+    regressions = []
+    print("\n{0:<40} {1:>10} {2:>10} {3:>8}".format("compared to " + str(baseline["meta"].get("commit"))[:10],
+                                                    "before s", "after s", "ratio"))
+    for result in results:
+        before = previous.get(result["id"])
+        if before is None or "seconds" not in result or not before["seconds"]:
+            continue
+        ratio = result["seconds"] / before["seconds"]
+        flag = ""
+        if max(result["seconds"], before["seconds"]) < min_seconds:
+            pass
+        elif ratio > 1 + tolerance:
+            flag = " slower"
+            regressions.append(result["id"])
+        elif ratio < 1 - tolerance:
+            flag = " faster"
+        print("{0:<40} {1:>10.3f} {2:>10.3f} {3:>8.2f}{4}".format(result["id"], before["seconds"], result["seconds"],
+                                                                  ratio, flag))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scan, list, sort and delete benchmarks on generated show trees, "
+                                                 "with JSON results that can be compared across commits")
+    parser.add_argument("--shapes", nargs="+", choices=sorted(SHAPES), default=sorted(SHAPES))
+    parser.add_argument("--cases", nargs="+", default=None,
+                        help="Case names or prefixes to run, scan list sort format delete")
+    parser.add_argument("--latency", default=None,
+                        help="Seconds added to each filesystem call, nas / nas:<round trip> for a jittery NAS or "
+                             "queue:<calls/sec> for one that slows down under load")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case, the median is reported")
+    parser.add_argument("--sort-rows", type=int, default=100000)
+    parser.add_argument("--values", type=int, default=200000, help="Byte counts formatted by the format cases")
+    parser.add_argument("--output", default=None, help="JSON file to write the results to")
+    parser.add_argument("--compare", default=None, help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="Slowdown against --compare, as a fraction, before a case fails the run")
+    parser.add_argument("--min-seconds", type=float, default=0.01,
+                        help="Cases quicker than this before and after are not compared")
+    parser.add_argument("--root", default=None, help="Directory to build the trees in, defaults to a temp dir")
+    args = parser.parse_args()
+    args.repeat = max(1, args.repeat)
+
+    latency = latency_model(args.latency)
+    cases = [case for case in CASES if not args.cases or any(case.name == name or case.name.startswith(name + ".")
+                                                             for name in args.cases)]
+    results = []
+    print("{0:<40} {1:>10} {2:>10} {3:>14}".format("case", "seconds", "items", "per second"))
+    for shape_name in args.shapes:
+        args.shape = SHAPES[shape_name]
+        root = tempfile.mkdtemp(prefix="drive_cleanup_bench_", dir=args.root)
+        try:
+            tree = make_show_tree(root, args.shape)
+            for case in cases:
+                # Sorting and formatting do not depend on the tree, they run once.
+                if not case.filesystem and shape_name != args.shapes[0]:
+                    continue
+                case_id = case.name if not case.filesystem else "{0}/{1}".format(case.name, shape_name)
+                if case.filesystem and args.latency:
+                    case_id += "@" + args.latency
+                result = collections.OrderedDict([("id", case_id), ("case", case.name),
+                                                  ("shape", shape_name if case.filesystem else None)])
+                try:
+                    result.update(run_case(case, tree, args, latency))
+                except ImportError as err:
+                    result["skipped"] = str(err)
+                    print("{0:<40} skipped, {1}".format(case_id, err))
+                    results.append(result)
+                    continue
+                results.append(result)
+                print("{0:<40} {1:>10.3f} {2:>10} {3:>14.0f}".format(case_id, result["seconds"], result["items"],
+                                                                     result["rate"] or float()))
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+    report = collections.OrderedDict([("meta", metadata(args)), ("results", results)])
+    if args.output:
+        with open(args.output, "w") as f_out:
+            json.dump(report, f_out, indent=2)
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f_in:
+            regressions = compare(results, json.load(f_in), args.tolerance, args.min_seconds)
+    if regressions:
+        print("\n{0} case/s slower than {1:.0%}: {2}".format(len(regressions), args.tolerance, ", ".join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
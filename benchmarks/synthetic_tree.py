@@ -0,0 +1,84 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 16/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import os
+import math
+import random
+import collections
+
+
+def make_tree(root, shots=20, dirs_per_shot=10, files_per_dir=50, file_size=1024):
+    paths = []
+    for i_shot in range(shots):
+        shot_path = os.path.join(root, "shot_{0:04d}".format(i_shot))
+        for i_dir in range(dirs_per_shot):
+            dir_path = os.path.join(shot_path, "render_{0:03d}".format(i_dir))
+            os.makedirs(dir_path)
+            for i_file in range(files_per_dir):
+                with open(os.path.join(dir_path, "frame.{0:04d}.exr".format(i_file)), "wb") as f_out:
+                    f_out.truncate(file_size)
+        paths.append(shot_path.replace("\\", "/"))
+    return paths
+
+
+# Byte counts drawn per file. Files are sparse, a large distribution costs no disk space or write time.
+SIZE_DISTRIBUTIONS = {
+    "empty": lambda rand: 0,
+    "tiny": lambda rand: rand.randint(0, 4096),
+    "frames": lambda rand: int(rand.lognormvariate(math.log(8 * 1024 ** 2), 0.6)),
+    "mixed": lambda rand: int(rand.paretovariate(1.2) * 64 * 1024),
+}
+
+# shows x shots per show, each shot `depth` folders deep with `fanout` sub folders per level and `files`
+# files in every folder at the bottom. The same shape and seed always build the same tree.
+TreeShape = collections.namedtuple("TreeShape", ["shows", "shots", "depth", "fanout", "files", "sizes", "seed"])
+ShowTree = collections.namedtuple("ShowTree", ["root", "shows", "show_paths", "shot_paths", "dirs", "files",
+                                               "bytes"])
+
+SHAPES = {
+    "renders": TreeShape(shows=2, shots=40, depth=2, fanout=3, files=24, sizes="frames", seed=0),
+    "tiny_files": TreeShape(shows=1, shots=10, depth=1, fanout=4, files=500, sizes="tiny", seed=0),
+    "deep": TreeShape(shows=1, shots=8, depth=6, fanout=2, files=4, sizes="mixed", seed=0),
+    "wide": TreeShape(shows=4, shots=400, depth=0, fanout=0, files=2, sizes="empty", seed=0),
+}
+
+
+def _folders(shot_path, depth, fanout):
+    # The bottom folders of one shot, level by level.
+    folders = [shot_path]
+    for i_level in range(depth):
+        folders = [os.path.join(folder, "{0}_{1:02d}".format(("render", "layer", "pass", "aov")[min(i_level, 3)],
+                                                              i_sub))
+                   for folder in folders for i_sub in range(fanout)]
+    return folders
+
+
+def make_show_tree(root, shape):
+    # Builds shows under root/<show>/scenes/<shot> the way discover_shows and the lists expect them.
+    rand = random.Random(shape.seed)
+    size_of = SIZE_DISTRIBUTIONS[shape.sizes]
+    shows = []
+    show_paths = []
+    shot_paths = []
+    dirs = files = total = int()
+    for i_show in range(shape.shows):
+        name = "show_{0:02d}".format(i_show)
+        scenes = os.path.join(root, name, "scenes")
+        shows.append({"code": name, "sg_status": "active"})
+        show_paths.append(scenes.replace("\\", "/"))
+        for i_shot in range(shape.shots):
+            shot_path = os.path.join(scenes, "sh{0:04d}".format(i_shot * 10))
+            for folder in _folders(shot_path, shape.depth, shape.fanout):
+                os.makedirs(folder)
+                for i_file in range(shape.files):
+                    size = size_of(rand)
+                    with open(os.path.join(folder, "frame.{0:04d}.exr".format(i_file)), "wb") as f_out:
+                        f_out.truncate(size)
+                    total += size
+                files += shape.files
+            dirs += sum(shape.fanout ** i_level for i_level in range(shape.depth + 1))
+            shot_paths.append(shot_path.replace("\\", "/"))
+    return ShowTree(root.replace("\\", "/"), shows, show_paths, shot_paths, dirs, files, total)
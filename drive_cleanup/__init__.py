@@ -0,0 +1,22 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 12/08/2023
+
+__TOOL_NAME__ = "Drive Cleanup Tool"
+__VERSION__ = "1.0.0"
+
+from .core import (__BASE_PATHS__, LOCAL_STORAGE_DRIVE, SCAN_MAX_WORKERS, SCAN_VOLUME_WORKERS, SIZE_INDEX_BATCH,
+                   PURGE_WORKERS, PURGE_BATCH_SIZE, SCAN_MODE, SCAN_PROCESSES, SHOW_PROBE_WORKERS, DISK_USAGE_INTERVAL,
+                   DISK_USAGE_TTL, PURGE_RATE_ESTIMATE, PLAN_PROBLEM_LIMIT, STALE_MIN_SIZE, STALE_MIN_AGE,
+                   TRASH_DIR_NAME, Cancelled, CancelToken, ScanResult, Candidate, PurgeBatch, PlanSummary, ShowPath,
+                   DiskUsage, DiskSnapshot, ScanExecutor, SizeIndex, ShardScanner, PurgeEngine, PurgePlan,
+                   ProgressTable, DiskUsageMonitor, ShotgunShowProvider, StaticShowProvider, convert_size, is_empty_dir,
+                   walk_size, list_dir, volume_of, list_items, scan_items, cached_items, refresh_items, filter_items,
+                   discover_shows, list_shots, find_reclaimable, purge_items, open_files, summarize_plans, plan_items,
+                   execute_plans)
+
+
+def launch(*args, **kwargs):
+    # Opens the main window inside the host application, PySide2 is only imported once this is called.
+    from .gui import launch as _launch
+    return _launch(*args, **kwargs)
@@ -0,0 +1,337 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 16/10/2026
+
+from __future__ import division
+from __future__ import print_function
+import re
+import csv
+import sys
+import json
+import time
+import argparse
+import datetime
+
+import logging
+
+from . import __TOOL_NAME__, __VERSION__
+from .core import (__BASE_PATHS__, LOCAL_STORAGE_DRIVE, SCAN_MAX_WORKERS, SCAN_VOLUME_WORKERS, PURGE_WORKERS, PURGE_BATCH_SIZE,
+                   SCAN_MODE, SCAN_PROCESSES, STALE_MIN_SIZE, STALE_MIN_AGE, ScanExecutor, SizeIndex, ShardScanner,
+                   PurgeEngine, ShotgunShowProvider, StaticShowProvider, list_items, scan_items, cached_items,
+                   refresh_items, filter_items, purge_items, plan_items, discover_shows, find_reclaimable)
+from .sizes import format_sizes, gigabytes, rollup_by_show, rollup_by_age
+from .store import ResultStore
+from .journal import PurgeJournal, PurgeCheckpoint
+from .duplicates import DUPLICATE_MIN_SIZE, DUPLICATE_WORKERS, DuplicateFinder, HashCache
+from .metrics import Metrics
+from .qos import QOS_TARGET_LATENCY, IOScheduler, parse_budget
+
+COMMANDS = ("scan", "report", "purge", "stale", "duplicates")
+ITEM_FIELDS = ["path", "size", "size_text", "files", "dirs", "newest", "age_days"]
+ROLLUP_FIELDS = ["group", "items", "size", "size_text", "gigabytes", "files", "dirs", "newest"]
+PURGE_FIELDS = ["path", "files", "dirs", "errors", "rate"]
+STALE_FIELDS = ["path", "show", "size", "size_text", "files", "newest", "age_days", "score"]
+DUPLICATE_FIELDS = ["digest", "size", "size_text", "copies", "reclaimable", "reclaimable_text", "paths"]
+PLAN_FIELDS = ["path", "files", "dirs", "size", "size_text", "reclaimable", "reclaimable_text", "unremovable", "busy",
+               "eta_seconds"]
+_SIZE_UNITS = {"": 1, "B": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4, "P": 1024 ** 5}
+
+
+def parse_size(text):
+    match = re.match(r"^\s*([0-9.]+)\s*([BKMGTP]?)B?\s*$", str(text), re.IGNORECASE)
+    if not match:
+        raise argparse.ArgumentTypeError("invalid size: {0!r}, use e.g. 500M or 2G".format(text))
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+
+def _isoformat(mtime):
+    return datetime.datetime.fromtimestamp(mtime).isoformat() if mtime else None
+
+
+def _item_rows(store, ids, now):
+    size_texts = format_sizes([store.sizes[item_id] for item_id in ids])
+    return [{"path": store.path(item_id), "size": store.sizes[item_id], "size_text": size_text,
+             "files": store.files[item_id], "dirs": store.dirs[item_id], "newest": _isoformat(store.mtimes[item_id]),
+             "age_days": round((now - store.mtimes[item_id]) / 86400, 1) if store.mtimes[item_id] else None}
+            for item_id, size_text in zip(ids, size_texts)]
+
+
+def _rollup_rows(items, rollup, now, base_paths=()):
+    groups = rollup_by_show(items, base_paths) if rollup == "show" else rollup_by_age(items, now)
+    sizes = [group.size for group in groups]
+    return [{"group": group.group, "items": group.items, "size": group.size, "size_text": size_text,
+             "gigabytes": float(gigabyte), "files": group.files, "dirs": group.dirs,
+             "newest": _isoformat(group.newest)}
+            for group, size_text, gigabyte in zip(groups, format_sizes(sizes), gigabytes(sizes))]
+
+
+def _selected_ids(items, store, depth):
+    # Rows for the filtered items, plus their sub directories down to depth when the scan kept them.
+    if not depth:
+        store = ResultStore()
+        for path, result in items:
+            store.add(path, result)
+        return store, list(range(len(store)))
+    selected = set(path for path, _result in items)
+    depths = store.depths()
+    roots = store.roots()
+    ids = [item_id for item_id in range(len(store))
+           if depths[item_id] <= depth and store.names[roots[item_id]] in selected]
+    return store, sorted(ids, key=store.path)
+
+
+def _report(items, args, store=None):
+    now = time.time()
+    if args.rollup:
+        return _rollup_rows(items, args.rollup, now, args.paths or __BASE_PATHS__), ROLLUP_FIELDS
+    store, ids = _selected_ids(items, store, getattr(args, "depth", 0))
+    return _item_rows(store, ids, now), ITEM_FIELDS
+
+
+def _purge_row(path, batch):
+    return {"path": path, "files": batch.total_files, "dirs": batch.total_dirs, "errors": batch.total_errors,
+            "rate": round(batch.rate, 1)}
+
+
+def _plan_rows(plans):
+    size_texts = format_sizes([plan.size for plan in plans])
+    reclaimable_texts = format_sizes([plan.reclaimable for plan in plans])
+    return [{"path": plan.root, "files": plan.files, "dirs": plan.dirs, "size": plan.size, "size_text": size_text,
+             "reclaimable": plan.reclaimable, "reclaimable_text": reclaimable_text, "unremovable": plan.unremovable,
+             "busy": plan.busy, "eta_seconds": round(plan.eta, 1)}
+            for plan, size_text, reclaimable_text in zip(plans, size_texts, reclaimable_texts)]
+
+
+def write_rows(rows, fields, fmt, stream):
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=fields, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(dict((key, ";".join(value) if isinstance(value, list) else value)
+                              for key, value in row.items()) for row in rows)
+    else:
+        json.dump(rows, stream, indent=2)
+        stream.write("\n")
+
+
+def _items(args, index, executor, cached=False, store=None, fresh=False):
+    # With fresh the items the size index lets through are walked again and filtered on what is on disk,
+    # for filters that decide what is deleted.
+    paths = list(list_items(args.paths or __BASE_PATHS__))
+    if cached:
+        items = cached_items(paths, index)
+    elif args.mode == "process":
+        scanner = ShardScanner(workers=args.processes)
+        try:
+            items = list(scan_items(paths, index, executor, scanner=scanner, store=store))
+        finally:
+            scanner.shutdown()
+        # Process scans walk the disk without the index, their results are fresh already.
+        fresh = False
+    else:
+        items = scan_items(paths, index, executor, store=store)
+    items = filter_items(items, min_size=args.min_size, older_than=args.older_than)
+    if fresh:
+        items = filter_items(refresh_items(list(items), executor), min_size=args.min_size,
+                             older_than=args.older_than)
+    return sorted(items, key=lambda item: item[0])
+
+
+def run_scan(args, index, executor):
+    store = ResultStore() if args.depth else None
+    return _report(_items(args, index, executor, store=store), args, store)
+
+
+def run_report(args, index, executor):
+    return _report(_items(args, index, executor, cached=True), args)
+
+
+def run_purge(args, index, executor):
+    journal = None if args.dry_run or args.no_journal else PurgeJournal(args.journal)
+    engine = PurgeEngine(workers=args.purge_workers, batch_size=args.batch_size, journal=journal)
+    if args.resume:
+        # Interrupted operations carry their own paths and options, filters do not apply.
+        checkpoints = PurgeCheckpoint.interrupted(args.checkpoints)
+        operations = [(checkpoint.resume(), checkpoint) for checkpoint in checkpoints]
+    else:
+        if args.min_size is None and args.older_than is None:
+            # Nothing to filter on, every folder is purged without sizing them first.
+            paths = sorted(list_items(args.paths or __BASE_PATHS__))
+        else:
+            paths = [path for path, _result in _items(args, index, executor, fresh=True)]
+        if args.dry_run:
+            return _plan_rows(plan_items(paths, engine, remove_root=args.remove_root)), PLAN_FIELDS
+        checkpoint = PurgeCheckpoint(directory=args.checkpoints)
+        checkpoint.begin(paths, args.remove_root)
+        operations = [(paths, checkpoint)]
+    rows = []
+    try:
+        for paths, checkpoint in operations:
+            rows.extend(_purge_row(path, batch) for path, batch in purge_items(
+                paths, engine, index, remove_root=checkpoint.remove_root, checkpoint=checkpoint))
+    finally:
+        if journal is not None:
+            journal.close()
+    return rows, PURGE_FIELDS
+
+
+def run_stale(args, index, executor):
+    provider = ShotgunShowProvider()
+    if args.show:
+        provider = StaticShowProvider([{"code": code, "sg_status": str()} for code in args.show])
+    shows = discover_shows(provider, base_paths=args.paths or None)
+    candidates = find_reclaimable(shows, min_size=STALE_MIN_SIZE if args.min_size is None else args.min_size,
+                                  min_age=STALE_MIN_AGE if args.older_than is None else args.older_than,
+                                  index=index, executor=executor)
+    candidates = sorted(candidates, key=lambda candidate: candidate.score, reverse=True)[:args.limit or None]
+    size_texts = format_sizes([candidate.size for candidate in candidates])
+    rows = [{"path": candidate.path, "show": candidate.show, "size": candidate.size, "size_text": size_text,
+             "files": candidate.files, "newest": _isoformat(candidate.newest),
+             "age_days": round(candidate.age_days, 1), "score": round(candidate.score)}
+            for candidate, size_text in zip(candidates, size_texts)]
+    return rows, STALE_FIELDS
+
+
+def run_duplicates(args, index, executor):
+    paths = args.paths or [path for path in __BASE_PATHS__ + [LOCAL_STORAGE_DRIVE] if path]
+    finder = DuplicateFinder(workers=args.hash_workers,
+                             min_size=DUPLICATE_MIN_SIZE if args.min_size is None else args.min_size,
+                             cache=HashCache(args.hash_cache))
+    groups = list(finder.find(paths))
+    size_texts = format_sizes([group.size for group in groups])
+    reclaimable_texts = format_sizes([group.reclaimable for group in groups])
+    rows = [{"digest": group.digest, "size": group.size, "size_text": size_text, "copies": len(group.paths),
+             "reclaimable": group.reclaimable, "reclaimable_text": reclaimable_text, "paths": group.paths}
+            for group, size_text, reclaimable_text in zip(groups, size_texts, reclaimable_texts)]
+    return rows, DUPLICATE_FIELDS
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m drive_cleanup",
+                                     description="{0} {1}, headless mode. Run without arguments to open the "
+                                                 "GUI.".format(__TOOL_NAME__, __VERSION__))
+    subparsers = parser.add_subparsers(dest="command")
+    helps = {"scan": "Size the folders under PATH, updating the size index",
+             "report": "Report folder sizes from the size index without touching the disk",
+             "purge": "Delete the contents of the folders under PATH that match the filters",
+             "stale": "Rank the shots of every show by size times days since their newest file",
+             "duplicates": "Find identical files under PATH and what removing the extra copies would free"}
+    for command in COMMANDS:
+        sub = subparsers.add_parser(command, help=helps[command])
+        sub.add_argument("paths", nargs="*", metavar="PATH", help="Base paths, defaults to the tool's base paths")
+        if command == "stale":
+            sub.add_argument("--min-size", type=parse_size, default=None,
+                             help="Only shots at least this big, defaults to {0}G".format(STALE_MIN_SIZE // 1024 ** 3))
+            sub.add_argument("--older-than", type=float, default=None, metavar="DAYS",
+                             help="Only shots whose newest file is older than DAYS, defaults to {0}".format(
+                                 STALE_MIN_AGE))
+            sub.add_argument("--show", action="append", default=[], metavar="CODE",
+                             help="Only this show, repeat for more, defaults to every show from Shotgun")
+            sub.add_argument("--limit", type=int, default=0, help="Only the highest ranked shots")
+        elif command == "duplicates":
+            sub.add_argument("--min-size", type=parse_size, default=None,
+                             help="Only files at least this big, defaults to {0}M".format(
+                                 DUPLICATE_MIN_SIZE // 1024 ** 2))
+            sub.add_argument("--hash-workers", type=int, default=DUPLICATE_WORKERS, help="Concurrent file hashes")
+            sub.add_argument("--hash-cache", default=None, help="Hash cache database, defaults to the GUI's")
+        else:
+            sub.add_argument("--min-size", type=parse_size, default=None,
+                             help="Only folders at least this big, e.g. 2G")
+            sub.add_argument("--older-than", type=float, default=None, metavar="DAYS",
+                             help="Only folders whose newest file is older than DAYS")
+        sub.add_argument("--workers", type=int, default=SCAN_MAX_WORKERS, help="Concurrent size scans")
+        sub.add_argument("--volume-workers", type=int, default=SCAN_VOLUME_WORKERS,
+                         help="Concurrent size scans per volume")
+        if command in ("scan", "purge"):
+            sub.add_argument("--mode", choices=["thread", "process"], default=SCAN_MODE,
+                             help="Scan in threads through the size index, or shard each folder across worker "
+                                  "processes without updating the index")
+            sub.add_argument("--processes", type=int, default=SCAN_PROCESSES,
+                             help="Worker processes in process mode, 0 uses one per CPU")
+        if command == "scan":
+            sub.add_argument("--depth", type=int, default=0,
+                             help="Also list sub directories down to this many levels, thread mode only")
+        if command in ("scan", "report"):
+            sub.add_argument("--rollup", choices=["show", "age"], default=None,
+                             help="Sum the folders per show, or per age bucket of their newest file")
+        sub.add_argument("--index", default=None, help="Size index database, defaults to the GUI's")
+        sub.add_argument("--format", choices=["json", "csv"], default="json")
+        sub.add_argument("--output", default=None, help="Write to this file instead of stdout")
+        sub.add_argument("--metrics", default=None, metavar="FILE",
+                         help="Collect operation metrics and write them here on exit, JSON for a .json file and "
+                              "the Prometheus text format otherwise")
+        sub.add_argument("--qos", action="store_true",
+                         help="Pace the filesystem calls of each volume, backing off while they answer slower than "
+                              "--qos-target")
+        sub.add_argument("--qos-target", type=float, default=QOS_TARGET_LATENCY, metavar="SECONDS",
+                         help="Latency of a stat, listing, unlink or rmdir the volumes are held to")
+        sub.add_argument("--qos-budget", type=parse_budget, action="append", default=None, metavar="HOURS:OPS:CALLS",
+                         help="Ops/sec and concurrent calls per volume for a time of day, e.g. 8-20:500:4, 0 ops/sec "
+                              "is unlimited, repeat for more windows")
+        if command == "purge":
+            sub.add_argument("--purge-workers", type=int, default=PURGE_WORKERS, help="Concurrent unlink calls")
+            sub.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE, help="Files per unlink batch")
+            sub.add_argument("--remove-root", action="store_true", help="Remove the matched folders themselves too")
+            sub.add_argument("--journal", default=None,
+                             help="Audit journal to append what is removed to, defaults to the GUI's")
+            sub.add_argument("--no-journal", action="store_true", help="Do not keep an audit journal")
+            sub.add_argument("--checkpoints", default=None,
+                             help="Folder of purge checkpoints to write and resume from, defaults to the GUI's")
+            sub.add_argument("--resume", action="store_true",
+                             help="Finish the purges that were interrupted instead of starting a new one")
+            sub.add_argument("--dry-run", action="store_true",
+                             help="Only plan the deletion: what would be removed, freed and left behind, and how long "
+                                  "it would take")
+            sub.add_argument("--yes", action="store_true", help="Confirm the deletion, nothing is removed without it")
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.error("a command is required, run without arguments to open the GUI")
+    if args.command == "purge" and args.resume and args.dry_run:
+        parser.error("--resume cannot be combined with --dry-run")
+    if args.command == "purge" and not (args.yes or args.dry_run):
+        parser.error("purge deletes files and cannot be undone, pass --yes to confirm or --dry-run "
+                     "to plan it")
+    return args
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv:
+        # Qt is only imported when the GUI is asked for. Anything else is a command, and a mistyped one
+        # fails in argparse instead of opening a window on a machine that may have no display.
+        from . import gui
+        return gui.main(argv)
+
+    logging.basicConfig(format="%(levelname)s: %(message)s")
+    args = parse_args(argv)
+    metrics = Metrics.instance()
+    if args.metrics:
+        metrics.enable()
+    if args.qos:
+        scheduler = IOScheduler.instance()
+        scheduler.configure(target=args.qos_target, budgets=args.qos_budget)
+        scheduler.enable()
+    index = SizeIndex(args.index)
+    executor = ScanExecutor(max_workers=args.workers, volume_workers=args.volume_workers)
+    commands = {"scan": run_scan, "report": run_report, "purge": run_purge, "stale": run_stale,
+                "duplicates": run_duplicates}
+    try:
+        rows, fields = commands[args.command](args, index, executor)
+    finally:
+        executor.shutdown(wait=False)
+        if args.metrics:
+            # Written for failed and interrupted runs as well, those are the slow ones worth a look.
+            try:
+                metrics.dump(args.metrics)
+            except (IOError, OSError) as err:
+                logging.error(err)
+
+    if args.output:
+        with open(args.output, "w") as f_out:
+            write_rows(rows, fields, args.format, f_out)
+    else:
+        write_rows(rows, fields, args.format, sys.stdout)
+    return 1 if any(row.get("errors") for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1551 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 12/08/2023
+
+from __future__ import division
+from __future__ import print_function
+from future import standard_library
+standard_library.install_aliases()
+import os
+import sys
+import bisect
+import heapq
+import queue
+import ntpath
+import psutil
+import scandir
+import stat
+import time
+import sqlite3
+import posixpath
+import itertools
+import threading
+import collections
+import multiprocessing
+import multiprocessing.pool
+
+import logging
+
+from .metrics import FS_OP_SECONDS, QUEUE_DEPTH, Metrics
+from .qos import IOScheduler
+
+__BASE_PATHS__ = [r""]  # Add paths to scan
+LOCAL_STORAGE_DRIVE = ""  # Set Local Storage Drive
+SCAN_MAX_WORKERS = 8  # Concurrent size scans across all volumes
+SCAN_VOLUME_WORKERS = 2  # Concurrent size scans per volume
+SIZE_INDEX_BATCH = 500  # Scans of a scan_items run whose size index writes are committed together
+PURGE_WORKERS = 16  # Concurrent unlink calls while deleting
+PURGE_BATCH_SIZE = 256  # Files per unlink batch
+PURGE_IDLE_TIMEOUT = 30.0  # Seconds an idle purge worker waits for another batch before it exits
+SCAN_MODE = "thread"  # "process" shards each size scan across worker processes, for fast local drives
+SCAN_PROCESSES = 0  # Worker processes for process scans, 0 uses one per CPU
+SHARDS_PER_WORKER = 4  # Shards a tree is split into per worker, more shards even out uneven trees
+SHOW_PROBE_WORKERS = 32  # Concurrent path checks while discovering shows
+DISK_USAGE_INTERVAL = 5.0  # Seconds between disk usage samples of each volume
+DISK_USAGE_TTL = 30.0  # Samples older than this are reported as stale
+PURGE_RATE_ESTIMATE = 2000.0  # Entries removed per second assumed by deletion plans until a purge was measured
+PLAN_PROBLEM_LIMIT = 100  # Unremovable entries a deletion plan keeps the paths of
+STALE_MIN_SIZE = 1024 ** 3  # Smallest shot, in bytes, the reclaimable finder lists
+STALE_MIN_AGE = 90  # Days since its newest file before the reclaimable finder lists a shot
+TRASH_DIR_NAME = ".drive_cleanup_trash"  # Hidden folder trashed items are moved to, never listed as a candidate
+
+_scandir = getattr(os, "scandir", scandir.scandir)  # the stdlib implementation is faster on py3
+_metrics = Metrics.instance()
+_scheduler = IOScheduler.instance()
+_clock = getattr(time, "perf_counter", time.time)  # py3 only
+
+
+SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB", "EB", "ZB", "YB")
+SIZE_POWERS = tuple(1024 ** i_unit for i_unit in range(len(SIZE_UNITS)))
+
+
+def convert_size(_bytes):
+    if _bytes == 0:
+        return "0B", 0
+    # Comparing against exact powers avoids the rounding of math.log right at a unit boundary.
+    log = max(bisect.bisect_right(SIZE_POWERS, _bytes) - 1, 0)
+    size = round(_bytes / SIZE_POWERS[log], 2)
+    gigabyte = round(_bytes / SIZE_POWERS[3], 2)
+    return "{0} {1}".format(size, SIZE_UNITS[log]), gigabyte
+
+
+class Cancelled(Exception):
+    pass
+
+
+class CancelToken(object):
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set():
+            raise Cancelled()
+
+
+def is_empty_dir(path):
+    # Stops at the first entry instead of listing the whole folder.
+    entries = _scandir(path)
+    try:
+        for _entry in entries:
+            return False
+        return True
+    finally:
+        close = getattr(entries, "close", None)
+        if close is not None:
+            close()
+
+
+def _listing(entries):
+    # Iterates a listing and closes it, a directory that fails part way through is logged and ends there
+    # instead of ending the walk. Unclosed listings hold their descriptor until collected (py2, PyPy).
+    try:
+        while True:
+            try:
+                entry = next(entries)
+            except StopIteration:
+                return
+            except OSError as err:
+                logging.error(err)
+                return
+            yield entry
+    finally:
+        close = getattr(entries, "close", None)
+        if close is not None:
+            close()
+
+
+ScanResult = collections.namedtuple("ScanResult", ["size", "files", "dirs", "newest"])
+
+
+def walk_size(path, progress=None, step=1e+6, cancel=None):
+    size = int()
+    files = int()
+    dirs = int()
+    newest = float()
+    last_size = int()
+    # Paced and timed calls only while the scheduler or the metrics are on, otherwise the walk pays a
+    # single check per entry.
+    volume = _io_volume(path)
+    start = _clock()
+    stack = [path]
+    while stack:
+        if cancel is not None:
+            cancel.check()
+        try:
+            current = stack.pop()
+            entries = _scandir(current) if not volume else _io("scandir", volume, _read_dir, current)
+        except OSError as err:
+            logging.error(err)
+            continue
+        for entry in _listing(iter(entries)):
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs += 1
+                    stack.append(entry.path)
+                    continue
+                if not volume:
+                    entry_stat = entry.stat(follow_symlinks=False)
+                else:
+                    entry_stat = _io("stat", volume, entry.stat, follow_symlinks=False)
+            except OSError as err:
+                logging.error(err)
+                continue
+            files += 1
+            size += entry_stat.st_size
+            if entry_stat.st_mtime > newest:
+                newest = entry_stat.st_mtime
+            if progress is not None and (size - last_size) > step:
+                last_size = size
+                progress(size)
+    if volume:
+        _metrics.walked("walk_size", files + dirs, size, _clock() - start)
+    return ScanResult(size, files, dirs, newest)
+
+
+def iter_files(path, cancel=None):
+    # (path, lstat) of every file under path, from the same walk as walk_size.
+    volume = _io_volume(path)
+    stack = [path]
+    while stack:
+        if cancel is not None:
+            cancel.check()
+        try:
+            current = stack.pop()
+            entries = _scandir(current) if not volume else _io("scandir", volume, _read_dir, current)
+        except OSError as err:
+            logging.error(err)
+            continue
+        for entry in _listing(iter(entries)):
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    continue
+                if not volume:
+                    entry_stat = entry.stat(follow_symlinks=False)
+                else:
+                    entry_stat = _io("stat", volume, entry.stat, follow_symlinks=False)
+            except OSError as err:
+                logging.error(err)
+                continue
+            yield entry.path.replace("\\", "/"), entry_stat
+
+
+def list_dir(path, volume=None):
+    # volume paces and times the listing and stats, see _io_volume.
+    size = int()
+    files = int()
+    newest = float()
+    subdirs = []
+    entries = _scandir(path) if not volume else _io("scandir", volume, _read_dir, path)
+    for entry in _listing(iter(entries)):
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(path + "/" + entry.name)
+                continue
+            if not volume:
+                entry_stat = entry.stat(follow_symlinks=False)
+            else:
+                entry_stat = _io("stat", volume, entry.stat, follow_symlinks=False)
+        except OSError as err:
+            logging.error(err)
+            continue
+        files += 1
+        size += entry_stat.st_size
+        if entry_stat.st_mtime > newest:
+            newest = entry_stat.st_mtime
+    return (size, files, newest), subdirs
+
+
+def _io_volume(path):
+    # The volume the filesystem calls under path are paced and timed against, None while neither the
+    # I/O scheduler nor the metrics are on.
+    return volume_of(path) if _scheduler.enabled or _metrics.enabled else None
+
+
+def _read_dir(path):
+    # The whole listing, so a paced "scandir" call covers reading the directory and not just opening it.
+    entries = _scandir(path)
+    try:
+        return list(entries)
+    finally:
+        close = getattr(entries, "close", None)
+        if close is not None:
+            close()
+
+
+def _io(op, volume, fn, *args, **kwargs):
+    # fn(*args, **kwargs) as one call on volume, waiting for the scheduler's go ahead and reporting its
+    # latency back to it and to the metrics.
+    control = _scheduler.acquire(volume) if _scheduler.enabled else None
+    start = _clock()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        seconds = _clock() - start
+        if control is not None:
+            _scheduler.release(control, seconds)
+        _metrics.observe(FS_OP_SECONDS, seconds, op=op, volume=volume)
+
+
+_MOUNT_POINTS = []
+
+
+def volume_of(path):
+    path = str(path).replace("\\", "/")
+    drive = ntpath.splitdrive(path)[0]
+    if drive:
+        return drive.lower()
+    if not _MOUNT_POINTS:
+        try:
+            mounts = [part.mountpoint for part in psutil.disk_partitions(all=True)]
+        except Exception as err:
+            logging.error(err)
+            mounts = []
+        _MOUNT_POINTS.extend(sorted(set(mounts + ["/"]), key=len, reverse=True))
+    for mount in _MOUNT_POINTS:
+        if path == mount or path.startswith(mount.rstrip("/") + "/"):
+            return mount
+    return "/"
+
+
+def config_dir():
+    # The folder QSettings(IniFormat, UserScope, 'griffin_pipeline', ...) keeps the tool's ini file in.
+    if sys.platform == "win32":
+        config = os.environ.get("APPDATA") or os.path.expanduser("~")
+    else:
+        config = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return os.path.join(config, 'griffin_pipeline')
+
+
+class _ScanTask(object):
+    def __init__(self, path, fn, args, priority, order, dropped=None):
+        self.path = path
+        self.volume = volume_of(path)
+        self.fn = fn
+        self.args = args
+        self.priority = priority
+        self.submitted_priority = priority
+        self.order = order
+        self.dropped = dropped
+
+
+class ScanExecutor(object):
+    PRIORITY_VISIBLE = 0
+    PRIORITY_NORMAL = 10
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_workers=SCAN_MAX_WORKERS, volume_workers=SCAN_VOLUME_WORKERS):
+        self._max_workers = max(1, int(max_workers))
+        self._volume_workers = max(1, int(volume_workers))
+        self._condition = threading.Condition()
+        # volume -> heap of (priority, order, task), a pick only looks at the head of each volume.
+        self._pending = {}
+        self._count = int()
+        self._active = collections.Counter()
+        self._order = itertools.count()
+        self._workers = []
+        self._shutdown = False
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def submit(self, path, fn, args=(), priority=PRIORITY_NORMAL, dropped=None):
+        # dropped(*args) is called instead of fn(*args) when a shutdown drops the task before it ran, so
+        # whoever waits on its result is not left waiting.
+        task = _ScanTask(path, fn, args, priority, next(self._order), dropped)
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Cannot submit to a shut down scan executor")
+            heapq.heappush(self._pending.setdefault(task.volume, []), (task.priority, task.order, task))
+            self._count += 1
+            _metrics.gauge(QUEUE_DEPTH, self._count, queue="scan")
+            if len(self._workers) < self._max_workers:
+                worker = threading.Thread(target=self._work, name="ScanWorker-{0}".format(len(self._workers)))
+                worker.daemon = True
+                worker.start()
+                self._workers.append(worker)
+            self._condition.notify()
+        return task
+
+    def prioritize(self, paths, priority=PRIORITY_VISIBLE):
+        # Raises the tasks of paths to priority, the others go back to the priority they were submitted with.
+        paths = set(paths)
+        with self._condition:
+            for volume, heap in self._pending.items():
+                for _priority, _order, task in heap:
+                    task.priority = task.submitted_priority
+                    if task.path in paths:
+                        task.priority = min(task.priority, priority)
+                heap[:] = [(task.priority, task.order, task) for _priority, _order, task in heap]
+                heapq.heapify(heap)
+
+    def pending(self):
+        with self._condition:
+            return self._count
+
+    def shutdown(self, wait=True):
+        # Tasks that did not start are dropped, see submit.
+        with self._condition:
+            self._shutdown = True
+            dropped = [task for heap in self._pending.values() for _priority, _order, task in heap]
+            self._pending.clear()
+            self._count = int()
+            self._condition.notify_all()
+        for task in sorted(dropped, key=lambda task: task.order):
+            if task.dropped is None:
+                continue
+            try:
+                task.dropped(*task.args)
+            except Exception:
+                logging.exception("Dropping scan failed: {0}".format(task.path))
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _next_task(self):
+        ready = [heap for volume, heap in self._pending.items() if self._active[volume] < self._volume_workers]
+        if not ready:
+            return None
+        heap = min(ready, key=lambda heap: heap[0][:2])
+        task = heapq.heappop(heap)[2]
+        if not heap:
+            del self._pending[task.volume]
+        self._count -= 1
+        _metrics.gauge(QUEUE_DEPTH, self._count, queue="scan")
+        return task
+
+    def _work(self):
+        while True:
+            with self._condition:
+                task = self._next_task()
+                while task is None:
+                    if self._shutdown:
+                        return
+                    self._condition.wait()
+                    task = self._next_task()
+                self._active[task.volume] += 1
+            try:
+                task.fn(*task.args)
+            except Exception:
+                logging.exception("Scan failed: {0}".format(task.path))
+            finally:
+                with self._condition:
+                    self._active[task.volume] -= 1
+                    # One slot came free, this worker looks for the next task itself and one waiting
+                    # worker is enough for anything else it unblocked.
+                    self._condition.notify()
+
+
+class SizeIndex(object):
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, db_path=None):
+        self._db_path = db_path or self.default_path()
+        self._local = threading.local()
+        self._pending = []
+        self._pending_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @staticmethod
+    def default_path():
+        return os.path.join(config_dir(), 'drive_cleanup_index.sqlite')
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self._db_path)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+            conn = sqlite3.connect(self._db_path, timeout=60)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS dirs ("
+                         "path TEXT PRIMARY KEY, parent TEXT, mtime REAL, "
+                         "own_size INTEGER, own_files INTEGER, own_newest REAL, "
+                         "size INTEGER, files INTEGER, dirs INTEGER, newest REAL)")
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _normalize(path):
+        return str(path).replace("\\", "/").rstrip("/") or "/"
+
+    def lookup(self, path):
+        path = self._normalize(path)
+        try:
+            row = self._connection().execute("SELECT size, files, dirs, newest FROM dirs WHERE path = ?",
+                                             (path,)).fetchone()
+        except sqlite3.Error as err:
+            logging.error(err)
+            return None
+        return ScanResult(*row) if row else None
+
+    def scan(self, path, progress=None, step=1e+6, cancel=None, store=None, defer=False):
+        # Directories whose mtime is unchanged are not listed again, their own totals and
+        # sub directories come from the index and only the sub directories are re-checked.
+        # With defer the index is only written by the next flush().
+        root = self._normalize(path)
+        try:
+            conn = self._connection()
+            rows = conn.execute("SELECT path, parent, mtime, own_size, own_files, own_newest, "
+                                "size, files, dirs, newest FROM dirs "
+                                "WHERE path = ? OR (path >= ? AND path < ?)", (root, root + "/", root + "0"))
+            cached = dict((row[0], row) for row in rows)
+        except (sqlite3.Error, OSError) as err:
+            logging.error(err)
+            conn = None
+            cached = {}
+        children = collections.defaultdict(list)
+        for row in cached.values():
+            children[row[1]].append(row[0])
+
+        nodes = {}
+        order = []
+        stale = []
+        found = int()
+        last_found = int()
+        volume = _io_volume(root)
+        start = _clock()
+        stack = [root]
+        while stack:
+            if cancel is not None:
+                cancel.check()
+            current = stack.pop()
+            try:
+                if not volume:
+                    mtime = os.stat(current).st_mtime
+                else:
+                    mtime = _io("stat", volume, os.stat, current).st_mtime
+                row = cached.get(current)
+                if row is not None and row[2] == mtime:
+                    own, subdirs, listed = row[3:6], children[current], False
+                else:
+                    (own, subdirs), listed = list_dir(current, volume), True
+                    stale.extend(set(children[current]) - set(subdirs))
+            except OSError as err:
+                logging.error(err)
+                continue
+            nodes[current] = (mtime, own, subdirs, listed)
+            order.append(current)
+            stack.extend(subdirs)
+            found += own[0]
+            if progress is not None and (found - last_found) > step:
+                last_found = found
+                progress(found)
+
+        totals = {}
+        updates = []
+        for current in reversed(order):
+            mtime, own, subdirs, listed = nodes[current]
+            size, files, dirs, newest = own[0], own[1], int(), own[2]
+            for child in subdirs:
+                if child not in totals:
+                    continue
+                child_total = totals[child]
+                size += child_total.size
+                files += child_total.files
+                dirs += child_total.dirs + 1
+                newest = max(newest, child_total.newest)
+            totals[current] = ScanResult(size, files, dirs, newest)
+            row = cached.get(current)
+            if listed or row is None or tuple(row[6:]) != totals[current]:
+                updates.append((current, posixpath.dirname(current), mtime) + tuple(own) + totals[current])
+
+        if conn is not None and defer:
+            with self._pending_lock:
+                self._pending.append((stale, updates))
+        elif conn is not None:
+            self._write(conn, [(stale, updates)])
+        if store is not None:
+            # Every directory goes into the store, in walk order so parents come first.
+            ids = {}
+            for current in order:
+                ids[current] = store.add(current, totals[current], ids.get(posixpath.dirname(current), -1))
+        result = totals.get(root, ScanResult(int(), int(), int(), float()))
+        if volume:
+            # Entries the walk went through, listed or taken from the index.
+            _metrics.walked("size_index", result.files + result.dirs, result.size, _clock() - start)
+        return result
+
+    def _write(self, conn, writes):
+        # One transaction for all the (stale paths, updated rows) of writes.
+        try:
+            with conn:
+                for stale, updates in writes:
+                    for path in stale:
+                        self._forget(conn, path)
+                    conn.executemany("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", updates)
+        except sqlite3.Error as err:
+            logging.error(err)
+
+    def flush(self):
+        # Commits the deferred scans from the calling thread, concurrent scans committing one by one
+        # mostly wait on each other's write lock.
+        with self._pending_lock:
+            writes, self._pending = self._pending, []
+        if not writes:
+            return
+        try:
+            conn = self._connection()
+        except (sqlite3.Error, OSError) as err:
+            logging.error(err)
+            return
+        self._write(conn, writes)
+
+    @staticmethod
+    def _forget(conn, path):
+        conn.execute("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)", (path, path + "/", path + "0"))
+        conn.execute("UPDATE dirs SET mtime = NULL WHERE path = ?", (posixpath.dirname(path),))
+
+    def forget(self, path):
+        path = self._normalize(path)
+        try:
+            conn = self._connection()
+            with conn:
+                self._forget(conn, path)
+        except (sqlite3.Error, OSError) as err:
+            logging.error(err)
+
+
+def _scan_shard(path):
+    # Runs in the pool. Errors come back with the result, a shard that raised must not leave its scan
+    # waiting for a result that never comes.
+    try:
+        return path, walk_size(path), None
+    except Exception as err:
+        return path, None, "{0}: {1}".format(type(err).__name__, err)
+
+
+def _merge_results(first, second):
+    return ScanResult(first.size + second.size, first.files + second.files, first.dirs + second.dirs,
+                      max(first.newest, second.newest))
+
+
+class ShardScanner(object):
+    # Sizes a tree by splitting it into sub directory shards that a pool of workers pulls from.
+    # Unlike SizeIndex.scan nothing is cached, only the merged totals come back.
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, workers=SCAN_PROCESSES, processes=True):
+        self._workers = max(1, int(workers or multiprocessing.cpu_count()))
+        self._processes = processes
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._scans = int()
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def _get_pool(self):
+        with self._pool_lock:
+            self._scans += 1
+            if self._pool is None:
+                if self._processes:
+                    # Spawned workers only import the core, a fork would copy the GUI and its threads.
+                    get_context = getattr(multiprocessing, "get_context", None)
+                    context = get_context("spawn") if get_context is not None else multiprocessing
+                    self._pool = context.Pool(self._workers)
+                else:
+                    self._pool = multiprocessing.pool.ThreadPool(self._workers)
+            return self._pool
+
+    def split(self, path, cancel=None):
+        # Lists directories level by level until there are enough shards, the files of the
+        # directories listed here are returned as the first result.
+        own = ScanResult(int(), int(), int(), float())
+        shards = [path]
+        while shards and len(shards) < self._workers * SHARDS_PER_WORKER:
+            if cancel is not None:
+                cancel.check()
+            split = []
+            for shard in shards:
+                try:
+                    (size, files, newest), subdirs = list_dir(shard)
+                except OSError as err:
+                    logging.error(err)
+                    continue
+                own = _merge_results(own, ScanResult(size, files, int(shard != path), newest))
+                split.extend(subdirs)
+            shards = split
+        return own, shards
+
+    def _release_pool(self, cancelled):
+        # A cancelled scan stops the shards still running in the pool too, unless other scans share it.
+        with self._pool_lock:
+            self._scans -= 1
+            pool = self._pool if cancelled and not self._scans else None
+            if pool is not None:
+                self._pool = None
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    def scan(self, path, progress=None, step=1e+6, cancel=None, store=None):
+        # Shards are handed to the pool a worker's worth at a time, so a cancelled scan leaves no
+        # queue of shards behind for the pool to work through.
+        path = str(path).replace("\\", "/").rstrip("/") or "/"
+        start = _clock()
+        total, shards = self.split(path, cancel)
+        last_size = total.size
+        pool = self._get_pool()
+        done = queue.Queue()
+        running = int()
+        cancelled = False
+        try:
+            while shards or running:
+                while shards and running < self._workers:
+                    pool.apply_async(_scan_shard, (shards.pop(),), callback=done.put)
+                    running += 1
+                while True:
+                    if cancel is not None:
+                        cancel.check()
+                    try:
+                        shard, result, error = done.get(timeout=0.2)
+                        break
+                    except queue.Empty:
+                        continue
+                running -= 1
+                if error is not None:
+                    logging.error("Scan of %s failed: %s", shard, error)
+                    continue
+                total = _merge_results(total, result._replace(dirs=result.dirs + 1))
+                if progress is not None and (total.size - last_size) > step:
+                    last_size = total.size
+                    progress(total.size)
+        except Cancelled:
+            cancelled = True
+            raise
+        finally:
+            self._release_pool(cancelled)
+        if store is not None:
+            store.add(path, total)
+        # The shards are walked in other processes, only the whole scan is measured.
+        _metrics.walked("shard", total.files + total.dirs, total.size, _clock() - start)
+        return total
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.terminate()
+                self._pool.join()
+                self._pool = None
+
+
+def list_items(base_paths):
+    # Cleanup candidates are the folders directly under each base path.
+    for base_path in base_paths:
+        if not base_path or not os.path.isdir(base_path):
+            continue
+        try:
+            entries = list(_scandir(base_path))
+        except OSError as err:
+            logging.error(err)
+            continue
+        for entry in sorted(entries, key=lambda e: e.name):
+            if entry.name == TRASH_DIR_NAME:
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    yield entry.path.replace("\\", "/")
+            except OSError as err:
+                logging.error(err)
+
+
+def scan_items(paths, index=None, executor=None, progress=None, cancel=None, scanner=None, store=None):
+    # Yields (path, ScanResult) in the order the scans finish, cancelled scans are left out.
+    # scanner defaults to the size index, a ShardScanner can be passed in its place.
+    # With a ResultStore the scanned directories are also added to it. Size index writes are committed
+    # every SIZE_INDEX_BATCH scans and once the items are all through.
+    scanner = scanner or index or SizeIndex.instance()
+    executor = executor or ScanExecutor.instance()
+    paths = list(paths)
+    results = queue.Queue()
+    options = {"defer": True} if isinstance(scanner, SizeIndex) else {}
+
+    def _scan(path):
+        result = ScanResult(int(), int(), int(), float())
+        try:
+            if cancel is not None:
+                cancel.check()
+            result = scanner.scan(path, progress=None if progress is None else lambda size: progress(path, size),
+                                  cancel=cancel, store=store, **options)
+        except Cancelled:
+            result = None
+        finally:
+            results.put((path, result))
+
+    def _dropped(path):
+        results.put((path, None))
+
+    for path in paths:
+        executor.submit(path, _scan, [path], dropped=_dropped)
+    try:
+        for i_path in range(len(paths)):
+            path, result = results.get()
+            if options and (i_path + 1) % SIZE_INDEX_BATCH == 0:
+                scanner.flush()
+            if result is not None:
+                yield path, result
+    finally:
+        if options:
+            scanner.flush()
+
+
+class _WalkScanner(object):
+    # Sizes a tree with a plain walk, for scan_items calls that must not trust the size index.
+    def scan(self, path, progress=None, step=1e+6, cancel=None, store=None):
+        result = walk_size(path, progress, step, cancel)
+        if store is not None:
+            store.add(path, result)
+        return result
+
+
+def refresh_items(items, executor=None, cancel=None):
+    # Walks the (path, result) items again and yields them with fresh results, for filters that decide
+    # what gets deleted. Files written in place leave their folder's mtime alone, so the size index can
+    # still hold an older size and newest file for them.
+    return scan_items([path for path, _result in items], executor=executor, cancel=cancel, scanner=_WalkScanner())
+
+
+def cached_items(paths, index=None):
+    # Same as scan_items but only from the size index, paths that were never scanned are left out.
+    index = index or SizeIndex.instance()
+    for path in paths:
+        result = index.lookup(path)
+        if result is not None:
+            yield path, result
+
+
+def filter_items(items, min_size=None, older_than=None, now=None):
+    # older_than is in days and compared against the newest file in the item.
+    now = time.time() if now is None else now
+    for path, result in items:
+        if min_size is not None and result.size < min_size:
+            continue
+        if older_than is not None and now - result.newest < older_than * 86400:
+            continue
+        yield path, result
+
+
+ShowPath = collections.namedtuple("ShowPath", ["name", "status", "mtime", "path"])
+
+
+class ShotgunShowProvider(object):
+    def shows(self):
+        try:
+            import sg_utilities
+        except ImportError as err:
+            logging.error(err)
+            return []
+        return list(sg_utilities.getShows(activeOny=False).values())
+
+
+class StaticShowProvider(object):
+    # Serves a fixed list of show dicts, for tests and benchmarks.
+    def __init__(self, shows):
+        self._shows = list(shows)
+
+    def shows(self):
+        return list(self._shows)
+
+
+def _probe_show(candidate):
+    name, status, path, needs_content = candidate
+    try:
+        path_stat = os.stat(path)
+        if not stat.S_ISDIR(path_stat.st_mode) or (needs_content and is_empty_dir(path)):
+            return None
+    except OSError:
+        return None
+    return ShowPath(name, status, path_stat.st_mtime, path)
+
+
+def discover_shows(provider=None, base_paths=None, local_storage=None, workers=SHOW_PROBE_WORKERS, cancel=None):
+    # Yields a ShowPath for every scenes folder with content, and every vp* show on local storage,
+    # in the order the probes come back.
+    provider = provider or ShotgunShowProvider()
+    base_paths = __BASE_PATHS__ if base_paths is None else base_paths
+    local_storage = LOCAL_STORAGE_DRIVE if local_storage is None else local_storage
+    candidates = []
+    for show_dict in provider.shows():
+        show_name = show_dict['code']
+        show_status = str(show_dict['sg_status'])
+        for base_path in base_paths:
+            path = os.path.join(base_path, show_name, 'scenes').replace('\\', '/')
+            candidates.append((show_name, show_status, path, True))
+        if show_name.startswith('vp') and local_storage:
+            candidates.append((show_name, show_status, os.path.join(local_storage, show_name), False))
+    if not candidates:
+        return
+
+    pool = multiprocessing.pool.ThreadPool(max(1, min(int(workers), len(candidates))))
+    try:
+        for show in pool.imap_unordered(_probe_show, candidates):
+            if cancel is not None and cancel.cancelled():
+                return
+            if show is not None:
+                yield show
+    finally:
+        pool.terminate()
+
+
+Candidate = collections.namedtuple("Candidate", ["path", "show", "size", "files", "newest", "age_days", "score"])
+
+
+def list_shots(show_path):
+    # The non empty folders of a show's scenes folder.
+    try:
+        entries = list(_scandir(show_path))
+    except OSError as err:
+        logging.error(err)
+        return []
+    shots = []
+    for entry in entries:
+        if entry.name == TRASH_DIR_NAME:
+            continue
+        try:
+            if entry.is_dir() and not is_empty_dir(entry.path):
+                shots.append(entry.path.replace("\\", "/"))
+        except OSError as err:
+            logging.error(err)
+    return shots
+
+
+def find_reclaimable(shows, min_size=STALE_MIN_SIZE, min_age=STALE_MIN_AGE, index=None, executor=None, cancel=None,
+                     now=None):
+    # Yields a Candidate for every shot of the ShowPaths in shows that is at least min_size bytes and whose
+    # newest file is at least min_age days old, in the order their fresh walks finish. Size and newest file
+    # come from the same walk, the score ranks shots by bytes times days since anything in them changed.
+    now = time.time() if now is None else now
+    shot_shows = {}
+    for show in shows:
+        if cancel is not None and cancel.cancelled():
+            return
+        for shot in list_shots(show.path):
+            shot_shows[shot] = show.name
+    # The size index only picks the candidates, files written in place leave its results behind. The
+    # candidates are walked again before they are reported.
+    items = scan_items(sorted(shot_shows), index, executor, cancel=cancel)
+    candidates = list(filter_items(items, min_size=min_size, older_than=min_age, now=now))
+    if cancel is not None and cancel.cancelled():
+        return
+    items = refresh_items(candidates, executor, cancel=cancel)
+    for path, result in filter_items(items, min_size=min_size, older_than=min_age, now=now):
+        age_days = (now - result.newest) / 86400 if result.newest else float()
+        yield Candidate(path, shot_shows[path], result.size, result.files, result.newest, age_days,
+                        result.size * age_days)
+
+
+PurgeBatch = collections.namedtuple("PurgeBatch", ["path", "files", "errors", "total_files", "total_dirs",
+                                                 "total_errors", "rate", "total_size"])
+
+
+class _PurgeState(object):
+    def __init__(self, root, progress, remove_root, journal=None, checkpoint=None):
+        self.root = root
+        self.progress = progress
+        self.remove_root = remove_root
+        self.journal = journal
+        self.checkpoint = checkpoint
+        self.lock = threading.Lock()
+        self.pending = collections.Counter()
+        self.start = time.time()
+        self.files = int()
+        self.dirs = int()
+        self.errors = int()
+        # Directories something under which could not be removed, they are not checkpointed as done.
+        self.failed = set()
+        # Batches handed to the engine's workers and not done yet.
+        self.queued = int()
+        self.idle = threading.Condition(self.lock)
+        # Bytes of the files unlinked so far, only known for planned purges, which fill sizes with the
+        # size of each queued file.
+        self.sizes = None
+        self.size = None
+        # Set while the scheduler or the metrics are on, the unlink and rmdir calls go through _io with it.
+        self.volume = _io_volume(root)
+
+    def hold(self, directory, count=1):
+        with self.lock:
+            self.pending[directory] += count
+
+    def release(self, directory, count=1):
+        while directory is not None:
+            with self.lock:
+                self.pending[directory] -= count
+                if self.pending[directory] > 0:
+                    return
+                del self.pending[directory]
+            count = 1
+            if directory != self.root or self.remove_root:
+                try:
+                    if not self.volume:
+                        os.rmdir(directory)
+                    else:
+                        _io("rmdir", self.volume, os.rmdir, directory)
+                    with self.lock:
+                        self.dirs += 1
+                    if self.journal is not None:
+                        self.journal.removed(directory)
+                except OSError as err:
+                    self.error(err)
+                    self.fail(directory)
+                    if self.journal is not None:
+                        self.journal.removed(directory, err)
+            parent = None if directory == self.root else posixpath.dirname(directory)
+            with self.lock:
+                failed = directory in self.failed
+                if failed and parent is not None:
+                    self.failed.add(parent)
+            # Everything under the directory is gone, a resumed purge does not walk it again. Failures are
+            # left out so a resume retries them.
+            if self.checkpoint is not None and not failed:
+                self.checkpoint.subtree(directory)
+            directory = parent
+
+    def error(self, err):
+        logging.error(err)
+        with self.lock:
+            self.errors += 1
+
+    def fail(self, directory):
+        with self.lock:
+            self.failed.add(directory)
+
+    def batch_done(self):
+        with self.lock:
+            self.queued -= 1
+            if not self.queued:
+                self.idle.notify_all()
+
+    def wait(self):
+        with self.lock:
+            while self.queued:
+                self.idle.wait()
+
+    def report(self, path, files, errors):
+        with self.lock:
+            self.files += files
+            elapsed = max(time.time() - self.start, 1e-6)
+            batch = PurgeBatch(path, files, errors, self.files, self.dirs, self.errors, self.files / elapsed,
+                               self.size)
+        if self.progress is not None:
+            self.progress(batch)
+        return batch
+
+
+PlanSummary = collections.namedtuple("PlanSummary", ["paths", "files", "dirs", "size", "reclaimable",
+                                                     "unremovable", "busy", "eta", "problems"])
+
+
+def open_files(root=None):
+    # Files held open by the processes we are allowed to inspect, only those under root when given.
+    prefix = None if root is None else str(root).replace("\\", "/").rstrip("/") + "/"
+    paths = set()
+    for process in psutil.process_iter():
+        try:
+            files = process.open_files()
+        except (psutil.Error, OSError):
+            continue
+        for f_open in files:
+            path = f_open.path.replace("\\", "/")
+            if prefix is None or path.startswith(prefix):
+                paths.add(path)
+    return paths
+
+
+class PurgePlan(object):
+    # What purging root would remove, from a single walk that removes nothing. Directories are kept in
+    # walk order as (path, entries listed, (name, size) of the files that can be removed).
+    def __init__(self, path, root, remove_root=False, rate=PURGE_RATE_ESTIMATE):
+        self.path = path  # as it was asked for, root is normalised
+        self.root = root
+        self.remove_root = remove_root
+        self.rate = rate
+        self.created = time.time()
+        self.directories = []
+        self.blocked = set()
+        self.files = int()
+        self.dirs = int()
+        self.size = int()
+        self.unique_size = int()
+        self.linked = {}  # (device, inode): [size, links, links in the plan] for hard linked files
+        self.busy = int()
+        self.unremovable = int()
+        self.problems = []
+
+    def block(self, path, directory, reason):
+        # path stays, so directory and its parents up to the root cannot be removed either.
+        self.unremovable += 1
+        if len(self.problems) < PLAN_PROBLEM_LIMIT:
+            self.problems.append((path, reason))
+        while directory is not None and directory not in self.blocked:
+            self.blocked.add(directory)
+            directory = None if directory == self.root else posixpath.dirname(directory)
+
+    def add_file(self, entry_stat, busy=False):
+        self.files += 1
+        self.size += entry_stat.st_size
+        if busy:
+            # Unlinked files that are still open only free their space once closed.
+            self.busy += 1
+        elif entry_stat.st_nlink > 1 and entry_stat.st_ino:
+            link = self.linked.setdefault((entry_stat.st_dev, entry_stat.st_ino),
+                                          [entry_stat.st_size, entry_stat.st_nlink, int()])
+            link[2] += 1
+        else:
+            self.unique_size += entry_stat.st_size
+
+    def finish(self):
+        self.dirs = sum(1 for directory, _entries, _names in self.directories
+                        if directory not in self.blocked and (directory != self.root or self.remove_root))
+        return self
+
+    @property
+    def reclaimable(self):
+        # Hard linked files only free their blocks when every link is in the plan.
+        return self.unique_size + sum(size for size, links, seen in self.linked.values() if seen >= links)
+
+    @property
+    def eta(self):
+        return (self.files + self.dirs) / max(self.rate, 1e-6)
+
+    def summary(self):
+        return summarize_plans([self])
+
+
+def summarize_plans(plans):
+    linked = {}
+    unique_size = int()
+    for plan in plans:
+        unique_size += plan.unique_size
+        for key, (size, links, seen) in plan.linked.items():
+            linked.setdefault(key, [size, links, int()])[2] += seen
+    reclaimable = unique_size + sum(size for size, links, seen in linked.values() if seen >= links)
+    problems = [problem for plan in plans for problem in plan.problems][:PLAN_PROBLEM_LIMIT]
+    return PlanSummary(len(plans), sum(plan.files for plan in plans), sum(plan.dirs for plan in plans),
+                       sum(plan.size for plan in plans), reclaimable, sum(plan.unremovable for plan in plans),
+                       sum(plan.busy for plan in plans), sum(plan.eta for plan in plans), problems)
+
+
+class PurgeEngine(object):
+    _rates = {}  # Entries per second of the last purge on each volume
+    _rates_lock = threading.Lock()
+
+    def __init__(self, workers=PURGE_WORKERS, batch_size=PURGE_BATCH_SIZE, journal=None):
+        # journal is a PurgeJournal, without one nothing is recorded per file or directory.
+        self._workers = max(1, int(workers))
+        self._batch_size = max(1, int(batch_size))
+        self._journal = journal
+        # Workers live across purges and are shared by them, started as batches come in and gone again
+        # once idle for PURGE_IDLE_TIMEOUT. Many small purges in a row pay no thread start ups.
+        self._batches = queue.Queue(maxsize=self._workers * 2)
+        self._workers_lock = threading.Lock()
+        self._running = int()
+        self._queued = int()
+
+    @classmethod
+    def rate(cls, path):
+        with cls._rates_lock:
+            return cls._rates.get(volume_of(path), PURGE_RATE_ESTIMATE)
+
+    @classmethod
+    def _measured(cls, state, cancel=None):
+        if cancel is not None and cancel.cancelled():
+            return
+        entries = state.files + state.dirs
+        if entries:
+            with cls._rates_lock:
+                cls._rates[volume_of(state.root)] = entries / max(time.time() - state.start, 1e-6)
+
+    def _put(self, state, batch, cancel):
+        # Counted before the put, so no worker gives up while a batch is on its way to the queue.
+        with self._workers_lock:
+            self._queued += 1
+            if self._running < self._workers:
+                worker = threading.Thread(target=self._work, name="PurgeWorker-{0}".format(self._running))
+                worker.daemon = True
+                worker.start()
+                self._running += 1
+        with state.lock:
+            state.queued += 1
+        self._batches.put((state, batch, cancel))
+        if _metrics.enabled:
+            _metrics.gauge(QUEUE_DEPTH, self._batches.qsize(), queue="purge")
+
+    def _flush(self, state, batch, cancel):
+        # Hands over the last batch and waits for all of them. A purge that queued nothing else unlinks
+        # it in the calling thread, a tree that fits in one batch is done sooner than it is handed over.
+        if batch and (cancel is None or not cancel.cancelled()):
+            if state.queued:
+                self._put(state, batch, cancel)
+            else:
+                self._unlink(state, batch, cancel)
+        state.wait()
+
+    def _work(self):
+        while True:
+            try:
+                state, batch, cancel = self._batches.get(timeout=PURGE_IDLE_TIMEOUT)
+            except queue.Empty:
+                with self._workers_lock:
+                    if not self._queued:
+                        self._running -= 1
+                        return
+                continue
+            try:
+                self._unlink(state, batch, cancel)
+            except Exception:
+                logging.exception("Purge batch failed: {0}".format(state.root))
+            finally:
+                with self._workers_lock:
+                    self._queued -= 1
+                state.batch_done()
+
+    def _finish(self, state, cancel=None):
+        # The bytes freed are only known for planned purges, a purge without a plan does not stat its files.
+        self._measured(state, cancel)
+        batch = state.report(state.root, int(), int())
+        if state.volume:
+            _metrics.walked("purge", batch.total_files + batch.total_dirs, batch.total_size, time.time() - state.start)
+        if self._journal is not None:
+            self._journal.finished(state.root, batch, cancelled=cancel is not None and cancel.cancelled())
+        return batch
+
+    def plan(self, path, remove_root=False, cancel=None, busy=None):
+        # Raises Cancelled when cancelled. busy is a set of open files, see open_files().
+        root = str(path).replace("\\", "/").rstrip("/") or "/"
+        plan = PurgePlan(path, root, remove_root, self.rate(root))
+        busy = open_files(root) if busy is None else busy
+        if os.path.islink(root):
+            plan.block(root, root, "symbolic link")
+            return plan.finish()
+        if remove_root and not os.access(posixpath.dirname(root) or "/", os.W_OK | os.X_OK):
+            plan.block(root, root, "permission denied")
+
+        uid = os.getuid() if hasattr(os, "getuid") else None
+        windows = sys.platform == "win32"
+        volume = _io_volume(root)
+        stack = [root]
+        while stack:
+            if cancel is not None:
+                cancel.check()
+            current = stack.pop()
+            try:
+                if not volume:
+                    entries = list(_scandir(current))
+                    current_stat = os.stat(current)
+                else:
+                    entries = _io("scandir", volume, _read_dir, current)
+                    current_stat = _io("stat", volume, os.stat, current)
+            except OSError as err:
+                plan.block(current, current, err.strerror or str(err))
+                plan.directories.append((current, int(), []))
+                continue
+            writable = os.access(current, os.W_OK | os.X_OK)
+            # In sticky directories (/tmp) only the owners may remove an entry.
+            sticky = bool(current_stat.st_mode & stat.S_ISVTX) and uid not in (None, 0)
+            names = []
+            for entry in entries:
+                entry_path = current + "/" + entry.name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if not volume:
+                        entry_stat = entry.stat(follow_symlinks=False)
+                    else:
+                        entry_stat = _io("stat", volume, entry.stat, follow_symlinks=False)
+                except OSError as err:
+                    plan.block(entry_path, current, err.strerror or str(err))
+                    continue
+                reason = None
+                if not writable:
+                    reason = "permission denied"
+                elif sticky and uid not in (entry_stat.st_uid, current_stat.st_uid):
+                    reason = "owned by another user"
+                elif windows and not is_dir and not entry_stat.st_mode & stat.S_IWRITE:
+                    reason = "read only"
+                elif windows and entry_path in busy:
+                    reason = "in use"
+                if is_dir:
+                    if reason:
+                        plan.block(entry_path, entry_path, reason)
+                    stack.append(entry_path)
+                    continue
+                if reason:
+                    plan.block(entry_path, current, reason)
+                    continue
+                names.append((entry.name, entry_stat.st_size))
+                plan.add_file(entry_stat, entry_path in busy)
+            plan.directories.append((current, len(entries), names))
+        return plan.finish()
+
+    def execute(self, plan, progress=None, cancel=None, checkpoint=None):
+        # Purges what the plan found without walking again. Entries created since the plan was made are
+        # left alone, and so are their directories.
+        state = _PurgeState(plan.root, progress, plan.remove_root, self._journal, checkpoint)
+        state.sizes = {}
+        state.size = int()
+        if self._journal is not None:
+            self._journal.started(plan.root, plan.remove_root, planned=True)
+
+        for directory, entries, _names in plan.directories:
+            state.hold(directory, entries + 1)
+        batch = []
+        # Children are listed after their parents, so walking back releases their listing holds first. A
+        # cancelled run keeps the holds it has not released yet, and those directories and their parents stay.
+        # Blocked directories keep their listing hold, so neither they nor their parents are removed.
+        for directory, _entries, names in reversed(plan.directories):
+            if cancel is not None and cancel.cancelled():
+                break
+            if directory not in plan.blocked:
+                state.release(directory)
+            for name, size in names:
+                path = directory + "/" + name
+                state.sizes[path] = size
+                batch.append((directory, path))
+                if len(batch) >= self._batch_size:
+                    self._put(state, batch, cancel)
+                    batch = []
+        self._flush(state, batch, cancel)
+        return self._finish(state, cancel)
+
+    def purge(self, path, progress=None, remove_root=False, cancel=None, checkpoint=None):
+        # With a PurgeCheckpoint the finished sub directories are recorded, and the ones it already has
+        # from an interrupted run are not walked again.
+        root = str(path).replace("\\", "/").rstrip("/") or "/"
+        state = _PurgeState(root, progress, remove_root, self._journal, checkpoint)
+        if os.path.islink(root):
+            state.error("Cannot call remove on a symbolic link: {0}".format(root))
+            return state.report(root, int(), int())
+        done = checkpoint.done if checkpoint is not None else ()
+        if root in done:
+            return state.report(root, int(), int())
+        if self._journal is not None:
+            self._journal.started(root, remove_root)
+
+        batch = []
+        stack = [root]
+        state.hold(root)
+        while stack:
+            # A cancelled walk keeps its holds, directories it did not finish are never removed.
+            if cancel is not None and cancel.cancelled():
+                break
+            current = stack.pop()
+            try:
+                if not state.volume:
+                    entries = list(_scandir(current))
+                else:
+                    entries = _io("scandir", state.volume, _read_dir, current)
+            except OSError as err:
+                state.error(err)
+                entries = []
+            for entry in entries:
+                entry_path = current + "/" + entry.name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    is_dir = False
+                if is_dir and entry_path in done:
+                    continue
+                state.hold(current)
+                if is_dir:
+                    state.hold(entry_path)
+                    stack.append(entry_path)
+                    continue
+                batch.append((current, entry_path))
+                if len(batch) >= self._batch_size:
+                    self._put(state, batch, cancel)
+                    batch = []
+            # Directories are only removed once their listing, files and sub directories are done.
+            state.release(current)
+        self._flush(state, batch, cancel)
+        return self._finish(state, cancel)
+
+    @staticmethod
+    def _unlink(state, batch, cancel=None):
+        if cancel is not None and cancel.cancelled():
+            return
+        done = collections.Counter()
+        failed = []
+        for directory, path in batch:
+            try:
+                if not state.volume:
+                    os.remove(path)
+                else:
+                    _io("unlink", state.volume, os.remove, path)
+            except OSError as err:
+                state.error(err)
+                state.fail(directory)
+                failed.append((path, err))
+            done[directory] += 1
+        errors = len(failed)
+        # Journaled before the releases below, which may remove the directories.
+        if state.journal is not None:
+            state.journal.unlinked(batch, failed)
+        if state.sizes is not None:
+            sizes = [state.sizes.pop(path, int()) for _directory, path in batch]
+            size = sum(sizes)
+            if failed:
+                failed_paths = set(path for path, _err in failed)
+                size -= sum(file_size for (_directory, path), file_size in zip(batch, sizes)
+                            if path in failed_paths)
+            with state.lock:
+                state.size += size
+        for directory, count in done.items():
+            state.release(directory, count)
+        state.report(batch[-1][1], len(batch) - errors, errors)
+
+
+def purge_items(paths, engine=None, index=None, progress=None, cancel=None, remove_root=False, checkpoint=None):
+    # Yields (path, PurgeBatch) for each path that was purged without being cancelled.
+    # A PurgeCheckpoint that was begun with the paths tracks them, and is ended once all are done. Paths
+    # with errors are not finished, their checkpoint is kept for a resume to retry them.
+    engine = engine or PurgeEngine()
+    index = index or SizeIndex.instance()
+    for path in paths:
+        if cancel is not None and cancel.cancelled():
+            return
+        batch = engine.purge(path, progress=progress, remove_root=remove_root, cancel=cancel, checkpoint=checkpoint)
+        index.forget(path)
+        if cancel is None or not cancel.cancelled():
+            if checkpoint is not None and not batch.total_errors:
+                checkpoint.finished(path)
+            yield path, batch
+    if checkpoint is not None and not (cancel is not None and cancel.cancelled()) and not checkpoint.remaining():
+        checkpoint.end()
+
+
+def plan_items(paths, engine=None, remove_root=False, cancel=None):
+    # One PurgePlan per path, or None when cancelled. Open files are looked up once for all of them.
+    engine = engine or PurgeEngine()
+    busy = open_files()
+    try:
+        return [engine.plan(path, remove_root=remove_root, cancel=cancel, busy=busy) for path in paths]
+    except Cancelled:
+        return None
+
+
+def execute_plans(plans, engine=None, index=None, progress=None, cancel=None, checkpoint=None):
+    # Same as purge_items, from plans made by plan_items.
+    engine = engine or PurgeEngine()
+    index = index or SizeIndex.instance()
+    for plan in plans:
+        if cancel is not None and cancel.cancelled():
+            return
+        batch = engine.execute(plan, progress=progress, cancel=cancel, checkpoint=checkpoint)
+        index.forget(plan.path)
+        if cancel is None or not cancel.cancelled():
+            if checkpoint is not None and not batch.total_errors:
+                checkpoint.finished(plan.path)
+            yield plan.path, batch
+    if checkpoint is not None and not (cancel is not None and cancel.cancelled()) and not checkpoint.remaining():
+        checkpoint.end()
+
+
+class ProgressTable(object):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+
+    def update(self, key, **values):
+        with self._lock:
+            self._entries.setdefault(key, {}).update(values)
+
+    def increment(self, key, field, value):
+        with self._lock:
+            entry = self._entries.setdefault(key, {})
+            entry[field] = entry.get(field, 0) + value
+
+    def take(self):
+        with self._lock:
+            entries, self._entries = self._entries, collections.OrderedDict()
+        return entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+DiskUsage = collections.namedtuple("DiskUsage", ["path", "total", "used", "free", "sampled"])
+DiskSnapshot = collections.namedtuple("DiskSnapshot", ["total", "used", "free", "freed_per_minute", "volumes",
+                                                       "stale"])
+
+
+class DiskUsageMonitor(object):
+    # Samples each volume on its own daemon thread so a stalled mount only holds up its own numbers,
+    # readers only ever see the cached samples.
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, paths, interval=DISK_USAGE_INTERVAL, ttl=DISK_USAGE_TTL):
+        self._paths = collections.OrderedDict()
+        for path in paths:
+            if path:
+                self._paths.setdefault(volume_of(path), path)
+        self._interval = interval
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._history = collections.deque()
+        # One per sampler, a wake cleared by one sampler must not be lost on the others.
+        self._wakes = dict((volume, threading.Event()) for volume in self._paths)
+        self._stopped = threading.Event()
+        self._threads = []
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                paths = [path for path in __BASE_PATHS__ + [LOCAL_STORAGE_DRIVE] if path]
+                cls._instance = cls(paths or [os.path.expanduser("~")])
+                cls._instance.start()
+            return cls._instance
+
+    def volumes(self):
+        return list(self._paths.keys())
+
+    def start(self):
+        if self._threads:
+            return
+        for volume, path in self._paths.items():
+            thread = threading.Thread(target=self._run, args=[volume, path], name="DiskUsage-{0}".format(volume))
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stopped.set()
+        self.refresh()
+
+    def refresh(self):
+        # Wakes the samplers early, e.g. after an item was deleted.
+        for wake in self._wakes.values():
+            wake.set()
+
+    def _run(self, volume, path):
+        wake = self._wakes[volume]
+        while not self._stopped.is_set():
+            # Cleared before sampling, a refresh asked for meanwhile is sampled again straight away.
+            wake.clear()
+            self.sample(volume, path)
+            wake.wait(self._interval)
+
+    def sample(self, volume=None, path=None):
+        # Samples one volume, or all of them in turn when called without arguments.
+        if volume is None:
+            for volume, path in self._paths.items():
+                self.sample(volume, path)
+            return
+        try:
+            usage = psutil.disk_usage(path)
+        except Exception as err:
+            logging.error(err)
+            return
+        now = time.time()
+        with self._lock:
+            self._samples[volume] = DiskUsage(path, usage.total, usage.used, usage.free, now)
+            self._history.append((now, sum(sample.free for sample in self._samples.values()),
+                                  len(self._samples)))
+            while len(self._history) > 1 and now - self._history[1][0] >= 60:
+                self._history.popleft()
+
+    def snapshot(self):
+        now = time.time()
+        with self._lock:
+            samples = dict(self._samples)
+            history = list(self._history)
+        total = sum(sample.total for sample in samples.values())
+        used = sum(sample.used for sample in samples.values())
+        free = sum(sample.free for sample in samples.values())
+        freed = float()
+        # Only compare totals that cover the same number of volumes.
+        comparable = [entry for entry in history if entry[2] == len(samples)]
+        if len(comparable) > 1 and comparable[-1][0] > comparable[0][0]:
+            freed = (comparable[-1][1] - comparable[0][1]) / (comparable[-1][0] - comparable[0][0]) * 60
+        stale = len(samples) < len(self._paths) or any(now - sample.sampled > self._ttl
+                                                        for sample in samples.values())
+        return DiskSnapshot(total, used, free, max(freed, float()), samples, stale)
@@ -0,0 +1,231 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 17/10/2026
+
+from __future__ import division
+import os
+import mmap
+import stat
+import sqlite3
+import hashlib
+import threading
+import collections
+import multiprocessing.pool
+
+import logging
+
+from .core import Cancelled, config_dir, iter_files
+
+DUPLICATE_MIN_SIZE = 1024 ** 2  # Files smaller than this are not checked for duplicates
+DUPLICATE_BLOCK = 64 * 1024  # Bytes read from each end of a file for the partial hash
+DUPLICATE_WORKERS = 8  # Concurrent file hashes
+
+_hash = getattr(hashlib, "blake2b", hashlib.sha1)  # blake2b is py3 only
+
+DuplicateGroup = collections.namedtuple("DuplicateGroup", ["size", "digest", "paths", "reclaimable"])
+
+
+class HashCache(object):
+    # Partial and full file hashes keyed by device and inode, an entry only counts while the file still has
+    # the size and mtime it was hashed at.
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, db_path=None):
+        self._db_path = db_path or self.default_path()
+        self._local = threading.local()
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @staticmethod
+    def default_path():
+        return os.path.join(config_dir(), 'drive_cleanup_hashes.sqlite')
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self._db_path)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+            conn = sqlite3.connect(self._db_path, timeout=60)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS hashes ("
+                         "key TEXT PRIMARY KEY, size INTEGER, mtime REAL, partial TEXT, full TEXT)")
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def key(path, file_stat):
+        # Windows scandir results carry no inode, those files are keyed by path.
+        if file_stat.st_ino:
+            return "{0}:{1}".format(file_stat.st_dev, file_stat.st_ino)
+        return path
+
+    def lookup(self, key, size, mtime):
+        try:
+            row = self._connection().execute("SELECT size, mtime, partial, full FROM hashes WHERE key = ?",
+                                             (key,)).fetchone()
+        except sqlite3.Error as err:
+            logging.error(err)
+            return None, None
+        if row is None or row[0] != size or row[1] != mtime:
+            return None, None
+        return row[2], row[3]
+
+    def store(self, entries):
+        # entries are (key, size, mtime, partial, full)
+        try:
+            conn = self._connection()
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO hashes (key, size, mtime, partial, full) "
+                                 "VALUES (?, ?, ?, ?, ?)", entries)
+        except sqlite3.Error as err:
+            logging.error(err)
+
+
+def _partial_hash(job):
+    # First and last DUPLICATE_BLOCK bytes, the whole file when it is no bigger than two blocks.
+    index, path, size = job
+    digest = _hash()
+    try:
+        with open(path, "rb") as f_in:
+            digest.update(f_in.read(DUPLICATE_BLOCK))
+            if size > DUPLICATE_BLOCK:
+                f_in.seek(max(size - DUPLICATE_BLOCK, DUPLICATE_BLOCK))
+                digest.update(f_in.read(DUPLICATE_BLOCK))
+    except (IOError, OSError) as err:
+        logging.error(err)
+        return index, None
+    return index, digest.hexdigest()
+
+
+def _full_hash(job):
+    # Hashed straight from a read only mapping, the hash releases the GIL while it runs over the pages.
+    index, path, _size = job
+    digest = _hash()
+    try:
+        with open(path, "rb") as f_in:
+            mapped = mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                digest.update(mapped)
+            finally:
+                mapped.close()
+    except (IOError, OSError, ValueError) as err:
+        logging.error(err)
+        return index, None
+    return index, digest.hexdigest()
+
+
+class _Candidate(object):
+    __slots__ = ("key", "path", "size", "mtime", "partial", "full", "changed")
+
+    def __init__(self, key, path, size, mtime, partial=None, full=None):
+        self.key = key
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.partial = partial
+        self.full = full
+        self.changed = False
+
+
+class DuplicateFinder(object):
+    # Finds identical files in three stages, each one only looking at what the previous could not rule out:
+    # the same size, the same hash of the first and last blocks, then the same hash of the whole file.
+    def __init__(self, workers=DUPLICATE_WORKERS, min_size=DUPLICATE_MIN_SIZE, cache=None):
+        self._workers = max(1, int(workers))
+        self._min_size = max(1, int(min_size))
+        self._cache = cache
+        self.stats = collections.Counter()
+
+    def find(self, paths, cancel=None):
+        # Yields a DuplicateGroup per set of identical files under paths, most reclaimable first.
+        # Hard links to one inode are a single file, they do not take up space twice.
+        self.stats.clear()
+        try:
+            candidates = self._same_size(paths, cancel)
+        except Cancelled:
+            return
+        pool = multiprocessing.pool.ThreadPool(self._workers)
+        try:
+            groups = self._hashed(pool, _partial_hash, "partial", candidates, cancel)
+            # Files no bigger than two blocks were read whole for the partial hash already.
+            small = [group for group in groups if group[0].size <= 2 * DUPLICATE_BLOCK]
+            for candidate in (candidate for group in small for candidate in group):
+                candidate.full = candidate.partial
+            large = [candidate for group in groups if group[0].size > 2 * DUPLICATE_BLOCK for candidate in group]
+            groups = self._hashed(pool, _full_hash, "full", large, cancel) + small
+        except Cancelled:
+            return
+        finally:
+            pool.terminate()
+            if self._cache is not None:
+                self._cache.store([(candidate.key, candidate.size, candidate.mtime, candidate.partial, candidate.full)
+                                   for candidate in candidates if candidate.changed])
+
+        duplicates = [DuplicateGroup(group[0].size, group[0].full, sorted(candidate.path for candidate in group),
+                                     group[0].size * (len(group) - 1)) for group in groups]
+        self.stats["groups"] = len(duplicates)
+        self.stats["reclaimable"] = sum(group.reclaimable for group in duplicates)
+        for group in sorted(duplicates, key=lambda group: group.reclaimable, reverse=True):
+            yield group
+
+    def _same_size(self, paths, cancel):
+        sizes = collections.defaultdict(list)
+        seen = set()
+        for root in paths:
+            for path, file_stat in iter_files(root, cancel):
+                if path in seen or not stat.S_ISREG(file_stat.st_mode) or file_stat.st_size < self._min_size:
+                    continue
+                seen.add(path)
+                sizes[file_stat.st_size].append((path, file_stat))
+        self.stats["files"] = len(seen)
+
+        candidates = []
+        for size, files in sizes.items():
+            if len(files) < 2:
+                continue
+            inodes = {}
+            for path, file_stat in files:
+                if not file_stat.st_ino:
+                    # The file may have gone or become unreadable since it was listed.
+                    try:
+                        file_stat = os.stat(path)
+                    except OSError as err:
+                        logging.error(err)
+                        continue
+                inodes.setdefault(HashCache.key(path, file_stat), (path, file_stat))
+            if len(inodes) < 2:
+                continue
+            for key, (path, file_stat) in inodes.items():
+                candidate = _Candidate(key, path, size, file_stat.st_mtime)
+                if self._cache is not None:
+                    candidate.partial, candidate.full = self._cache.lookup(key, size, file_stat.st_mtime)
+                candidates.append(candidate)
+        self.stats["same_size"] = len(candidates)
+        return candidates
+
+    def _hashed(self, pool, hasher, field, candidates, cancel):
+        # Sets field to the hasher's digest where the cache did not have it, and returns the groups of two or
+        # more candidates that share a size and digest.
+        jobs = [(index, candidate.path, candidate.size) for index, candidate in enumerate(candidates)
+                if getattr(candidate, field) is None]
+        self.stats[field + "_cached"] += len(candidates) - len(jobs)
+        self.stats[field + "_hashed"] += len(jobs)
+        for index, digest in pool.imap_unordered(hasher, jobs):
+            if cancel is not None:
+                cancel.check()
+            setattr(candidates[index], field, digest)
+            candidates[index].changed = True
+
+        groups = collections.defaultdict(list)
+        for candidate in candidates:
+            if getattr(candidate, field) is not None:
+                groups[(candidate.size, getattr(candidate, field))].append(candidate)
+        return [group for group in groups.values() if len(group) > 1]
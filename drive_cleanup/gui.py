@@ -0,0 +1,1809 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 12/08/2023
+
+from __future__ import division
+from __future__ import print_function
+from future import standard_library
+standard_library.install_aliases()
+import os
+import sys
+import time
+import datetime
+import posixpath
+import subprocess
+from PySide2 import QtWidgets
+from PySide2 import QtCore
+from PySide2 import QtGui
+
+import logging
+import logging.handlers
+
+from . import __TOOL_NAME__, __VERSION__
+from .core import (SCAN_MODE, STALE_MIN_SIZE, STALE_MIN_AGE, CancelToken, DiskUsageMonitor, ProgressTable, PurgeEngine, ScanExecutor, ShardScanner,
+                   TRASH_DIR_NAME, SizeIndex, config_dir, convert_size, discover_shows, execute_plans, find_reclaimable, is_empty_dir,
+                   plan_items, purge_items, scan_items, summarize_plans, _scandir)
+from .store import ResultStore
+from .journal import JOURNAL_ENABLED, PurgeJournal, PurgeCheckpoint
+from .duplicates import DUPLICATE_MIN_SIZE, DuplicateFinder, HashCache
+from .watcher import DirectoryWatcher
+from .metrics import GUI_LAG_SECONDS, GUI_SLOT_SECONDS, Metrics
+from .qos import QOS_ENABLED, IOScheduler
+from .trash import TRASH_DELETE, TRASH_GRACE_PERIOD, TrashCan, TrashCollector, stored_path
+
+PROGRESS_INTERVAL_MS = 100  # How often worker progress is pushed to the lists
+LIST_PAGE_SIZE = 200  # Rows added to a list each time the view scrolls to the end
+SHOT_BATCH_SIZE = 100  # Shot folders sent to the contents list per signal
+LOG_MAX_BYTES = 10 * 1024 ** 2  # Size DriveCleanup.log is rotated at
+LOG_BACKUPS = 3  # Rotated logs kept
+WATCH_UPDATE_MS = 250  # Delay before the watched folders follow rows being added or removed
+DIAGNOSTICS_REFRESH_MS = 1000  # How often the diagnostics panel shows the metrics again
+
+_metrics = Metrics.instance()
+
+
+def setup_logging():
+    # Same as the old basicConfig call, but appending to a rotating log next to the tool's settings
+    # rather than truncating DriveCleanup.log in whatever folder the tool was started from.
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    directory = config_dir()
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    handler = logging.handlers.RotatingFileHandler(os.path.join(directory, 'DriveCleanup.log'),
+                                                   maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    root.addHandler(handler)
+
+
+def _format_date(mtime):
+    if not mtime:
+        return str()
+    return QtCore.QDateTime.fromMSecsSinceEpoch(int(mtime * 1000)).toString()
+
+
+def _format_size(size):
+    if size is None:
+        return str()
+    return convert_size(size)[0]
+
+
+def _format_score(score):
+    if score is None:
+        return str()
+    return convert_size(int(score))[0] + "-days"
+
+
+def _format_duration(seconds):
+    return str(datetime.timedelta(seconds=int(round(seconds))))
+
+
+class PathRecord(object):
+    # One list row. Size, file count, mtime and path live in the model's ResultStore, the rest in slots.
+    __slots__ = ("_store", "id", "name", "status", "show", "score", "original", "trashed", "expires", "enabled",
+                 "ready")
+    _store_keys = {"size": "sizes", "files": "files", "mtime": "mtimes"}
+    _slot_keys = {"name", "status", "show", "score", "original", "trashed", "expires", "enabled", "ready"}
+
+    def __init__(self, store, values):
+        self._store = store
+        self.id = store.add(values["path"])
+        self.name = values.get("name", str())
+        self.status = values.get("status", str())
+        self.show = values.get("show", str())
+        self.score = values.get("score")
+        self.original = values.get("original", str())
+        self.trashed = values.get("trashed")
+        self.expires = values.get("expires")
+        self.enabled = values.get("enabled", True)
+        self.ready = values.get("ready", True)
+        self["size"] = values.get("size")
+        self.update((key, values[key]) for key in ("files", "mtime") if key in values)
+
+    def __getitem__(self, key):
+        if key == "path":
+            return self._store.names[self.id]
+        column = self._store_keys.get(key)
+        if column is not None:
+            value = getattr(self._store, column)[self.id]
+            return None if key == "size" and value < 0 else value
+        if key not in self._slot_keys:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        column = self._store_keys.get(key)
+        if column is not None:
+            # Sizes that are not known yet are kept as -1.
+            if key == "size" and value is None:
+                value = -1
+            getattr(self._store, column)[self.id] = float(value) if key == "mtime" else int(value)
+        elif key in self._slot_keys:
+            setattr(self, key, value)
+        else:
+            raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def update(self, values):
+        for key, value in dict(values).items():
+            self[key] = value
+
+
+class PathTableModel(QtCore.QAbstractTableModel):
+    SortRole = QtCore.Qt.UserRole + 1
+    _formatters = {"size": _format_size, "mtime": _format_date, "score": _format_score, "trashed": _format_date,
+                   "expires": _format_date}
+    _text_keys = {"name", "path", "status", "show", "original"}
+
+    def __init__(self, columns, parent=None, page_size=LIST_PAGE_SIZE):
+        super(PathTableModel, self).__init__(parent)
+        self._columns = columns
+        self._page_size = page_size
+        self._pending = []
+        self._store = ResultStore()
+        self._rows = []
+        self._path_records = {}
+        self._path_rows = {}
+        self._sort_column = -1
+        self._sort_order = QtCore.Qt.AscendingOrder
+        self._sorted = False
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self._columns[section][0]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        key = self._columns[index.column()][1]
+        value = self._rows[index.row()].get(key)
+        if role == QtCore.Qt.DisplayRole:
+            formatter = self._formatters.get(key)
+            if formatter is not None:
+                return formatter(value)
+            return str() if value is None else str(value)
+        if role == self.SortRole:
+            return value
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.ItemIsDropEnabled
+        flags = QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsDragEnabled
+        if self._rows[index.row()].get("enabled", True):
+            flags |= QtCore.Qt.ItemIsEnabled
+        return flags
+
+    def record(self, row):
+        return self._rows[row]
+
+    def recordFromPath(self, path):
+        return self._path_records.get(path)
+
+    def _row(self, path):
+        # Rows are re-indexed lazily, sorting only invalidates the path -> row map.
+        if self._path_rows is None:
+            self._path_rows = dict(zip([record["path"] for record in self._rows], range(len(self._rows))))
+        return self._path_rows.get(path)
+
+    def records(self):
+        return list(self._rows)
+
+    def addRecords(self, records):
+        records = [PathRecord(self._store, record) for record in records
+                   if record["path"] not in self._path_records]
+        if not records:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(records) - 1)
+        for record in records:
+            self._path_records[record["path"]] = record
+            if self._path_rows is not None:
+                self._path_rows[record["path"]] = len(self._rows)
+            self._rows.append(record)
+        self.endInsertRows()
+        self._sorted = False
+        self.resort()
+
+    def queueRecords(self, records):
+        # Queued records are only added as the view asks for them, see fetchMore.
+        self._pending.extend(records)
+        if len(self._rows) < self._page_size:
+            self.fetchMore()
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        return not parent.isValid() and bool(self._pending)
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        if parent.isValid() or not self._pending:
+            return
+        page = self._pending[:self._page_size]
+        del self._pending[:self._page_size]
+        self.addRecords(page)
+
+    def updatePath(self, path, **values):
+        row = self._row(path)
+        if row is None:
+            return False
+        self._rows[row].update(values)
+        if 0 <= self._sort_column < len(self._columns) and self._columns[self._sort_column][1] in values:
+            self._sorted = False
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self._columns) - 1))
+        return True
+
+    def removePaths(self, paths):
+        if self._pending:
+            paths = set(paths)
+            self._pending = [record for record in self._pending if record["path"] not in paths]
+        rows = sorted((self._row(path) for path in set(paths) if path in self._path_records), reverse=True)
+        for row in rows:
+            self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+            del self._path_records[self._rows[row]["path"]]
+            del self._rows[row]
+            self.endRemoveRows()
+        if rows:
+            self._path_rows = None
+        return len(rows)
+
+    def clear(self):
+        self.beginResetModel()
+        self._pending = []
+        self._store = ResultStore()
+        self._rows = []
+        self._path_records = {}
+        self._path_rows = {}
+        self.endResetModel()
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        if (column, order) != (self._sort_column, self._sort_order):
+            self._sort_column = column
+            self._sort_order = order
+            self._sorted = False
+        self.resort()
+
+    def resort(self):
+        if self._sorted or not 0 <= self._sort_column < len(self._columns):
+            return
+        key = self._columns[self._sort_column][1]
+        # Sort keys read the store columns and slots directly rather than through record[key].
+        if key == "path":
+            names = self._store.names
+            sort_key = lambda record: names[record.id].lower()
+        elif key in self._text_keys:
+            sort_key = lambda record: getattr(record, key).lower()
+        elif key in PathRecord._store_keys:
+            values = getattr(self._store, PathRecord._store_keys[key])
+            sort_key = lambda record: values[record.id]
+        else:
+            sort_key = lambda record: getattr(record, key) or 0
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        persistent_records = [(self._rows[index.row()], index.column()) for index in persistent]
+        self._rows.sort(key=sort_key, reverse=self._sort_order == QtCore.Qt.DescendingOrder)
+        self._path_rows = None
+        self._sorted = True
+        if persistent:
+            wanted = set(id(record) for record, _column in persistent_records)
+            rows = dict((id(record), row) for row, record in enumerate(self._rows) if id(record) in wanted)
+            self.changePersistentIndexList(persistent, [self.index(rows[id(record)], column)
+                                                        for record, column in persistent_records])
+        self.layoutChanged.emit()
+
+
+class PathSortProxyModel(QtCore.QSortFilterProxyModel):
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        # The source model sorts on its raw values, the proxy keeps the source order.
+        self.sourceModel().sort(column, order)
+
+
+class PathTableView(QtWidgets.QTableView):
+    def __init__(self, columns, parent=None):
+        super(PathTableView, self).__init__(parent)
+        self._labels = [label for label, _key in columns]
+        self.path_index = self._labels.index("Path")
+        self._model = PathTableModel(columns, self)
+        self._proxy = PathSortProxyModel(self)
+        self._proxy.setSourceModel(self._model)
+        self.setModel(self._proxy)
+
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.setSortingEnabled(True)
+        self.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.setContextMenuPolicy(QtCore.Qt.ActionsContextMenu)
+        self.verticalHeader().hide()
+        self.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(self.fontMetrics().height() + 6)
+        self.horizontalHeader().setHighlightSections(False)
+        self.horizontalHeader().setStretchLastSection(True)
+        self.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeToContents)
+        self.horizontalHeader().setResizeContentsPrecision(0)
+        self.doubleClicked.connect(self.open_explorer)
+
+    def recordFromIndex(self, index):
+        return self._model.record(self._proxy.mapToSource(index).row())
+
+    def recordFromPath(self, path):
+        return self._model.recordFromPath(path)
+
+    def records(self):
+        return self._model.records()
+
+    def selectedRecords(self):
+        return [self.recordFromIndex(index) for index in self.selectionModel().selectedRows()]
+
+    def count(self):
+        return self._model.rowCount()
+
+    def clear(self):
+        self._model.clear()
+
+    def open_explorer(self, index=None):
+        if isinstance(index, QtCore.QModelIndex) and index.isValid():
+            records = [self.recordFromIndex(index)]
+        else:
+            records = self.selectedRecords()
+        for record in records:
+            s_path = os.path.abspath(record["path"])
+            subprocess.Popen('explorer {0}'.format(s_path))
+
+
+class GetDeleteThread(QtCore.QThread):
+    def __init__(self, executor=None, progress=None, parent=None):
+        super(GetDeleteThread, self).__init__(parent)
+        self._executor = executor or ScanExecutor.instance()
+        self._progress = progress if progress is not None else ProgressTable()
+        self._index = SizeIndex.instance()
+        self._scanner = ShardScanner.instance() if SCAN_MODE == "process" else None
+        self._cancel = CancelToken()
+        self._paths = []
+
+    def start(self, paths):
+        self._paths = paths
+        super(GetDeleteThread, self).start()
+
+    def cancel(self):
+        self._cancel.cancel()
+
+    def run(self):
+        for path, result in scan_items(self._paths, self._index, self._executor, self._size_found, self._cancel,
+                                       self._scanner):
+            self._progress.update(path, size=float(result.size), files=result.files, final=True)
+
+    def _size_found(self, path, size):
+        self._progress.update(path, size=float(size))
+
+
+class PlanThread(QtCore.QThread):
+    planReady = QtCore.Signal(list)
+
+    def __init__(self, parent=None):
+        super(PlanThread, self).__init__(parent)
+        self._paths = []
+        self._cancel = CancelToken()
+
+    def start(self, paths):
+        self._paths = paths
+        super(PlanThread, self).start()
+
+    def cancel(self):
+        self._cancel.cancel()
+
+    def run(self):
+        plans = plan_items([str(path) for path in self._paths], cancel=self._cancel)
+        if plans is not None:
+            self.planReady.emit(plans)
+
+
+class DeleteThread(QtCore.QThread):
+    itemDeleted = QtCore.Signal(str)
+    deleteOperationFinished = QtCore.Signal()
+
+    def __init__(self, progress=None, parent=None):
+        super(DeleteThread, self).__init__(parent)
+        self._plans = []
+        self._checkpoints = []
+        self._progress = progress if progress is not None else ProgressTable()
+        self._index = SizeIndex.instance()
+        self._engine = PurgeEngine(journal=PurgeJournal.instance() if JOURNAL_ENABLED else None)
+        self._cancel = CancelToken()
+
+    def start(self, plans):
+        # A checkpoint is kept while the plans run, so closing the tool or a crash can be resumed from.
+        self._plans = plans
+        checkpoint = PurgeCheckpoint()
+        checkpoint.begin([plan.path for plan in plans], any(plan.remove_root for plan in plans))
+        self._checkpoints = [checkpoint]
+        super(DeleteThread, self).start()
+
+    def resume(self, checkpoints):
+        # Walks what is left of interrupted purges, skipping the sub directories they had finished.
+        self._plans = []
+        self._checkpoints = checkpoints
+        super(DeleteThread, self).start()
+
+    def cancel(self):
+        self._cancel.cancel()
+
+    def run(self):
+        if self._plans:
+            purged = execute_plans(self._plans, self._engine, self._index, progress=self._batch_done,
+                                   cancel=self._cancel, checkpoint=self._checkpoints[0])
+            for path, _batch in purged:
+                self.itemDeleted.emit(path)
+        else:
+            for checkpoint in self._checkpoints:
+                purged = purge_items(checkpoint.resume(), self._engine, self._index, progress=self._batch_done,
+                                     cancel=self._cancel, remove_root=checkpoint.remove_root, checkpoint=checkpoint)
+                for path, _batch in purged:
+                    self.itemDeleted.emit(path)
+        for checkpoint in self._checkpoints:
+            checkpoint.close()
+        self.deleteOperationFinished.emit()
+
+    def _batch_done(self, batch):
+        self._progress.update("purge", path=batch.path, rate=batch.rate, errors=batch.total_errors)
+        self._progress.increment("purge", "files", batch.files)
+
+
+class TrashThread(QtCore.QThread):
+    # Moves each item to its volume's trash, one rename per item however big it is.
+    itemDeleted = QtCore.Signal(str)
+    deleteOperationFinished = QtCore.Signal()
+
+    def __init__(self, parent=None):
+        super(TrashThread, self).__init__(parent)
+        self._records = []
+        self._trash = TrashCan.instance()
+        self._index = SizeIndex.instance()
+        self.failed = []
+
+    def start(self, records):
+        # records are (path, size, files) of the items to move.
+        self._records = records
+        super(TrashThread, self).start()
+
+    def cancel(self):
+        pass
+
+    def run(self):
+        for path, size, files in self._records:
+            try:
+                self._trash.move(path, size, files)
+            except OSError as err:
+                logging.error(err)
+                self.failed.append((path, err))
+                continue
+            self._index.forget(path)
+            self.itemDeleted.emit(path)
+        self.deleteOperationFinished.emit()
+
+
+class QDeleteWidget(PathTableView):
+    listSizeChanged = QtCore.Signal(float)
+    releaseDelete = QtCore.Signal(int, bool)
+    fileDeleted = QtCore.Signal(str)
+    itemCountUpdated = QtCore.Signal(int)
+    deleteRateUpdated = QtCore.Signal(float, int)
+    itemDeleted = QtCore.Signal()
+    deleteOperationFinished = QtCore.Signal(list)
+    trashOperationFinished = QtCore.Signal(list, list)
+    deleteListItemRemoved = QtCore.Signal(list)
+
+    def __init__(self, parent=None):
+        super(QDeleteWidget, self).__init__([("Name", "name"), ("Size", "size"), ("Path", "path"),
+                                             ("File Count", "files"), ("Last Modified", "mtime")], parent)
+        self.setAcceptDrops(True)
+        self.setDragDropMode(QtWidgets.QAbstractItemView.DropOnly)
+
+        self.addMenuActions()
+        self._threads = []
+        self._fileCount = int()
+        self._planned = {}
+        self._listed_sizes = {}
+        self._removedItems = []
+        self._use_trash = TRASH_DELETE
+        self._executor = ScanExecutor.instance()
+        self._scan_progress = ProgressTable()
+        self._purge_progress = ProgressTable()
+        self._progress_timer = QtCore.QTimer(self)
+        self._progress_timer.setInterval(PROGRESS_INTERVAL_MS)
+        self._progress_timer.timeout.connect(self._flush_progress)
+        self._progress_timer.start()
+        self.verticalScrollBar().valueChanged.connect(self._prioritize_visible)
+        self.selectionModel().selectionChanged.connect(self._prioritize_visible)
+
+    def dragEnterEvent(self, event):
+        if isinstance(event.source(), PathTableView) and event.source() is not self:
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+
+    def dragMoveEvent(self, event):
+        self.dragEnterEvent(event)
+
+    def dropEvent(self, event):
+        widget = event.source()
+        records = widget.selectedRecords()
+
+        self.fetchMore(records)
+        for record in records:
+            widget.remove(record)
+        event.acceptProposedAction()
+
+    def addMenuActions(self):
+        open_path = QtWidgets.QAction(self)
+        open_path.setText("Open in explorer")
+        open_path.triggered.connect(self.open_explorer)
+
+        remove_path = QtWidgets.QAction(self)
+        remove_path.setText("Remove from List")
+        remove_path.triggered.connect(self.remove_item)
+
+        self.addAction(remove_path)
+        self.addAction(open_path)
+
+    def remove_item(self, record=None):
+        records = [record] if isinstance(record, PathRecord) else self.selectedRecords()
+        paths = [record["path"] for record in records]
+        for path in paths:
+            self.listSizeChanged.emit(-self._listed_sizes.pop(path, int()))
+        self._model.removePaths(paths)
+
+    def _add(self, content, size, path, count, last_modified):
+        self._model.addRecords([{"name": content, "size": size, "path": path, "files": count,
+                                 "mtime": last_modified, "enabled": False, "ready": False}])
+
+    @_metrics.timed(GUI_SLOT_SECONDS, slot="_status_changed")
+    def _status_changed(self, path, status, num):
+        if not self._model.updatePath(path, ready=status, enabled=status, files=num):
+            logging.info("Could not update status: %s", path)
+            return
+        self.releaseDelete.emit(num, status)
+
+    @_metrics.timed(GUI_SLOT_SECONDS, slot="_size_changed")
+    def _size_changed(self, path, size, update=False):
+        if not self._model.updatePath(path, size=size):
+            logging.info("Could not update size: %s", path)
+            return
+        if not update:
+            # A row sized again only moves the list total by the difference.
+            listed_size = convert_size(size)[1]
+            self.listSizeChanged.emit(listed_size - self._listed_sizes.get(path, int()))
+            self._listed_sizes[path] = listed_size
+
+    @_metrics.timed(GUI_SLOT_SECONDS, slot="_flush_progress")
+    def _flush_progress(self):
+        sizes = self._scan_progress.take()
+        if sizes:
+            for path, values in sizes.items():
+                final = values.get("final", False)
+                if "size" in values:
+                    self._size_changed(path, values["size"], not final)
+                if final:
+                    self._status_changed(path, True, values["files"])
+            self._model.resort()
+
+        purge = self._purge_progress.take().get("purge")
+        if purge:
+            self.fileDeleted.emit(purge["path"])
+            self.deleteRateUpdated.emit(purge["rate"], purge["errors"])
+            self.itemCountUpdated.emit(purge.get("files", int()))
+
+    def _prioritize_visible(self, *args):
+        rect = self.viewport().rect()
+        paths = [record["path"] for record in self.selectedRecords()]
+        first = self.rowAt(rect.top())
+        last = self.rowAt(rect.bottom())
+        if first >= 0:
+            for row in range(first, (last if last >= 0 else self.count() - 1) + 1):
+                paths.append(self.recordFromIndex(self._proxy.index(row, 0))["path"])
+        self._executor.prioritize(paths)
+
+    def fetchMore(self, records):
+        # Rows are added before sizing starts so progress flushes always find them.
+        for record in records:
+            self._add(record["name"], None, record["path"], int(), record.get("mtime", float()))
+        self._scan([record["path"] for record in records])
+
+    def _scan(self, paths):
+        thread = GetDeleteThread(executor=self._executor, progress=self._scan_progress)
+        self._track(thread)
+
+        thread.start(paths)
+
+    def watchedPaths(self):
+        # Rows being purged change all the time, they are left to the purge.
+        return [record["path"] for record in self.records() if record["path"] not in self._planned]
+
+    def applyChanges(self, events):
+        # Rows whose own entries were added or removed are sized again, the size index only lists the
+        # folders that moved. Only the row folders themselves are watched, changes deeper down show up
+        # after a reload. Rows still being sized pick the change up as they go.
+        changed = []
+        removed = []
+        for event in events:
+            record = self.recordFromPath(event.path)
+            if record is None or event.path in self._planned:
+                continue
+            if event.kind == "deleted":
+                removed.append(event.path)
+                self.listSizeChanged.emit(-self._listed_sizes.pop(event.path, int()))
+            elif record["ready"]:
+                self._model.updatePath(event.path, ready=False, enabled=False, mtime=event.mtime)
+                changed.append(event.path)
+        self._model.removePaths(removed)
+        if changed:
+            self._scan(changed)
+
+    def doDelete(self, selected=False):
+        del self._removedItems[:]
+        records = self.records()
+        if selected:
+            records = self.selectedRecords()
+            if not records:
+                QtWidgets.QMessageBox.warning(self, "Warning", "There is no item selected for deletion.")
+                return
+
+        records = [record for record in records if record["ready"]]
+        if not records:
+            # Nothing sized yet, there is no plan to confirm.
+            return
+        if self._use_trash:
+            self._confirmTrash(records)
+            return
+        # The selection is walked once up front, the confirmation shows the plan and the purge reuses it.
+        thread = PlanThread()
+        dialog = QtWidgets.QProgressDialog("Planning the deletion...", "Cancel", 0, 0, self)
+        dialog.setWindowModality(QtCore.Qt.WindowModal)
+        dialog.setMinimumDuration(500)
+        dialog.canceled.connect(thread.cancel)
+        thread.planReady.connect(lambda plans: dialog.reset())
+        thread.planReady.connect(self._confirmPlan)
+        thread.finished.connect(dialog.deleteLater)
+        self._track(thread)
+        thread.start([record["path"] for record in records])
+
+    def _confirmPlan(self, plans):
+        summary = summarize_plans(plans)
+        text = ("Are you sure you want to delete these files? This action CANNOT be undone.\n\n"
+                "{0} files in {1} folders, {2}.\n"
+                "Reclaimable: {3}, hard links kept elsewhere and open files free nothing.\n"
+                "Estimated time: {4}.".format(summary.files, summary.dirs, _format_size(summary.size),
+                                              _format_size(summary.reclaimable), _format_duration(summary.eta)))
+        if summary.busy:
+            text += "\n{0} files are open in other programs.".format(summary.busy)
+        if summary.unremovable:
+            text += "\n{0} entries cannot be removed and will be left behind.".format(summary.unremovable)
+        details = [plan.root for plan in plans]
+        details += ["{0}: {1}".format(path, reason) for path, reason in summary.problems]
+        message = QtWidgets.QMessageBox(QtWidgets.QMessageBox.Warning, "Warning", text,
+                                        QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No, self)
+        message.setDetailedText("\n".join(details))
+        if not message.exec_() == QtWidgets.QMessageBox.Yes:
+            return
+
+        for plan in plans:
+            self._planned[plan.path] = plan.files
+        self._fileCount += summary.files
+        thread = DeleteThread(progress=self._purge_progress)
+        thread.itemDeleted.connect(self._callback)
+        thread.deleteOperationFinished.connect(self._deleteDone)
+
+        self._track(thread)
+        thread.start(plans)
+
+    def useTrash(self):
+        return self._use_trash
+
+    def setUseTrash(self, use_trash):
+        self._use_trash = bool(use_trash)
+
+    def _confirmTrash(self, records):
+        # Nothing is walked, the sizes the rows already have are what the trash reports as pending.
+        if not records:
+            return
+        size = sum(record["size"] or int() for record in records)
+        files = sum(record["files"] for record in records)
+        text = ("Move {0} item/s, {1} in {2} files, to the trash?\n\n"
+                "They can be restored from the Trash tab for {3}, after that they are deleted for good."
+                "".format(len(records), _format_size(size), files, _format_duration(TRASH_GRACE_PERIOD)))
+        message = QtWidgets.QMessageBox(QtWidgets.QMessageBox.Question, "Move to Trash", text,
+                                        QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No, self)
+        message.setDetailedText("\n".join(record["path"] for record in records))
+        if not message.exec_() == QtWidgets.QMessageBox.Yes:
+            return
+
+        for record in records:
+            self._planned[record["path"]] = record["files"]
+        self._fileCount += files
+        thread = TrashThread()
+        thread.itemDeleted.connect(self._callback)
+        thread.deleteOperationFinished.connect(self._trashDone)
+
+        self._track(thread)
+        thread.start([(record["path"], record["size"], record["files"]) for record in records])
+
+    def _trashDone(self):
+        # Items that could not be moved stay in the list.
+        failed = self.sender().failed
+        for path, _err in failed:
+            self._fileCount -= self._planned.pop(path, int())
+        self.trashOperationFinished.emit(self._removedItems, ["{0}: {1}".format(path, err) for path, err in failed])
+
+    def resume(self, checkpoints):
+        # The interrupted folders are listed as they are, sizing them would walk them all again.
+        paths = [path for checkpoint in checkpoints for path in checkpoint.remaining()]
+        self._model.addRecords([{"name": os.path.basename(path), "size": None, "path": path, "files": int(),
+                                 "mtime": float(), "enabled": True, "ready": True} for path in paths])
+        self.releaseDelete.emit(0, True)
+        thread = DeleteThread(progress=self._purge_progress)
+        thread.itemDeleted.connect(self._callback)
+        thread.deleteOperationFinished.connect(self._deleteDone)
+
+        self._track(thread)
+        thread.resume(checkpoints)
+
+    def _deleteDone(self):
+        self.deleteOperationFinished.emit(self._removedItems)
+
+    def _callback(self, path):
+        record = self.recordFromPath(path)
+        if record is None:
+            logging.info("Could not delete path: %s", path)
+            return
+
+        self._model.removePaths([path])
+        self._listed_sizes.pop(path, None)
+        self._removedItems.append(path)
+
+        if not self.count():
+            self.releaseDelete.emit(0, False)
+        self.itemDeleted.emit()
+        self.releaseDelete.emit(0, True)
+        self._fileCount -= self._planned.pop(path, record["files"])
+
+    def _track(self, thread):
+        # The widget owns the thread until it finishes, deleteLater only runs after the signals the thread
+        # queued before finishing.
+        thread.setParent(self)
+        thread.finished.connect(self._threadFinished)
+        self._threads.append(thread)
+
+    def _threadFinished(self):
+        thread = self.sender()
+        if thread in self._threads:
+            self._threads.remove(thread)
+        thread.deleteLater()
+
+    def cancel(self, wait=False):
+        for thread in self._threads:
+            thread.cancel()
+        if wait:
+            for thread in self._threads:
+                thread.wait()
+        self._threads = [thread for thread in self._threads if thread.isRunning()]
+
+    def getFileCount(self):
+        return self._fileCount
+
+    def getRemovedItems(self):
+        return self._removedItems
+
+
+class QTrashWidget(PathTableView):
+    # The items in the volumes' trash folders, restorable until their grace period is over.
+    itemsRestored = QtCore.Signal(list)
+    collectRequested = QtCore.Signal()
+
+    def __init__(self, trash=None, parent=None):
+        super(QTrashWidget, self).__init__([("Name", "name"), ("Size", "size"), ("Original Path", "original"),
+                                            ("Deleted", "trashed"), ("Restorable Until", "expires"),
+                                            ("Path", "path")], parent)
+        self.addMenuActions()
+        self.sortByColumn(3, QtCore.Qt.DescendingOrder)
+
+        self._trash = trash or TrashCan.instance()
+        self._entries = {}
+
+    def addMenuActions(self):
+        restore = QtWidgets.QAction(self)
+        restore.setText("Restore")
+        restore.triggered.connect(self.restore)
+
+        delete_now = QtWidgets.QAction(self)
+        delete_now.setText("Delete Now")
+        delete_now.triggered.connect(self.delete_now)
+
+        open_path = QtWidgets.QAction(self)
+        open_path.setText("Open in explorer")
+        open_path.triggered.connect(self.open_explorer)
+
+        self.addAction(restore)
+        self.addAction(delete_now)
+        self.addAction(open_path)
+
+    def setEntries(self, entries):
+        self._entries = dict((stored_path(entry), entry) for entry in entries)
+        self.clear()
+        self._model.addRecords([{"name": posixpath.basename(entry.path), "size": entry.size, "original": entry.path,
+                                 "trashed": entry.trashed, "expires": entry.expires, "path": stored_path(entry),
+                                 "files": entry.files or int()} for entry in entries])
+
+    def _selectedEntries(self):
+        return [self._entries[record["path"]] for record in self.selectedRecords() if record["path"] in self._entries]
+
+    def restore(self):
+        restored = []
+        errors = []
+        for entry in self._selectedEntries():
+            try:
+                self._trash.restore(entry)
+            except OSError as err:
+                logging.error(err)
+                errors.append("{0}: {1}".format(entry.path, err))
+                continue
+            restored.append(entry.path)
+            self._model.removePaths([stored_path(entry)])
+        if errors:
+            message = QtWidgets.QMessageBox(QtWidgets.QMessageBox.Warning, "Restore",
+                                            "{0} item/s could not be restored.".format(len(errors)),
+                                            QtWidgets.QMessageBox.Ok, self)
+            message.setDetailedText("\n".join(errors))
+            message.exec_()
+        if restored:
+            self.itemsRestored.emit(restored)
+
+    def delete_now(self):
+        entries = self._selectedEntries()
+        if not entries:
+            return
+        answer = QtWidgets.QMessageBox.warning(
+            self, "Delete Now", "Delete {0} item/s for good now? This action CANNOT be undone.".format(len(entries)),
+            QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No)
+        if answer != QtWidgets.QMessageBox.Yes:
+            return
+        self._trash.expire(entries)
+        self.collectRequested.emit()
+
+
+class GetShowsThread(QtCore.QThread):
+    showFound = QtCore.Signal(str, str, float, str)
+
+    def __init__(self, provider=None, parent=None):
+        super(GetShowsThread, self).__init__(parent)
+        self._provider = provider
+        self._cancel = CancelToken()
+
+    def start(self):
+        super(GetShowsThread, self).start()
+
+    def cancel(self):
+        self._cancel.cancel()
+
+    def run(self):
+        for show in discover_shows(self._provider, cancel=self._cancel):
+            self.showFound.emit(show.name, show.status, show.mtime, show.path)
+
+
+class QShowWidget(PathTableView):
+    showPathRole = QtCore.Qt.UserRole + 21
+    showPathChanged = QtCore.Signal(str)
+
+    def __init__(self, provider=None, parent=None):
+        super(QShowWidget, self).__init__([("Show", "name"), ("Last Modified", "mtime"), ("Path", "path"),
+                                           ("Status", "status")], parent)
+        self.setDragEnabled(True)
+        self.addMenuActions()
+        self.clicked.connect(self._showClicked)
+
+        self._removed_paths = []
+        self._provider = provider
+        self._thread = None
+        self._threads = []
+
+    def addMenuActions(self):
+        open_path = QtWidgets.QAction(self)
+        open_path.setText("Open in explorer")
+        open_path.triggered.connect(self.open_explorer)
+        self.addAction(open_path)
+
+    def _add(self, name, status, last_modified, path):
+        # Rows from a superseded listing may still be queued.
+        if self.sender() is not self._thread or path in self._removed_paths:
+            return
+        self._model.addRecords([{"name": name, "mtime": last_modified, "path": path, "status": status}])
+
+    def _showClicked(self, index):
+        show_path = self.recordFromIndex(index)["path"]
+        self.showPathChanged.emit(show_path)
+
+    def fetchMore(self):
+        self.cancel()
+        self.clear()
+        self._thread = GetShowsThread(self._provider)
+        self._thread.showFound.connect(self._add)
+        self._thread.finished.connect(self._thread_finished)
+        self._threads.append(self._thread)
+        self._thread.start()
+
+    def cancel(self, wait=False):
+        # Cancelled threads finish their current directory in the background, nothing waits on them.
+        for thread in self._threads:
+            thread.cancel()
+        if wait:
+            for thread in self._threads:
+                thread.wait()
+
+    def _thread_finished(self):
+        self._threads = [thread for thread in self._threads if thread.isRunning()]
+
+    def remove(self, record):
+        self._removed_paths.append(record["path"])
+        self._model.removePaths([record["path"]])
+
+    def watchedPaths(self):
+        return [record["path"] for record in self.records()]
+
+    def applyChanges(self, events):
+        # Show folders that went away are dropped, the rest pick up their new mtime. New shows come from
+        # the show provider, they are only picked up by a reload.
+        removed = []
+        for event in events:
+            if self.recordFromPath(event.path) is None:
+                continue
+            if event.kind == "deleted":
+                removed.append(event.path)
+            else:
+                self._model.updatePath(event.path, mtime=event.mtime)
+        self._model.removePaths(removed)
+        self._model.resort()
+
+    def reset_data(self):
+        self._removed_paths = []
+        self.fetchMore()
+
+
+class GetShotsThread(QtCore.QThread):
+    shotsFound = QtCore.Signal(str, list)
+
+    def __init__(self, parent=None):
+        super(GetShotsThread, self).__init__(parent)
+        self._path = str()
+        self._cancel = CancelToken()
+
+    def start(self, path):
+        self._path = path
+        super(GetShotsThread, self).start()
+
+    def cancel(self):
+        self._cancel.cancel()
+
+    def run(self):
+        root = self._path
+        path = str(root).replace("\\", "/")
+        if not os.path.isdir(path):
+            return
+
+        batch = []
+        last_emit = time.time()
+        try:
+            entries = _scandir(path)
+        except OSError as err:
+            logging.error(err)
+            return
+        for entry in entries:
+            if self._cancel.cancelled():
+                return
+            if entry.name == TRASH_DIR_NAME:
+                continue
+            try:
+                if not entry.is_dir() or is_empty_dir(entry.path):
+                    continue
+                mtime = entry.stat().st_mtime
+            except OSError as err:
+                logging.error(err)
+                continue
+            batch.append({"name": entry.name, "mtime": mtime, "path": entry.path.replace("\\", "/")})
+            # Flush on size or time so slow shares still stream rows in.
+            if len(batch) >= SHOT_BATCH_SIZE or time.time() - last_emit >= PROGRESS_INTERVAL_MS / 1000.0:
+                self.shotsFound.emit(root, batch)
+                batch = []
+                last_emit = time.time()
+        if batch:
+            self.shotsFound.emit(root, batch)
+
+
+class QShotWidget(PathTableView):
+    def __init__(self, parent=None):
+        super(QShotWidget, self).__init__([("Content", "name"), ("Last Modified", "mtime"), ("Path", "path")], parent)
+        self.setColumnWidth(0, 250)
+        self.setDragEnabled(True)
+
+        self.addMenuActions()
+
+        self._removed_paths = []
+        self._empty_paths = set()
+        self._current_path = None
+        self._thread = None
+        self._threads = []
+
+    def addMenuActions(self):
+        open_path = QtWidgets.QAction(self)
+        open_path.setText("Open in explorer")
+        open_path.triggered.connect(self.open_explorer)
+        self.addAction(open_path)
+
+    def _add(self, root, records):
+        # Batches from a superseded listing may still be queued.
+        if self.sender() is not self._thread:
+            return
+        removed = set(self._removed_paths)
+        self._model.queueRecords([record for record in records if record["path"] not in removed])
+        # The view only asks for more rows when it scrolls, top up a list that is already at its end.
+        last = self.rowAt(self.viewport().rect().bottom())
+        if last < 0 or last >= self.count() - 1:
+            self._model.fetchMore()
+
+    def fetchMore(self, path):
+        self._current_path = path
+        self._empty_paths = set()
+        self.cancel()
+        self.clear()
+        self._thread = GetShotsThread()
+        self._thread.shotsFound.connect(self._add)
+        self._thread.finished.connect(self._thread_finished)
+        self._threads.append(self._thread)
+        self._thread.start(path)
+
+    def cancel(self, wait=False):
+        for thread in self._threads:
+            thread.cancel()
+        if wait:
+            for thread in self._threads:
+                thread.wait()
+
+    def _thread_finished(self):
+        self._threads = [thread for thread in self._threads if thread.isRunning()]
+
+    def remove(self, record):
+        self._removed_paths.append(record["path"])
+        self._model.removePaths([record["path"]])
+
+    def watchedPaths(self):
+        if not self._current_path:
+            return []
+        return [self._current_path] + [record["path"] for record in self.records()] + list(self._empty_paths)
+
+    def applyChanges(self, events):
+        # Shot folders of the current show are added, dropped or pick up their new mtime as they change
+        # on disk. Empty folders are not listed, they are watched until they get content.
+        if not self._current_path:
+            return
+        current = str(self._current_path).replace("\\", "/").rstrip("/")
+        added = []
+        removed = []
+        for event in events:
+            if event.path == current:
+                if event.kind == "deleted":
+                    self.clear()
+                    return
+                if event.kind == "rescan":
+                    self.fetchMore(self._current_path)
+                    return
+                continue
+            if posixpath.dirname(event.path) != current or event.path in self._removed_paths:
+                continue
+            # The trash is never a shot, whichever event brings it up.
+            if posixpath.basename(event.path) == TRASH_DIR_NAME:
+                continue
+            self._empty_paths.discard(event.path)
+            try:
+                listed = event.kind != "deleted" and os.path.isdir(event.path) and not is_empty_dir(event.path)
+            except OSError as err:
+                logging.error(err)
+                listed = False
+            if not listed:
+                removed.append(event.path)
+                if event.kind != "deleted" and os.path.isdir(event.path):
+                    self._empty_paths.add(event.path)
+            elif self.recordFromPath(event.path) is not None:
+                self._model.updatePath(event.path, mtime=event.mtime)
+            else:
+                added.append({"name": posixpath.basename(event.path), "mtime": event.mtime, "path": event.path})
+        self._model.removePaths(removed)
+        self._model.addRecords(added)
+        self._model.resort()
+
+    def reset_data(self):
+        self._removed_paths = []
+        if self._current_path:
+            self.fetchMore(self._current_path)
+
+
+class FindReclaimableThread(QtCore.QThread):
+    candidatesFound = QtCore.Signal(list)
+
+    def __init__(self, provider=None, executor=None, parent=None):
+        super(FindReclaimableThread, self).__init__(parent)
+        self._provider = provider
+        self._executor = executor or ScanExecutor.instance()
+        self._index = SizeIndex.instance()
+        self._cancel = CancelToken()
+        self._min_size = STALE_MIN_SIZE
+        self._min_age = STALE_MIN_AGE
+
+    def start(self, min_size=STALE_MIN_SIZE, min_age=STALE_MIN_AGE):
+        self._min_size = min_size
+        self._min_age = min_age
+        super(FindReclaimableThread, self).start()
+
+    def cancel(self):
+        self._cancel.cancel()
+
+    def run(self):
+        shows = discover_shows(self._provider, cancel=self._cancel)
+        batch = []
+        last_emit = time.time()
+        for candidate in find_reclaimable(shows, self._min_size, self._min_age, self._index, self._executor,
+                                          self._cancel):
+            batch.append({"name": os.path.basename(candidate.path), "show": candidate.show, "size": candidate.size,
+                          "files": candidate.files, "mtime": candidate.newest, "path": candidate.path,
+                          "score": candidate.score})
+            if time.time() - last_emit >= PROGRESS_INTERVAL_MS / 1000.0:
+                self.candidatesFound.emit(batch)
+                batch = []
+                last_emit = time.time()
+        if batch:
+            self.candidatesFound.emit(batch)
+
+
+class QReclaimWidget(PathTableView):
+    # Shots across all shows ranked by size times days since their newest file, as the scans finish.
+    searchFinished = QtCore.Signal()
+
+    def __init__(self, provider=None, parent=None):
+        super(QReclaimWidget, self).__init__([("Shot", "name"), ("Show", "show"), ("Size", "size"),
+                                              ("Newest File", "mtime"), ("Score", "score"), ("Path", "path")], parent)
+        self.setDragEnabled(True)
+        self.addMenuActions()
+        self.sortByColumn(4, QtCore.Qt.DescendingOrder)
+
+        self._removed_paths = []
+        self._provider = provider
+        self._thread = None
+        self._threads = []
+
+    def addMenuActions(self):
+        open_path = QtWidgets.QAction(self)
+        open_path.setText("Open in explorer")
+        open_path.triggered.connect(self.open_explorer)
+        self.addAction(open_path)
+
+    def _add(self, records):
+        if self.sender() is not self._thread:
+            return
+        removed = set(self._removed_paths)
+        self._model.addRecords([record for record in records if record["path"] not in removed])
+
+    def fetchMore(self, min_size=STALE_MIN_SIZE, min_age=STALE_MIN_AGE):
+        self.cancel()
+        self.clear()
+        self._thread = FindReclaimableThread(self._provider)
+        self._thread.candidatesFound.connect(self._add)
+        self._thread.finished.connect(self._thread_finished)
+        self._threads.append(self._thread)
+        self._thread.start(min_size, min_age)
+
+    def cancel(self, wait=False):
+        for thread in self._threads:
+            thread.cancel()
+        if wait:
+            for thread in self._threads:
+                thread.wait()
+
+    def _thread_finished(self):
+        if self.sender() is self._thread:
+            self.searchFinished.emit()
+        self._threads = [thread for thread in self._threads if thread.isRunning()]
+
+    def remove(self, record):
+        self._removed_paths.append(record["path"])
+        self._model.removePaths([record["path"]])
+
+
+class FindDuplicatesThread(QtCore.QThread):
+    groupsFound = QtCore.Signal(list)
+
+    def __init__(self, provider=None, parent=None):
+        super(FindDuplicatesThread, self).__init__(parent)
+        self._provider = provider
+        self._cancel = CancelToken()
+        self._min_size = DUPLICATE_MIN_SIZE
+
+    def start(self, min_size=DUPLICATE_MIN_SIZE):
+        self._min_size = min_size
+        super(FindDuplicatesThread, self).start()
+
+    def cancel(self):
+        self._cancel.cancel()
+
+    def run(self):
+        # The shows' scenes folders and their local storage copies, as the shows list finds them.
+        paths = [show.path for show in discover_shows(self._provider, cancel=self._cancel)]
+        finder = DuplicateFinder(min_size=self._min_size, cache=HashCache.instance())
+        groups = [{"name": os.path.basename(group.paths[0]), "files": len(group.paths), "size": group.reclaimable,
+                   "path": group.paths[0], "status": "; ".join(group.paths[1:])}
+                  for group in finder.find(paths, self._cancel)]
+        if groups and not self._cancel.cancelled():
+            self.groupsFound.emit(groups)
+
+
+class QDuplicateWidget(PathTableView):
+    # One row per set of identical files, the first copy's path and the bytes removing the others would free.
+    searchFinished = QtCore.Signal(int)
+
+    def __init__(self, provider=None, parent=None):
+        super(QDuplicateWidget, self).__init__([("File", "name"), ("Copies", "files"), ("Reclaimable", "size"),
+                                                ("Path", "path"), ("Other Copies", "status")], parent)
+        self.addMenuActions()
+        self.sortByColumn(2, QtCore.Qt.DescendingOrder)
+
+        self._provider = provider
+        self._thread = None
+        self._threads = []
+
+    def addMenuActions(self):
+        open_path = QtWidgets.QAction(self)
+        open_path.setText("Open in explorer")
+        open_path.triggered.connect(self.open_explorer)
+        self.addAction(open_path)
+
+    def _add(self, records):
+        if self.sender() is not self._thread:
+            return
+        self._model.addRecords(records)
+
+    def fetchMore(self, min_size=DUPLICATE_MIN_SIZE):
+        self.cancel()
+        self.clear()
+        self._thread = FindDuplicatesThread(self._provider)
+        self._thread.groupsFound.connect(self._add)
+        self._thread.finished.connect(self._thread_finished)
+        self._threads.append(self._thread)
+        self._thread.start(min_size)
+
+    def cancel(self, wait=False):
+        for thread in self._threads:
+            thread.cancel()
+        if wait:
+            for thread in self._threads:
+                thread.wait()
+
+    def _thread_finished(self):
+        if self.sender() is self._thread:
+            self.searchFinished.emit(sum(record["size"] for record in self.records()))
+        self._threads = [thread for thread in self._threads if thread.isRunning()]
+
+    def open_explorer(self, index=None):
+        # Opens the folder holding the first copy, the rows are files.
+        records = [self.recordFromIndex(index)] if isinstance(index, QtCore.QModelIndex) else self.selectedRecords()
+        for record in records:
+            subprocess.Popen('explorer {0}'.format(os.path.abspath(os.path.dirname(record["path"]))))
+
+
+class QDiagnosticsDialog(QtWidgets.QDialog):
+    # The operation metrics while they are collected: walker rates, filesystem call latencies per volume,
+    # queue depths and the time the GUI thread spends in the list slots.
+    def __init__(self, parent=None):
+        super(QDiagnosticsDialog, self).__init__(parent)
+        self.setWindowTitle("Diagnostics")
+        self.setMinimumWidth(800)
+        self.setMinimumHeight(400)
+
+        self.enabled_box = QtWidgets.QCheckBox("Collect metrics")
+        self.enabled_box.setChecked(_metrics.enabled)
+        self.enabled_box.toggled.connect(_metrics.enable)
+        self.reset_btn = QtWidgets.QPushButton("Reset")
+        self.reset_btn.clicked.connect(self.reset)
+        self.export_btn = QtWidgets.QPushButton("Export...")
+        self.export_btn.clicked.connect(self.export)
+
+        self.table = QtWidgets.QTableWidget(0, 6)
+        self.table.setHorizontalHeaderLabels(["Metric", "Labels", "Count", "Value", "p50", "p99"])
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setStretchLastSection(True)
+
+        controls = QtWidgets.QHBoxLayout()
+        controls.addWidget(self.enabled_box)
+        controls.addStretch()
+        controls.addWidget(self.reset_btn)
+        controls.addWidget(self.export_btn)
+        layout = QtWidgets.QVBoxLayout()
+        layout.addLayout(controls)
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(DIAGNOSTICS_REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+        self.refresh()
+
+    @staticmethod
+    def _seconds(value):
+        return "" if value is None else "{0:.2f} ms".format(value * 1000)
+
+    def refresh(self):
+        snapshot = _metrics.snapshot()
+        rows = []
+        for rate in snapshot["rates"]:
+            value = "{0:.0f} entries/s".format(rate["entries_per_second"] or 0)
+            if rate["bytes_per_second"] is not None:
+                value += ", {0}/s".format(convert_size(int(rate["bytes_per_second"]))[0])
+            rows.append(("walker_rate", "walker={0}".format(rate["walker"]), "", value, "", ""))
+        for kind in ("counters", "gauges"):
+            for entry in snapshot[kind]:
+                labels = ", ".join("{0}={1}".format(*item) for item in sorted(entry["labels"].items()))
+                rows.append((entry["name"], labels, "", "{0:g}".format(entry["value"]), "", ""))
+        for entry in snapshot["histograms"]:
+            labels = ", ".join("{0}={1}".format(*item) for item in sorted(entry["labels"].items()))
+            rows.append((entry["name"], labels, str(entry["count"]), self._seconds(entry["sum"] / entry["count"]),
+                         self._seconds(entry["p50"]), self._seconds(entry["p99"])))
+        self.table.setRowCount(len(rows))
+        for i_row, row in enumerate(rows):
+            for i_column, text in enumerate(row):
+                self.table.setItem(i_row, i_column, QtWidgets.QTableWidgetItem(text))
+
+    def reset(self):
+        _metrics.reset()
+        self.refresh()
+
+    def export(self):
+        path, _filter = QtWidgets.QFileDialog.getSaveFileName(self, "Export Metrics", "drive_cleanup.prom",
+                                                              "Prometheus text (*.prom);;JSON (*.json)")
+        if not path:
+            return
+        try:
+            _metrics.dump(path)
+        except (IOError, OSError) as err:
+            logging.error(err)
+            QtWidgets.QMessageBox.warning(self, "Export Metrics", str(err))
+
+    def showEvent(self, event):
+        self._timer.start()
+        super(QDiagnosticsDialog, self).showEvent(event)
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super(QDiagnosticsDialog, self).hideEvent(event)
+
+
+class DriveCleanupMainWindow(QtWidgets.QDialog):
+    foldersChanged = QtCore.Signal(list)
+    trashChanged = QtCore.Signal()
+
+    def __init__(self):
+        super(DriveCleanupMainWindow, self).__init__(None)
+
+        self.setWindowTitle("{0} {1}".format(__TOOL_NAME__, __VERSION__))
+        self.settings = QtCore.QSettings('griffin_pipeline', 'drive_cleanup_tool')
+        self.setWindowFlags(QtCore.Qt.Window)
+        icon_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'resources/icon.png')
+        self.setWindowIcon(QtGui.QIcon(icon_path))
+        self.setMinimumWidth(1200)
+        self.setMinimumHeight(600)
+        self.file_count = int()
+        self.disk_usage = DiskUsageMonitor.instance()
+        self.trash = TrashCan.instance()
+        self._disk_timer = QtCore.QTimer(self)
+        self._disk_timer.setInterval(1000)
+        self._disk_timer.timeout.connect(self._disk_usage_updated)
+        self._disk_timer.start()
+        self._disk_tick = time.time()
+        self.diagnostics = None
+        win_geometry = self.settings.value('geometry', '')
+        if win_geometry:
+            try:
+                self.restoreGeometry(win_geometry.toByteArray())  # py2
+            except Exception as e:
+                logging.error(e)
+                self.restoreGeometry(bytearray(win_geometry))  #py3
+        shows_group_box = QtWidgets.QGroupBox("Shows List")
+        self.shows = QShowWidget()
+        show_layout = QtWidgets.QVBoxLayout()
+        show_layout.addWidget(self.shows)
+        shows_group_box.setLayout(show_layout)
+
+        contents_group_box = QtWidgets.QGroupBox("Contents")
+        self.contents = QShotWidget()
+
+        self.shows.showPathChanged.connect(self.contents.fetchMore)
+
+        self.reclaim = QReclaimWidget()
+        self.reclaim_size = QtWidgets.QDoubleSpinBox()
+        self.reclaim_size.setRange(0, 1024 ** 2)
+        self.reclaim_size.setSuffix(" GB")
+        self.reclaim_size.setValue(STALE_MIN_SIZE / 1024 ** 3)
+        self.reclaim_age = QtWidgets.QSpinBox()
+        self.reclaim_age.setRange(0, 36500)
+        self.reclaim_age.setSuffix(" days")
+        self.reclaim_age.setValue(STALE_MIN_AGE)
+        self.reclaim_btn = QtWidgets.QPushButton("Find Reclaimable")
+        self.reclaim_btn.clicked.connect(self.find_reclaimable)
+        self.reclaim.searchFinished.connect(lambda: self.reclaim_btn.setEnabled(True))
+        reclaim_controls = QtWidgets.QHBoxLayout()
+        reclaim_controls.addWidget(QtWidgets.QLabel("At least"))
+        reclaim_controls.addWidget(self.reclaim_size)
+        reclaim_controls.addWidget(QtWidgets.QLabel("untouched for"))
+        reclaim_controls.addWidget(self.reclaim_age)
+        reclaim_controls.addStretch()
+        reclaim_controls.addWidget(self.reclaim_btn)
+        reclaim_page = QtWidgets.QWidget()
+        reclaim_layout = QtWidgets.QVBoxLayout()
+        reclaim_layout.setContentsMargins(0, 0, 0, 0)
+        reclaim_layout.addLayout(reclaim_controls)
+        reclaim_layout.addWidget(self.reclaim)
+        reclaim_page.setLayout(reclaim_layout)
+
+        self.duplicates = QDuplicateWidget()
+        self.duplicate_size = QtWidgets.QDoubleSpinBox()
+        self.duplicate_size.setRange(0, 1024 ** 2)
+        self.duplicate_size.setSuffix(" MB")
+        self.duplicate_size.setValue(DUPLICATE_MIN_SIZE / 1024 ** 2)
+        self.duplicate_btn = QtWidgets.QPushButton("Find Duplicates")
+        self.duplicate_btn.clicked.connect(self.find_duplicates)
+        self.duplicate_total = QtWidgets.QLabel()
+        self.duplicates.searchFinished.connect(self._duplicates_found)
+        duplicate_controls = QtWidgets.QHBoxLayout()
+        duplicate_controls.addWidget(QtWidgets.QLabel("Files of at least"))
+        duplicate_controls.addWidget(self.duplicate_size)
+        duplicate_controls.addWidget(self.duplicate_total)
+        duplicate_controls.addStretch()
+        duplicate_controls.addWidget(self.duplicate_btn)
+        duplicate_page = QtWidgets.QWidget()
+        duplicate_layout = QtWidgets.QVBoxLayout()
+        duplicate_layout.setContentsMargins(0, 0, 0, 0)
+        duplicate_layout.addLayout(duplicate_controls)
+        duplicate_layout.addWidget(self.duplicates)
+        duplicate_page.setLayout(duplicate_layout)
+
+        self.contents_tabs = QtWidgets.QTabWidget()
+        self.contents_tabs.addTab(self.contents, "Shots")
+        self.contents_tabs.addTab(reclaim_page, "Reclaimable")
+        self.contents_tabs.addTab(duplicate_page, "Duplicates")
+        self.trash_list = QTrashWidget(self.trash)
+        self.contents_tabs.addTab(self.trash_list, "Trash")
+        contents_layout = QtWidgets.QVBoxLayout()
+        contents_layout.addWidget(self.contents_tabs)
+        contents_group_box.setLayout(contents_layout)
+
+        delete_group_box = QtWidgets.QGroupBox("Delete List")
+        self.delete = QDeleteWidget()
+        self.delete.listSizeChanged.connect(self.update_progress)
+        self.delete.fileDeleted.connect(self.update_message)
+        self.delete.itemCountUpdated.connect(self.updateRemovedCount)
+        self.delete.deleteRateUpdated.connect(self.update_rate)
+        self.delete.itemDeleted.connect(self.resetProgress)
+        self.delete.deleteOperationFinished.connect(self.operation_callback)
+        self.delete.deleteListItemRemoved.connect(self.updateData)
+        self.delete.trashOperationFinished.connect(self.trash_callback)
+        self.delete.setUseTrash(self.settings.value('use_trash', TRASH_DELETE) in (True, 'true'))
+
+        self.status = QtWidgets.QStatusBar(self.delete)
+        self.update_status()
+
+        self.delete_btn = QtWidgets.QPushButton("Delete Selected")
+        self.delete_all_btn = QtWidgets.QPushButton("Delete All")
+        self.trash_box = QtWidgets.QCheckBox("Move to Trash")
+        self.trash_box.setToolTip("Deleted items can be restored from the Trash tab for {0}".format(
+            _format_duration(TRASH_GRACE_PERIOD)))
+        self.trash_box.setChecked(self.delete.useTrash())
+        self.trash_box.toggled.connect(self.delete.setUseTrash)
+        self.update_controllers()
+
+        ctrl_layout = QtWidgets.QHBoxLayout()
+        ctrl_layout.addWidget(self.status)
+        ctrl_layout.addWidget(self.trash_box)
+        ctrl_layout.addWidget(self.delete_btn)
+        ctrl_layout.addWidget(self.delete_all_btn)
+
+        delete_layout = QtWidgets.QVBoxLayout()
+        delete_layout.addWidget(self.delete)
+        delete_layout.addLayout(ctrl_layout)
+        delete_group_box.setLayout(delete_layout)
+
+        control_group_box = QtWidgets.QGroupBox("Information")
+
+        self.reset_btn = QtWidgets.QPushButton("Reload Data")
+        self.reset_btn.clicked.connect(self.shows.reset_data)
+        self.reset_btn.clicked.connect(self.contents.reset_data)
+        self.diagnostics_btn = QtWidgets.QPushButton("Diagnostics")
+        self.diagnostics_btn.clicked.connect(self.show_diagnostics)
+        self.scheduler = IOScheduler.instance()
+        self.scheduler.enable(self.settings.value('io_throttle', QOS_ENABLED) in (True, 'true'))
+        self.throttle_box = QtWidgets.QCheckBox("Throttle I/O")
+        self.throttle_box.setToolTip("Scans and deletes slow down while the volumes answer slower than {0:.0f} ms, "
+                                     "so other work on them keeps its speed".format(self.scheduler.target * 1000))
+        self.throttle_box.setChecked(self.scheduler.enabled)
+        self.throttle_box.toggled.connect(self.scheduler.enable)
+
+        self.progress = QtWidgets.QProgressBar()
+        self.progress.setFormat("   Delete List Size : %v GB | Total Used Size %m GB")
+        self.progress.setMaximum(convert_size(self.disk_usage.snapshot().used)[1])
+        self.value = int()
+        self.removedFiles = int()
+        self.deleteRate = float()
+        self.deleteErrors = int()
+        self.progress.setValue(int())
+
+        controllers_layout = QtWidgets.QHBoxLayout()
+        controllers_layout.addWidget(self.progress)
+        controllers_layout.addWidget(self.reset_btn)
+        controllers_layout.addWidget(self.throttle_box)
+        controllers_layout.addWidget(self.diagnostics_btn)
+        control_group_box.setLayout(controllers_layout)
+
+        self.connections()
+
+        # The lists follow the folders they show instead of being listed again after every change.
+        self._index = SizeIndex.instance()
+        self._watcher = DirectoryWatcher(self._folders_changed)
+        self.foldersChanged.connect(self.apply_folder_changes)
+        self._watch_timer = QtCore.QTimer(self)
+        self._watch_timer.setSingleShot(True)
+        self._watch_timer.setInterval(WATCH_UPDATE_MS)
+        self._watch_timer.timeout.connect(self.update_watches)
+        for widget in (self.shows, self.contents, self.delete):
+            widget.model().rowsInserted.connect(lambda *args: self._watch_timer.start())
+            widget.model().rowsRemoved.connect(lambda *args: self._watch_timer.start())
+            widget.model().modelReset.connect(lambda *args: self._watch_timer.start())
+
+        # Trashed items are collected in the background once they can no longer be restored.
+        self._collector = TrashCollector(self.trash, callback=self.trashChanged.emit)
+        self.trashChanged.connect(self.refresh_trash)
+        self.trash_list.itemsRestored.connect(self.items_restored)
+        self.trash_list.collectRequested.connect(self._collector.wake)
+        self._collector.start()
+
+        main_layout = QtWidgets.QGridLayout()
+        main_layout.addWidget(shows_group_box, 0, 0)
+        main_layout.addWidget(contents_group_box, 0, 1)
+        main_layout.addWidget(delete_group_box, 1, 0, 1, 2)
+        main_layout.addWidget(control_group_box, 2, 0, 1, 2)
+        self.setLayout(main_layout)
+        self.shows.fetchMore()
+        QtCore.QTimer.singleShot(0, self.offer_resume)
+
+    def operation_callback(self, paths):
+        message = QtWidgets.QMessageBox(self)
+        message.setStyleSheet("QFrame{min-width: 250px;}")
+        message.setWindowTitle("Cleanup Done")
+        message.setText("{0} Item/s successfully deleted.".format(len(paths)))
+        message_text = str()
+        for path in paths:
+            message_text += path.replace("/", "\\") + "\n"
+        message.setDetailedText(message_text)
+        message.setIcon(QtWidgets.QMessageBox.Information)
+        message.exec_()
+
+    def trash_callback(self, paths, errors):
+        self.refresh_trash()
+        message = QtWidgets.QMessageBox(self)
+        message.setStyleSheet("QFrame{min-width: 250px;}")
+        message.setWindowTitle("Moved to Trash")
+        text = "{0} Item/s moved to the trash, they can be restored from the Trash tab for {1}.".format(
+            len(paths), _format_duration(TRASH_GRACE_PERIOD))
+        if errors:
+            text += "\n{0} item/s could not be moved.".format(len(errors))
+        message.setText(text)
+        message.setDetailedText("\n".join(errors + [path.replace("/", "\\") for path in paths]))
+        message.setIcon(QtWidgets.QMessageBox.Warning if errors else QtWidgets.QMessageBox.Information)
+        message.exec_()
+
+    def refresh_trash(self):
+        self.trash_list.setEntries(self.trash.entries())
+        self.update_status()
+
+    def items_restored(self, paths):
+        # Restored folders go back to the lists they were dragged from.
+        self.updateData([{"path": path} for path in paths])
+        self.update_status()
+
+    def update_watches(self):
+        paths = set(self.shows.watchedPaths())
+        paths.update(self.contents.watchedPaths())
+        paths.update(self.delete.watchedPaths())
+        self._watcher.watch(paths)
+
+    def _folders_changed(self, events):
+        # Called on the watcher's thread, folders that are gone are dropped from the size index here.
+        for event in events:
+            if event.kind == "deleted":
+                self._index.forget(event.path)
+        self.foldersChanged.emit(events)
+
+    def apply_folder_changes(self, events):
+        for widget in (self.shows, self.contents, self.delete):
+            widget.applyChanges(events)
+        # Empty shot folders start or stop being watched without a row changing.
+        self._watch_timer.start()
+
+    def find_reclaimable(self):
+        self.reclaim_btn.setEnabled(False)
+        self.reclaim.fetchMore(int(self.reclaim_size.value() * 1024 ** 3), self.reclaim_age.value())
+
+    def find_duplicates(self):
+        self.duplicate_btn.setEnabled(False)
+        self.duplicate_total.setText("Searching...")
+        self.duplicates.fetchMore(int(self.duplicate_size.value() * 1024 ** 2))
+
+    def _duplicates_found(self, reclaimable):
+        self.duplicate_btn.setEnabled(True)
+        self.duplicate_total.setText("{0} reclaimable".format(convert_size(reclaimable)[0]))
+
+    def offer_resume(self):
+        checkpoints = PurgeCheckpoint.interrupted()
+        if not checkpoints:
+            return
+        paths = [path for checkpoint in checkpoints for path in checkpoint.remaining()]
+        message = QtWidgets.QMessageBox(QtWidgets.QMessageBox.Question, "Resume Cleanup",
+                                        "A cleanup of {0} item/s was interrupted before it finished.\n"
+                                        "Resume deleting them?".format(len(paths)),
+                                        QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No, self)
+        message.setDetailedText("\n".join(paths))
+        if message.exec_() == QtWidgets.QMessageBox.Yes:
+            self.delete.resume(checkpoints)
+        else:
+            for checkpoint in checkpoints:
+                checkpoint.end()
+
+    def resetProgress(self):
+        self.removedFiles = 0
+        self.deleteRate = float()
+        self.deleteErrors = int()
+
+        self.progress.setFormat("    Delete List Size: %v GB | Total User Size %m GB")
+        self.progress.setMaximum(convert_size(self.disk_usage.snapshot().used)[1])
+        self.disk_usage.refresh()
+
+        self.reset_btn.setEnabled(True)
+        self.update_progress(reset=True)
+        self.update_status()
+        self.update_controllers()
+
+    def update_message(self, path):
+        if path:
+            self.status.showMessage(path)
+
+    def update_status(self):
+        snapshot = self.disk_usage.snapshot()
+        s_total = convert_size(snapshot.total)[0]
+        s_free = convert_size(snapshot.free)[0]
+        s_used = convert_size(snapshot.used)[0]
+
+        message = 'Total Disk Size: {0:20}Used : {1:20}Free: {2:20}'.format(s_total, s_used, s_free)
+        # Trashed items still take up their space until the collector has removed them.
+        items, pending = self.trash.pending()
+        if items:
+            message += 'In Trash: {0:20}'.format(convert_size(pending)[0])
+        if snapshot.stale:
+            message += '(not up to date)'
+        self.status.showMessage(message)
+
+    def show_diagnostics(self):
+        if self.diagnostics is None:
+            self.diagnostics = QDiagnosticsDialog(self)
+        self.diagnostics.show()
+        self.diagnostics.raise_()
+
+    def _disk_usage_updated(self):
+        # How late the timer fired is how long the GUI thread was busy with something else.
+        now = time.time()
+        _metrics.observe(GUI_LAG_SECONDS, max(now - self._disk_tick - self._disk_timer.interval() / 1000, 0))
+        self._disk_tick = now
+        # While deleting the status bar shows the current path and the bar counts files.
+        if not self.reset_btn.isEnabled():
+            return
+        self.update_status()
+        self.progress.setMaximum(convert_size(self.disk_usage.snapshot().used)[1])
+
+    def update_progress(self, size=int(), reset=False):
+        # The list total is kept in fractional GB, the bar only shows it rounded.
+        if size:
+            self.value += size
+        if reset:
+            self.value = int()
+        self.progress.setValue(int(round(self.value)))
+
+    def connections(self):
+        self.reset_btn.clicked.connect(lambda : self.reset_btn())
+        self.delete_all_btn.clicked.connect(lambda : self.delete.doDelete())
+        self.delete_btn.clicked.connect(lambda : self.delete.doDelete(selected=True))
+        self.delete.releaseDelete.connect(self.update_controllers)
+
+    def update_controllers(self):
+        has_items = bool(self.delete.count())
+        self.delete_all_btn.setEnabled(has_items)
+        self.delete_btn.setEnabled(has_items)
+
+    def updateRemovedCount(self, num):
+        self.removedFiles += num
+        self.delete_progress()
+        self.progress.setValue(self.removedFiles)
+
+    def update_rate(self, rate, errors):
+        self.deleteRate = rate
+        self.deleteErrors = errors
+
+    def delete_progress(self):
+        freed = convert_size(int(self.disk_usage.snapshot().freed_per_minute))[0]
+        self.progress.setFormat("    Removed Files: %v | Number of Files %m | {0:.0f} files/s | {1} errors | "
+                                "{2}/min freed".format(self.deleteRate, self.deleteErrors, freed))
+        self.progress.setMaximum(self.delete.getFileCount())
+        self.reset_btn.setEnabled(False)
+
+    def reset(self):
+        self.delete_btn.setEnabled(False)
+        self.delete_all_btn.setEnabled(False)
+        self.delete.clear()
+        self.update_progress(reset=True)
+        self.update_progress()
+
+    def updateData(self, items):
+        update_paths = list()
+        for item in items:
+            path = item["path"]
+            if path in self.shows._removed_paths:
+                self.shows._removed_paths.remove(path)
+                self.shows.reset_data()
+            elif path in self.contents._removed_paths:
+                self.contents._removed_paths.remove(path)
+                update_paths.append(path)
+
+        if len(update_paths):
+            paths = [os.path.dirname(str(path)) for path in update_paths]
+            paths = set(paths)
+            for path in paths:
+                self.contents.fetchMore(path)
+
+    def closeEvent(self, event):
+        for widget in (self.shows, self.contents, self.reclaim, self.duplicates, self.delete):
+            widget.cancel(wait=True)
+        self._watcher.close()
+        self._collector.stop()
+        win_geometry = self.saveGeometry()
+        self.settings.setValue('geometry', win_geometry)
+        self.settings.setValue('use_trash', self.delete.useTrash())
+        self.settings.setValue('io_throttle', self.scheduler.enabled)
+        super(DriveCleanupMainWindow, self).closeEvent(event)
+
+
+def launch():
+    setup_logging()
+    dialog = DriveCleanupMainWindow()
+    dialog.show()
+    return dialog
+
+
+def main(argv=None):
+    setup_logging()
+    qt_args = sys.argv[1:] if argv is None else list(argv)
+    app = QtWidgets.QApplication(sys.argv[:1] + qt_args)
+    dialog = DriveCleanupMainWindow()
+    dialog.show()
+    return app.exec_()
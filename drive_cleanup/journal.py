@@ -0,0 +1,231 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 16/10/2026
+
+from __future__ import division
+import os
+import glob
+import json
+import time
+import socket
+import getpass
+import logging
+import operator
+import itertools
+import threading
+import collections
+import logging.handlers
+
+import psutil
+
+from .core import config_dir
+
+JOURNAL_ENABLED = True  # Keep an audit journal of everything the GUI purges
+JOURNAL_MAX_BYTES = 50 * 1024 ** 2  # Size the purge journal is rotated at
+JOURNAL_BACKUPS = 5  # Rotated purge journals kept
+JOURNAL_BUFFER = 512  # Records held in memory before they are written out
+CHECKPOINT_SYNC_INTERVAL = 1.0  # Seconds between fsyncs of a purge checkpoint
+
+
+class PurgeJournal(object):
+    # Append only JSON lines record of what purges removed. Unlinks are written once per directory
+    # per batch instead of once per file, and records are buffered in front of a rotating file.
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, path=None, max_bytes=JOURNAL_MAX_BYTES, backups=JOURNAL_BACKUPS, buffer=JOURNAL_BUFFER):
+        self.path = path or self.default_path()
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._file = logging.handlers.RotatingFileHandler(self.path, maxBytes=max_bytes, backupCount=backups)
+        self._file.setFormatter(logging.Formatter("%(message)s"))
+        # Only an explicit flush or a full buffer writes, records are never logged above INFO.
+        self._buffer = logging.handlers.MemoryHandler(max(1, int(buffer)), flushLevel=logging.CRITICAL,
+                                                      target=self._file)
+        self._logger = logging.Logger("drive_cleanup.journal")
+        self._logger.addHandler(self._buffer)
+        try:
+            self._user = getpass.getuser()
+        except Exception:
+            self._user = None
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @staticmethod
+    def default_path():
+        return os.path.join(config_dir(), 'drive_cleanup_purge.jsonl')
+
+    @staticmethod
+    def read(path=None):
+        # Yields the records of a journal file, oldest first. A line cut short by a crash is skipped.
+        with open(path or PurgeJournal.default_path()) as f_journal:
+            for line in f_journal:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def write(self, op, **fields):
+        record = collections.OrderedDict([("time", round(time.time(), 3)), ("op", op)])
+        record.update(sorted(fields.items()))
+        self._logger.info(json.dumps(record, separators=(",", ":")))
+
+    def started(self, root, remove_root=False, planned=False):
+        self.write("purge", root=root, remove_root=remove_root, planned=planned, user=self._user,
+                   host=socket.gethostname(), pid=os.getpid())
+
+    def unlinked(self, batch, failed=()):
+        # batch is the (directory, path) pairs one unlink worker went through, failed the (path, error)
+        # pairs among them that could not be removed. Batches come in walk order, so runs of the same
+        # directory make one record.
+        errors = dict(failed)
+        for directory, entries in itertools.groupby(batch, key=operator.itemgetter(0)):
+            start = len(directory) + 1
+            if not errors:
+                self.write("unlink", dir=directory, files=[path[start:] for _directory, path in entries], errors=[])
+                continue
+            files = []
+            failures = []
+            for _directory, path in entries:
+                if path in errors:
+                    failures.append([path[start:], str(errors[path])])
+                else:
+                    files.append(path[start:])
+            self.write("unlink", dir=directory, files=files, errors=failures)
+
+    def removed(self, directory, error=None):
+        if error is None:
+            self.write("rmdir", dir=directory)
+        else:
+            self.write("rmdir", dir=directory, error=str(error))
+
+    def finished(self, root, batch, cancelled=False):
+        self.write("done", root=root, files=batch.total_files, dirs=batch.total_dirs, errors=batch.total_errors,
+                   cancelled=cancelled)
+        self.flush()
+
+    def flush(self):
+        self._buffer.flush()
+
+    def close(self):
+        self._buffer.close()
+        self._file.close()
+
+
+class PurgeCheckpoint(object):
+    # Crash safe progress of one purge operation: the roots it was asked to purge, the roots finished and
+    # every sub directory whose contents were all dealt with. Each line is written through as soon as it
+    # is recorded so a killed process loses nothing, and synced to disk at most every
+    # CHECKPOINT_SYNC_INTERVAL. The file is removed when the operation ends.
+    _count = itertools.count()
+
+    def __init__(self, path=None, directory=None):
+        self.path = path or os.path.join(directory or self.default_dir(), "{0}-{1}-{2}.jsonl".format(
+            time.strftime("%Y%m%d-%H%M%S"), os.getpid(), next(self._count)))
+        self.roots = []
+        self.remove_root = False
+        self.finished_roots = set()
+        self.done = set()
+        self._lock = threading.Lock()
+        self._file = None
+        self._synced = time.time()
+
+    @staticmethod
+    def default_dir():
+        return os.path.join(config_dir(), 'purge_checkpoints')
+
+    @classmethod
+    def load(cls, path):
+        # None when the file holds no unfinished operation.
+        checkpoint = cls(path)
+        owner = None
+        try:
+            records = list(PurgeJournal.read(path))
+        except (IOError, OSError) as err:
+            logging.error(err)
+            return None
+        for record in records:
+            if record["op"] in ("begin", "resume"):
+                owner = (record.get("host"), record.get("pid"))
+            if record["op"] == "begin":
+                checkpoint.roots = record["roots"]
+                checkpoint.remove_root = record["remove_root"]
+            elif record["op"] == "subtree":
+                checkpoint.done.add(record["dir"])
+            elif record["op"] == "finished":
+                checkpoint.finished_roots.add(record["root"])
+        if not checkpoint.remaining():
+            # Killed between its last root and removing the file, nothing is left to resume.
+            checkpoint.end()
+            return None
+        # Another live process on this machine is still working through it.
+        if owner is not None and owner[0] == socket.gethostname() and owner[1] != os.getpid() \
+                and psutil.pid_exists(owner[1]):
+            return None
+        return checkpoint
+
+    @classmethod
+    def interrupted(cls, directory=None):
+        # The unfinished operations left in directory, oldest first.
+        checkpoints = []
+        for path in sorted(glob.glob(os.path.join(directory or cls.default_dir(), "*.jsonl"))):
+            checkpoint = cls.load(path)
+            if checkpoint is not None:
+                checkpoints.append(checkpoint)
+        return checkpoints
+
+    def remaining(self):
+        return [root for root in self.roots if root not in self.finished_roots]
+
+    def _write(self, op, **fields):
+        record = collections.OrderedDict([("time", round(time.time(), 3)), ("op", op)])
+        record.update(sorted(fields.items()))
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory and not os.path.isdir(directory):
+                    os.makedirs(directory)
+                self._file = open(self.path, "a")
+            self._file.write(line)
+            self._file.flush()
+            if op != "subtree" or time.time() - self._synced > CHECKPOINT_SYNC_INTERVAL:
+                os.fsync(self._file.fileno())
+                self._synced = time.time()
+
+    def begin(self, roots, remove_root=False):
+        self.roots = [str(root) for root in roots]
+        self.remove_root = remove_root
+        self._write("begin", roots=self.roots, remove_root=remove_root, host=socket.gethostname(), pid=os.getpid())
+
+    def resume(self):
+        # Takes over an interrupted operation, returns the roots left to purge.
+        self._write("resume", host=socket.gethostname(), pid=os.getpid())
+        return self.remaining()
+
+    def subtree(self, directory):
+        self.done.add(directory)
+        self._write("subtree", dir=directory)
+
+    def finished(self, root):
+        self.finished_roots.add(root)
+        self._write("finished", root=root)
+
+    def end(self):
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError as err:
+            logging.error(err)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,222 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 17/10/2026
+
+from __future__ import division
+import os
+import json
+import time
+import bisect
+import functools
+import threading
+import collections
+
+METRICS_ENABLED = False  # Collect operation metrics from the start, the diagnostics panel and --metrics turn it on
+METRICS_PREFIX = "drive_cleanup_"  # Prefix of the exported metric names
+# Upper bounds, in seconds, of the latency histogram buckets
+HISTOGRAM_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                     10.0)
+
+_clock = getattr(time, "perf_counter", time.time)  # py3 only
+
+WALKER_ENTRIES = "walker_entries_total"
+WALKER_BYTES = "walker_bytes_total"
+WALKER_SECONDS = "walker_seconds_total"
+FS_OP_SECONDS = "fs_op_seconds"  # op="scandir" times a fully read listing, not just opening the folder
+QUEUE_DEPTH = "queue_depth"
+GUI_SLOT_SECONDS = "gui_slot_seconds"
+GUI_LAG_SECONDS = "gui_loop_lag_seconds"
+
+
+class Histogram(object):
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+        self.sum = float()
+        self.count = int()
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(HISTOGRAM_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        # Interpolated inside the bucket the quantile falls in, the same estimate Prometheus makes.
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = int()
+        for i_bucket, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                if i_bucket == len(HISTOGRAM_BUCKETS):
+                    return HISTOGRAM_BUCKETS[-1]
+                lower = HISTOGRAM_BUCKETS[i_bucket - 1] if i_bucket else float()
+                return lower + (HISTOGRAM_BUCKETS[i_bucket] - lower) * (rank - seen) / count
+            seen += count
+        return HISTOGRAM_BUCKETS[-1]
+
+
+class Metrics(object):
+    # Counters, gauges and latency histograms of the hot paths, keyed by name and labels. While disabled
+    # every call returns straight away, the walkers also check enabled once per walk and skip their
+    # timing entirely.
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, enabled=METRICS_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._started = time.time()
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def reset(self):
+        with self._lock:
+            self._counters = {}
+            self._gauges = {}
+            self._histograms = {}
+            self._started = time.time()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def count(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def gauge(self, name, value, **labels):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges[self._key(name, labels)] = value
+
+    def observe(self, name, value, **labels):
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.add(value)
+
+    def walked(self, walker, entries, size, seconds):
+        # size is None for walkers that do not stat what they go through.
+        if not self.enabled:
+            return
+        self.count(WALKER_ENTRIES, entries, walker=walker)
+        if size is not None:
+            self.count(WALKER_BYTES, size, walker=walker)
+        self.count(WALKER_SECONDS, seconds, walker=walker)
+
+    def timed(self, name, **labels):
+        # Decorator observing how long each call takes.
+        def _decorator(fn):
+            @functools.wraps(fn)
+            def _timed(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = _clock()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(name, _clock() - start, **labels)
+            return _timed
+        return _decorator
+
+    def snapshot(self):
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            histograms = sorted((key, (list(histogram.counts), histogram.sum, histogram.count))
+                                for key, histogram in self._histograms.items())
+        totals = collections.defaultdict(dict)
+        for (name, labels), value in counters:
+            if name in (WALKER_ENTRIES, WALKER_BYTES, WALKER_SECONDS):
+                totals[dict(labels)["walker"]][name] = value
+        rates = []
+        for walker, values in sorted(totals.items()):
+            seconds = values.get(WALKER_SECONDS) or float()
+            entries = values.get(WALKER_ENTRIES, 0)
+            size = values.get(WALKER_BYTES)
+            rates.append(collections.OrderedDict([
+                ("walker", walker), ("entries_per_second", entries / seconds if seconds else None),
+                ("bytes_per_second", size / seconds if seconds and size is not None else None)]))
+        snapshot_histograms = []
+        for (name, labels), (counts, total, count) in histograms:
+            histogram = Histogram()
+            histogram.counts, histogram.sum, histogram.count = counts, total, count
+            snapshot_histograms.append(collections.OrderedDict([
+                ("name", name), ("labels", dict(labels)), ("count", count), ("sum", total),
+                ("p50", histogram.quantile(0.5)), ("p90", histogram.quantile(0.9)), ("p99", histogram.quantile(0.99)),
+                ("buckets", [[bound, bucket] for bound, bucket in zip(HISTOGRAM_BUCKETS + ("+Inf",), counts)])]))
+        return collections.OrderedDict([
+            ("time", time.time()), ("started", self._started), ("enabled", self.enabled),
+            ("counters", [{"name": name, "labels": dict(labels), "value": value}
+                          for (name, labels), value in counters]),
+            ("gauges", [{"name": name, "labels": dict(labels), "value": value} for (name, labels), value in gauges]),
+            ("histograms", snapshot_histograms), ("rates", rates)])
+
+    def to_prometheus(self, snapshot=None):
+        # The Prometheus text exposition format, for a node exporter textfile collector.
+        snapshot = snapshot or self.snapshot()
+        lines = []
+
+        def _labels(labels, extra=()):
+            pairs = sorted(labels.items()) + list(extra)
+            if not pairs:
+                return ""
+            return "{" + ",".join('{0}="{1}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+                                  for key, value in pairs) + "}"
+
+        typed = set()
+        for kind, entries in (("counter", snapshot["counters"]), ("gauge", snapshot["gauges"])):
+            for entry in entries:
+                name = METRICS_PREFIX + entry["name"]
+                if name not in typed:
+                    typed.add(name)
+                    lines.append("# TYPE {0} {1}".format(name, kind))
+                lines.append("{0}{1} {2}".format(name, _labels(entry["labels"]), float(entry["value"])))
+        for entry in snapshot["histograms"]:
+            name = METRICS_PREFIX + entry["name"]
+            if name not in typed:
+                typed.add(name)
+                lines.append("# TYPE {0} histogram".format(name))
+            cumulative = int()
+            for bound, count in entry["buckets"]:
+                cumulative += count
+                lines.append("{0}_bucket{1} {2}".format(name, _labels(entry["labels"], [("le", bound)]), cumulative))
+            lines.append("{0}_sum{1} {2}".format(name, _labels(entry["labels"]), entry["sum"]))
+            lines.append("{0}_count{1} {2}".format(name, _labels(entry["labels"]), entry["count"]))
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        # JSON for a .json path, the Prometheus text format otherwise. Written to a temporary file first so
+        # a collector never reads half of it.
+        snapshot = self.snapshot()
+        if path.lower().endswith(".json"):
+            text = json.dumps(snapshot, indent=2)
+        else:
+            text = self.to_prometheus(snapshot)
+        temp_path = "{0}.{1}.tmp".format(path, os.getpid())
+        with open(temp_path, "w") as f_out:
+            f_out.write(text)
+        if os.path.exists(path) and not hasattr(os, "replace"):
+            os.remove(path)  # py2 rename does not overwrite on Windows
+        getattr(os, "replace", os.rename)(temp_path, path)
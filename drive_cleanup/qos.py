@@ -0,0 +1,211 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 17/10/2026
+
+from __future__ import division
+import time
+import threading
+import collections
+
+from .metrics import Metrics
+
+QOS_ENABLED = False  # Pace scans and purges by how fast the volumes answer, rather than running flat out
+QOS_TARGET_LATENCY = 0.02  # Seconds a stat, listing, unlink or rmdir may take before the calls back off
+QOS_INTERVAL = 0.5  # Seconds between adjustments of each volume's budget
+QOS_INCREASE = 0.05  # Part of the budget's ops/sec given back per interval spent under the target
+QOS_DECREASE = 0.5  # Factor the ops/sec and concurrent calls are cut by when over the target
+QOS_MIN_RATE = 20.0  # Ops/sec a backed off volume is never held below
+QOS_PERCENTILE = 0.9  # Latency percentile of each interval held against the target
+# (start hour, end hour, ops/sec, concurrent calls) per volume, local time, the first window the hour is in
+# applies. Windows may wrap past midnight, 0 ops/sec leaves the rate unlimited.
+QOS_BUDGETS = [(8, 20, 500.0, 4), (20, 8, 0, 16)]
+QOS_VOLUME_BUDGETS = {}  # Volume mount point or drive -> budgets used instead of QOS_BUDGETS on it
+
+IOBudget = collections.namedtuple("IOBudget", ["start", "end", "rate", "concurrency"])
+
+_metrics = Metrics.instance()
+_clock = getattr(time, "perf_counter", time.time)  # py3 only
+
+
+def parse_budget(text):
+    # "8-20:500:4" is 500 ops/sec and 4 concurrent calls from 8:00 to 20:00, "20-8:0:16" wraps past midnight.
+    hours, rate, concurrency = text.split(":")
+    start, end = hours.split("-")
+    return IOBudget(float(start), float(end), float(rate), int(concurrency))
+
+
+def budget_for(budgets, now=None):
+    # The budget whose window holds the local time now, None when none does.
+    local = time.localtime(time.time() if now is None else now)
+    hour = local.tm_hour + local.tm_min / 60
+    for budget in budgets:
+        budget = IOBudget(*budget)
+        if budget.start <= budget.end and budget.start <= hour < budget.end:
+            return budget
+        if budget.start > budget.end and (hour >= budget.start or hour < budget.end):
+            return budget
+    return None
+
+
+class _VolumeControl(object):
+    # The AIMD state of one volume: the ops/sec and concurrent calls it is allowed right now, within its
+    # budget, and the latencies measured since the last adjustment.
+    def __init__(self, volume):
+        self.volume = volume
+        self.condition = threading.Condition()
+        self.budget = None
+        self.rate = float()
+        self.limit = 1
+        self.active = int()
+        self.next_slot = float()
+        self.samples = []
+        self.adjusted = float()
+        self.latency = None
+
+
+class IOScheduler(object):
+    # Shared by every walker and deleter. Each filesystem call on a volume first waits for a free call
+    # and a slot under the volume's ops/sec, then reports how long it took. Every interval the volume's
+    # budget backs off multiplicatively when the latency percentile is above the target and grows back
+    # additively, one call and a part of the ops/sec at a time, while it is under.
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, enabled=QOS_ENABLED, target=QOS_TARGET_LATENCY, budgets=None, volume_budgets=None,
+                 interval=QOS_INTERVAL, increase=QOS_INCREASE, decrease=QOS_DECREASE, min_rate=QOS_MIN_RATE,
+                 percentile=QOS_PERCENTILE):
+        self.enabled = enabled
+        self.target = target
+        self.budgets = list(QOS_BUDGETS if budgets is None else budgets)
+        self.volume_budgets = dict(QOS_VOLUME_BUDGETS if volume_budgets is None else volume_budgets)
+        self._interval = interval
+        self._increase = increase
+        self._decrease = decrease
+        self._min_rate = min_rate
+        self._percentile = percentile
+        self._lock = threading.Lock()
+        self._volumes = {}
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def configure(self, target=None, budgets=None, volume_budgets=None):
+        # Volumes pick new budgets up at their next adjustment.
+        if target is not None:
+            self.target = target
+        if budgets is not None:
+            self.budgets = list(budgets)
+        if volume_budgets is not None:
+            self.volume_budgets = dict(volume_budgets)
+        with self._lock:
+            for control in self._volumes.values():
+                control.adjusted = float()
+
+    def _control(self, volume):
+        with self._lock:
+            control = self._volumes.get(volume)
+            if control is None:
+                control = self._volumes[volume] = _VolumeControl(volume)
+        return control
+
+    def _budget(self, control, now):
+        # Follows the time of day, a new budget starts the volume at its full allowance.
+        budget = budget_for(self.volume_budgets.get(control.volume, self.budgets))
+        if budget != control.budget:
+            control.budget = budget
+            control.rate = budget.rate if budget is not None else float()
+            control.limit = budget.concurrency if budget is not None else 0
+            control.samples = []
+        control.adjusted = now
+
+    def acquire(self, volume):
+        control = self._control(volume)
+        with control.condition:
+            now = _clock()
+            if now - control.adjusted > self._interval:
+                if control.budget is None:
+                    self._budget(control, now)
+                else:
+                    self._adjust(control, now)
+            while control.limit and control.active >= control.limit:
+                control.condition.wait()
+            control.active += 1
+            delay = float()
+            if control.rate:
+                now = _clock()
+                slot = max(control.next_slot, now)
+                control.next_slot = slot + 1 / control.rate
+                delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+            _metrics.observe("qos_wait_seconds", delay, volume=volume)
+        return control
+
+    def release(self, control, seconds):
+        with control.condition:
+            control.active -= 1
+            control.samples.append(seconds)
+            control.condition.notify()
+
+    def _adjust(self, control, now):
+        # Called with the volume's condition held.
+        samples = sorted(control.samples)
+        control.samples = []
+        elapsed = max(now - control.adjusted, self._interval)
+        previous = control.budget
+        self._budget(control, now)
+        if not samples or control.budget is None or control.budget != previous:
+            return
+        control.latency = samples[min(int(len(samples) * self._percentile), len(samples) - 1)]
+        budget = control.budget
+        done = len(samples) / elapsed
+        if control.latency > self.target:
+            # Fewer concurrent calls first, down to one, then fewer calls per second. An unlimited rate
+            # starts from what the volume managed this interval.
+            if control.limit > 1:
+                control.limit = max(int(control.limit * self._decrease), 1)
+            else:
+                control.rate = max((control.rate or done) * self._decrease, self._min_rate)
+        elif control.rate:
+            # Back up in the reverse order, the calls per second up to the budget first.
+            if budget.rate:
+                control.rate = min(control.rate + budget.rate * self._increase, budget.rate)
+            elif done < control.rate * (1 - self._increase):
+                # The calls no longer use what an unlimited budget is allowed, the rate stops holding them.
+                control.rate = float()
+            else:
+                control.rate += max(done, self._min_rate) * self._increase
+            if budget.rate and control.rate >= budget.rate:
+                control.limit = min(control.limit + 1, budget.concurrency)
+        else:
+            control.limit = min(control.limit + 1, budget.concurrency)
+        control.condition.notify_all()
+        _metrics.gauge("qos_rate", control.rate, volume=control.volume)
+        _metrics.gauge("qos_concurrency", control.limit, volume=control.volume)
+        _metrics.gauge("qos_latency_seconds", control.latency, volume=control.volume)
+
+    def call(self, volume, fn, *args, **kwargs):
+        # fn(*args, **kwargs) as one paced call on volume.
+        control = self.acquire(volume)
+        start = _clock()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.release(control, _clock() - start)
+
+    def snapshot(self):
+        # {volume: (ops/sec, concurrent calls, last latency percentile, budget)}, 0 ops/sec is unlimited.
+        with self._lock:
+            controls = list(self._volumes.values())
+        state = {}
+        for control in controls:
+            with control.condition:
+                state[control.volume] = (control.rate, control.limit, control.latency, control.budget)
+        return state
@@ -0,0 +1,116 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 16/10/2026
+
+from __future__ import division
+import bisect
+import posixpath
+import collections
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .core import SIZE_UNITS, SIZE_POWERS
+
+AGE_BUCKETS = (30, 90, 180, 365)  # Upper bounds in days of the age rollup buckets
+_GIGABYTE = SIZE_POWERS[3]
+_SUFFIXES = tuple(" " + unit for unit in SIZE_UNITS)
+_POWERS = SIZE_POWERS if numpy is None else numpy.array(SIZE_POWERS, dtype=numpy.float64)
+
+
+def _unit_indexes(values):
+    # Same unit choice as convert_size, values below one byte stay in bytes.
+    if numpy is None:
+        return [max(bisect.bisect_right(SIZE_POWERS, value) - 1, 0) for value in values]
+    return numpy.maximum(numpy.searchsorted(_POWERS, values, side="right") - 1, 0)
+
+
+def format_sizes(values):
+    # The convert_size strings of a whole sequence of byte counts.
+    if numpy is None:
+        units = _unit_indexes(values)
+        return ["0B" if not value else str(round(value / SIZE_POWERS[unit], 2)) + _SUFFIXES[unit]
+                for value, unit in zip(values, units)]
+    values = numpy.asarray(values, dtype=numpy.float64)
+    units = _unit_indexes(values)
+    scaled = numpy.round(values / _POWERS[units], 2).tolist()
+    texts = list(map(str.__add__, map(str, scaled), map(_SUFFIXES.__getitem__, units.tolist())))
+    for i_value in numpy.flatnonzero(values == 0).tolist():
+        texts[i_value] = "0B"
+    return texts
+
+
+def gigabytes(values):
+    # The convert_size gigabyte figures of a whole sequence of byte counts.
+    if numpy is None:
+        return [round(value / _GIGABYTE, 2) for value in values]
+    return numpy.round(numpy.asarray(values, dtype=numpy.float64) / _GIGABYTE, 2)
+
+
+def show_of(path, base_paths=()):
+    # The first folder below the base path holding path, the show folders themselves when they sit directly
+    # under it. Outside the base paths items live under <show>/scenes/<shot>, else they are their own group.
+    path = str(path).replace("\\", "/").rstrip("/")
+    for base_path in base_paths:
+        base_path = str(base_path).replace("\\", "/").rstrip("/")
+        if base_path and path.startswith(base_path + "/"):
+            return path[len(base_path) + 1:].split("/")[0]
+    parts = path.split("/")
+    if "scenes" in parts[1:]:
+        return parts[parts.index("scenes", 1) - 1]
+    return posixpath.basename(path) or "/"
+
+
+def age_bucket(age_days, buckets=AGE_BUCKETS):
+    if age_days is None:
+        return "no files"
+    i_bucket = bisect.bisect_left(buckets, age_days)
+    if i_bucket == len(buckets):
+        return ">{0}d".format(buckets[-1])
+    return "<={0}d".format(buckets[i_bucket])
+
+
+Rollup = collections.namedtuple("Rollup", ["group", "items", "size", "files", "dirs", "newest"])
+
+
+def rollup(items, key):
+    # Sums (path, ScanResult) items per key(path, result), largest group first.
+    items = list(items)
+    codes = {}
+    item_codes = [codes.setdefault(key(path, result), len(codes)) for path, result in items]
+    if not items:
+        return []
+    groups = sorted(codes, key=codes.get)
+    if numpy is None:
+        totals = [[int(), int(), int(), int(), float()] for _group in groups]
+        for code, (_path, result) in zip(item_codes, items):
+            total = totals[code]
+            total[0] += 1
+            total[1] += result.size
+            total[2] += result.files
+            total[3] += result.dirs
+            total[4] = max(total[4], result.newest)
+        rows = [Rollup(group, *total) for group, total in zip(groups, totals)]
+    else:
+        item_codes = numpy.array(item_codes)
+        columns = numpy.array([(result.size, result.files, result.dirs) for _path, result in items],
+                              dtype=numpy.int64).reshape(-1, 3)
+        newest = numpy.zeros(len(groups))
+        numpy.maximum.at(newest, item_codes, [result.newest for _path, result in items])
+        counts = numpy.bincount(item_codes, minlength=len(groups))
+        sums = [numpy.bincount(item_codes, weights=columns[:, i_column], minlength=len(groups))
+                for i_column in range(3)]
+        rows = [Rollup(group, int(count), int(size), int(files), int(dirs), float(last))
+                for group, count, size, files, dirs, last in zip(groups, counts, sums[0], sums[1], sums[2], newest)]
+    return sorted(rows, key=lambda row: row.size, reverse=True)
+
+
+def rollup_by_show(items, base_paths=()):
+    return rollup(items, lambda path, result: show_of(path, base_paths))
+
+
+def rollup_by_age(items, now, buckets=AGE_BUCKETS):
+    return rollup(items, lambda path, result: age_bucket((now - result.newest) / 86400 if result.newest else None,
+                                                         buckets))
@@ -0,0 +1,113 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 16/10/2026
+
+from __future__ import division
+import sys
+import array
+import posixpath
+import threading
+
+try:
+    from sys import intern
+except ImportError:
+    pass  # py2 builtin
+
+from .core import ScanResult
+
+try:
+    array.array("q")
+    _INT64 = "q"
+except ValueError:
+    # py2 has no "q", its "l" is only 32 bit on Windows where doubles keep the byte counts exact instead.
+    _INT64 = "l" if array.array("l").itemsize >= 8 else "d"
+
+
+class ResultStore(object):
+    # Scan results as typed columns, one entry per directory. An entry keeps its interned base name
+    # and the id of its parent entry, entries added without a parent keep their whole path as name.
+    def __init__(self):
+        self.parents = array.array("l")
+        self.sizes = array.array(_INT64)
+        self.files = array.array(_INT64)
+        self.dirs = array.array(_INT64)
+        self.mtimes = array.array("d")
+        self.names = []
+        self._roots = {}
+        self._ids = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, path, result=None, parent=-1):
+        path = str(path).replace("\\", "/")
+        name = path if parent < 0 else posixpath.basename(path)
+        result = result or ScanResult(int(), int(), int(), float())
+        with self._lock:
+            item_id = len(self.names)
+            self.names.append(intern(name))
+            self.parents.append(parent)
+            self.sizes.append(int(result.size))
+            self.files.append(int(result.files))
+            self.dirs.append(int(result.dirs))
+            self.mtimes.append(float(result.newest))
+            if parent < 0:
+                self._roots[self.names[-1]] = item_id
+            if self._ids is not None:
+                self._ids[path] = item_id
+        return item_id
+
+    def set(self, item_id, result):
+        self.sizes[item_id] = int(result.size)
+        self.files[item_id] = int(result.files)
+        self.dirs[item_id] = int(result.dirs)
+        self.mtimes[item_id] = float(result.newest)
+
+    def result(self, item_id):
+        return ScanResult(self.sizes[item_id], self.files[item_id], self.dirs[item_id], self.mtimes[item_id])
+
+    def path(self, item_id):
+        names = []
+        while item_id >= 0:
+            names.append(self.names[item_id])
+            item_id = self.parents[item_id]
+        return "/".join(reversed(names))
+
+    def find(self, path):
+        path = str(path).replace("\\", "/")
+        item_id = self._roots.get(path)
+        if item_id is not None:
+            return item_id
+        # Looking up sub directories needs a full path map, it is only built when first asked for.
+        with self._lock:
+            if self._ids is None:
+                self._ids = dict((self.path(item_id), item_id) for item_id in range(len(self.names)))
+        return self._ids.get(path)
+
+    def depths(self):
+        # Parents are always added before their children.
+        depths = array.array("l", [0]) * len(self.names)
+        for item_id, parent in enumerate(self.parents):
+            if parent >= 0:
+                depths[item_id] = depths[parent] + 1
+        return depths
+
+    def roots(self):
+        roots = array.array("l", range(len(self.names)))
+        for item_id, parent in enumerate(self.parents):
+            if parent >= 0:
+                roots[item_id] = roots[parent]
+        return roots
+
+    def items(self, ids=None):
+        for item_id in (range(len(self.names)) if ids is None else ids):
+            yield self.path(item_id), self.result(item_id)
+
+    def nbytes(self):
+        # Columns plus the name list and each distinct name, what a million entries cost in memory.
+        columns = [self.parents, self.sizes, self.files, self.dirs, self.mtimes]
+        size = sum(column.itemsize * column.buffer_info()[1] for column in columns)
+        size += sys.getsizeof(self.names) + sys.getsizeof(self._roots)
+        size += sum(sys.getsizeof(name) for name in set(self.names))
+        return size
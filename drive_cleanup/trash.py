@@ -0,0 +1,306 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 17/10/2026
+
+from __future__ import division
+import os
+import glob
+import json
+import time
+import errno
+import logging
+import itertools
+import posixpath
+import threading
+import collections
+
+from .core import TRASH_DIR_NAME, CancelToken, PurgeEngine, config_dir, volume_of
+from .journal import JOURNAL_ENABLED, PurgeJournal
+
+TRASH_DELETE = False  # The delete buttons move items to the trash of their volume rather than purging them
+TRASH_GRACE_PERIOD = 24 * 3600  # Seconds a trashed item can be restored before it is collected
+TRASH_COLLECT_RATE = 2000.0  # Entries per second the collector removes, 0 removes them as fast as it can
+TRASH_COLLECT_WORKERS = 2  # Concurrent unlink calls of the collector
+TRASH_COLLECT_INTERVAL = 60.0  # Seconds between looks for trashed items past their grace period
+
+# One trashed item: where it came from, the trash folder it went to, and what it held when it was trashed.
+TrashEntry = collections.namedtuple("TrashEntry", ["id", "path", "trash", "size", "files", "trashed", "expires"])
+
+
+def stored_path(entry):
+    return posixpath.join(entry.trash, "files", entry.id)
+
+
+def info_path(entry):
+    return posixpath.join(entry.trash, "info", entry.id + ".json")
+
+
+def _write_json(path, data):
+    # Through a temporary file so a crash never leaves half a record behind.
+    temp_path = "{0}.{1}.tmp".format(path, os.getpid())
+    with open(temp_path, "w") as f_out:
+        json.dump(data, f_out)
+        f_out.flush()
+        os.fsync(f_out.fileno())
+    if os.path.exists(path) and not hasattr(os, "replace"):
+        os.remove(path)  # py2 rename does not overwrite on Windows
+    getattr(os, "replace", os.rename)(temp_path, path)
+
+
+def _makedirs(path):
+    try:
+        os.makedirs(path)
+    except OSError:
+        if not os.path.isdir(path):
+            raise
+
+
+class TrashCan(object):
+    # Deleting moves an item into a hidden trash folder on its own volume, a single rename however big it
+    # is. Each volume gets one trash folder, as high up below its mount point as the user may write but
+    # never in the filesystem root, holding the items under files/ and a JSON record per item under info/.
+    # The trash folders are registered in the config folder so the collector finds them again after a
+    # restart.
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, registry=None, grace_period=TRASH_GRACE_PERIOD, journal=None):
+        # journal is a PurgeJournal, without one moves and restores are not recorded.
+        self.registry = registry or self.default_registry()
+        self._grace_period = grace_period
+        self.journal = journal
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._trash_dirs = {}
+        self._count = itertools.count()
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(journal=PurgeJournal.instance() if JOURNAL_ENABLED else None)
+            return cls._instance
+
+    @staticmethod
+    def default_registry():
+        return os.path.join(config_dir(), 'drive_cleanup_trash.json')
+
+    def trash_dirs(self):
+        try:
+            with open(self.registry) as f_in:
+                return json.load(f_in)
+        except (IOError, OSError, ValueError):
+            return []
+
+    def _register(self, trash):
+        trash_dirs = self.trash_dirs()
+        if trash in trash_dirs:
+            return
+        directory = os.path.dirname(self.registry)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        _write_json(self.registry, trash_dirs + [trash])
+
+    def load(self):
+        # Reads the records of every registered trash folder, folders on volumes that are not mounted
+        # are skipped until the next load.
+        entries = {}
+        for trash in self.trash_dirs():
+            for path in glob.glob(posixpath.join(trash, "info", "*.json")):
+                try:
+                    with open(path) as f_in:
+                        record = json.load(f_in)
+                except (IOError, OSError, ValueError) as err:
+                    logging.error(err)
+                    continue
+                entry_id = os.path.basename(path)[:-len(".json")]
+                entries[entry_id] = TrashEntry(entry_id, record["path"], trash, record.get("size"),
+                                               record.get("files"), record["trashed"], record["expires"])
+        with self._lock:
+            self._entries = entries
+
+    def entries(self):
+        with self._lock:
+            return sorted(self._entries.values(), key=lambda entry: entry.trashed)
+
+    def pending(self):
+        # Items and bytes waiting in the trash, space the volumes report as used until they are collected.
+        entries = self.entries()
+        return len(entries), sum(entry.size or 0 for entry in entries)
+
+    def expired(self, now=None):
+        now = time.time() if now is None else now
+        return [entry for entry in self.entries() if entry.expires <= now]
+
+    def _trash_dir(self, path, device):
+        # The highest folder above path, from the mount point of its volume down, on the same device that
+        # a trash folder can be made in. The filesystem root itself is never used.
+        with self._lock:
+            trash = self._trash_dirs.get(device)
+        # A trash folder inside the item itself cannot take it, one further up is made instead.
+        if trash is not None and not trash.startswith(path + "/"):
+            return trash
+        mount = volume_of(path).rstrip("/") + "/"
+        ancestors = []
+        current = posixpath.dirname(path)
+        while current not in ancestors and current != "/" and (current + "/").startswith(mount):
+            ancestors.append(current)
+            current = posixpath.dirname(current)
+        for ancestor in reversed(ancestors):
+            trash = posixpath.join(ancestor, TRASH_DIR_NAME)
+            try:
+                if os.stat(ancestor).st_dev != device:
+                    continue
+                _makedirs(posixpath.join(trash, "files"))
+                _makedirs(posixpath.join(trash, "info"))
+                if os.stat(trash).st_dev != device:
+                    continue
+            except OSError:
+                continue
+            self._register(trash)
+            with self._lock:
+                self._trash_dirs[device] = trash
+            return trash
+        raise OSError(errno.EXDEV, "No trash folder can be made on the volume of", path)
+
+    def move(self, path, size=None, files=None):
+        # Raises OSError when path cannot be moved, nothing is recorded then.
+        path = str(path).replace("\\", "/").rstrip("/")
+        trash = self._trash_dir(path, os.lstat(path).st_dev)
+        now = time.time()
+        entry = TrashEntry("{0}-{1}-{2}".format(time.strftime("%Y%m%d-%H%M%S"), os.getpid(), next(self._count)),
+                           path, trash, size, files, now, now + self._grace_period)
+        # The record goes first, a crash before the rename leaves a record the collector drops.
+        self._write_info(entry)
+        try:
+            os.rename(path, stored_path(entry))
+        except OSError:
+            os.remove(info_path(entry))
+            raise
+        with self._lock:
+            self._entries[entry.id] = entry
+        if self.journal is not None:
+            self.journal.write("trash", path=path, stored=stored_path(entry), size=size, files=files)
+            self.journal.flush()
+        return entry
+
+    def _write_info(self, entry):
+        _write_json(info_path(entry), {"path": entry.path, "size": entry.size, "files": entry.files,
+                                       "trashed": entry.trashed, "expires": entry.expires})
+
+    def restore(self, entry):
+        # Raises OSError when the original path was taken again in the meantime.
+        if os.path.lexists(entry.path):
+            raise OSError(errno.EEXIST, "Cannot restore over an existing path", entry.path)
+        _makedirs(posixpath.dirname(entry.path))
+        os.rename(stored_path(entry), entry.path)
+        self._forget(entry)
+        if self.journal is not None:
+            self.journal.write("restore", path=entry.path, stored=stored_path(entry))
+            self.journal.flush()
+
+    def expire(self, entries, when=None):
+        # Ends the grace period of entries, the collector removes them on its next pass.
+        when = time.time() if when is None else when
+        for entry in entries:
+            entry = entry._replace(expires=when)
+            try:
+                self._write_info(entry)
+            except (IOError, OSError) as err:
+                logging.error(err)
+                continue
+            with self._lock:
+                if entry.id in self._entries:
+                    self._entries[entry.id] = entry
+
+    def _forget(self, entry):
+        try:
+            os.remove(info_path(entry))
+        except OSError as err:
+            logging.error(err)
+        with self._lock:
+            self._entries.pop(entry.id, None)
+
+    def collect(self, entry, engine=None, progress=None, cancel=None):
+        # Purges one trashed item, True once it is gone for good. A cancelled or failed purge leaves the
+        # rest in the trash for the next pass.
+        path = stored_path(entry)
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):
+                (engine or PurgeEngine()).purge(path, progress=progress, remove_root=True, cancel=cancel)
+            elif os.path.lexists(path):
+                os.remove(path)
+        except OSError as err:
+            logging.error(err)
+        if os.path.lexists(path):
+            return False
+        self._forget(entry)
+        return True
+
+
+class _Throttle(object):
+    # Holds the unlink workers back to rate entries per second overall.
+    def __init__(self, rate, stopped):
+        self._rate = rate
+        self._stopped = stopped
+        self._lock = threading.Lock()
+        self._next = time.time()
+
+    def __call__(self, batch):
+        if not self._rate:
+            return
+        with self._lock:
+            now = time.time()
+            self._next = max(self._next, now) + batch.files / self._rate
+            delay = self._next - now
+        self._stopped.wait(delay)
+
+
+class TrashCollector(object):
+    # Removes trashed items once their grace period is over, oldest first, on a daemon thread and no
+    # faster than rate entries per second. callback() is called on that thread whenever the trash changed.
+    def __init__(self, trash=None, callback=None, rate=TRASH_COLLECT_RATE, workers=TRASH_COLLECT_WORKERS,
+                 interval=TRASH_COLLECT_INTERVAL):
+        self._trash = trash or TrashCan.instance()
+        self._callback = callback
+        self._interval = interval
+        self._engine = PurgeEngine(workers=workers, journal=self._trash.journal)
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._cancel = CancelToken()
+        self._throttle = _Throttle(rate, self._stopped)
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="TrashCollector")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, wait=False):
+        # A purge cut short here is finished after the next start.
+        self._stopped.set()
+        self._cancel.cancel()
+        self._wake.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def wake(self):
+        self._wake.set()
+
+    def _changed(self):
+        if self._callback is not None:
+            self._callback()
+
+    def _run(self):
+        self._trash.load()
+        self._changed()
+        while not self._stopped.is_set():
+            for entry in self._trash.expired():
+                if self._stopped.is_set():
+                    return
+                if self._trash.collect(entry, self._engine, self._throttle, self._cancel):
+                    self._changed()
+            self._wake.wait(self._interval)
+            self._wake.clear()
@@ -0,0 +1,317 @@
+# coding=utf-8
+# authors: Outcast Inc
+# created: 17/10/2026
+
+from __future__ import division
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import posixpath
+import threading
+import collections
+
+import ctypes
+import ctypes.util
+import logging
+
+import psutil
+
+from .core import volume_of
+
+WATCH_BACKEND = "auto"  # "inotify" or "poll", "auto" uses inotify where the filesystem reports local changes
+WATCH_DEBOUNCE = 0.5  # Seconds without a new change before the changes so far are applied
+WATCH_MAX_DELAY = 3.0  # Longest changes are held back while a folder keeps changing
+WATCH_POLL_INTERVAL = 5.0  # Seconds between checks of the folders that are polled
+WATCH_MAX_DIRS = 4096  # Folders watched at once, inotify watches are a limited per user resource
+WATCH_MAX_ENTRIES = 256  # Changed entries of one folder held back before it is reported for a rescan instead
+
+# kind is "created", "deleted", "modified" or "rescan", mtime is None unless the path still exists.
+# A rescan means path changed too much, or its changes were lost, and it needs listing again.
+WatchEvent = collections.namedtuple("WatchEvent", ["path", "kind", "mtime"])
+
+_NETWORK_FILESYSTEMS = {"nfs", "nfs4", "cifs", "smbfs", "smb3", "afs", "9p", "fuse.sshfs", "ceph", "glusterfs"}
+_FILESYSTEMS = {}
+
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_MASK = _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_EVENT = struct.Struct("iIII")
+
+
+def _normalize(path):
+    return str(path).replace("\\", "/").rstrip("/") or "/"
+
+
+def is_network_path(path):
+    # inotify only sees changes made through this machine, it misses what other hosts write to a share.
+    if not _FILESYSTEMS:
+        try:
+            _FILESYSTEMS.update((part.mountpoint, part.fstype) for part in psutil.disk_partitions(all=True))
+        except Exception as err:
+            logging.error(err)
+        _FILESYSTEMS.setdefault("/", "")
+    return _FILESYSTEMS.get(volume_of(path), "").lower() in _NETWORK_FILESYSTEMS
+
+
+class _Inotify(object):
+    # Non recursive inotify watches through libc, one per directory.
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._buffer = b""
+
+    def add(self, path):
+        wd = self._libc.inotify_add_watch(self.fd, path.encode(sys.getfilesystemencoding()), _IN_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), path)
+        return wd
+
+    def remove(self, wd):
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self):
+        # Yields (wd, mask, name) for the events queued so far.
+        try:
+            self._buffer += os.read(self.fd, 64 * 1024)
+        except OSError as err:
+            if err.errno not in (errno.EAGAIN, errno.EINTR):
+                raise
+        offset = 0
+        while offset + _IN_EVENT.size <= len(self._buffer):
+            wd, mask, _cookie, length = _IN_EVENT.unpack_from(self._buffer, offset)
+            end = offset + _IN_EVENT.size + length
+            if end > len(self._buffer):
+                break
+            name = self._buffer[offset + _IN_EVENT.size:end].rstrip(b"\0")
+            offset = end
+            yield wd, mask, name.decode(sys.getfilesystemencoding(), "replace")
+        self._buffer = self._buffer[offset:]
+
+    def close(self):
+        os.close(self.fd)
+
+
+class DirectoryWatcher(object):
+    # Reports folders and their direct entries appearing or going away, and watched folders whose
+    # contents changed. Local folders are watched with inotify, network shares and other platforms are
+    # polled: a stat per folder each WATCH_POLL_INTERVAL and a listing only when its mtime moved.
+    # Changes are coalesced per path and handed to callback, from the watcher's thread, once nothing
+    # changed for WATCH_DEBOUNCE seconds or WATCH_MAX_DELAY after the first of them.
+    def __init__(self, callback, debounce=WATCH_DEBOUNCE, max_delay=WATCH_MAX_DELAY, poll_interval=WATCH_POLL_INTERVAL,
+                 backend=WATCH_BACKEND, max_dirs=WATCH_MAX_DIRS):
+        self._callback = callback
+        self._debounce = debounce
+        self._max_delay = max_delay
+        self._poll_interval = poll_interval
+        self._backend = backend
+        self._max_dirs = max_dirs
+        self._lock = threading.Lock()
+        self._wanted = set()
+        self._changed = False
+        self._stop = threading.Event()
+        self._thread = None
+        self._inotify = None
+        self._watches = {}
+        self._watched = {}
+        self._polled = {}
+        self._next_poll = float()
+        self._pending = collections.OrderedDict()
+        self._entries = collections.Counter()
+        self._first = None
+        self._last = None
+
+    def watch(self, paths):
+        # Replaces the watched folders, the watcher thread catches up within its next tick.
+        paths = set(_normalize(path) for path in paths if path)
+        if len(paths) > self._max_dirs:
+            logging.warning("Watching %s of %s folders", self._max_dirs, len(paths))
+            paths = set(sorted(paths)[:self._max_dirs])
+        with self._lock:
+            self._wanted = paths
+            self._changed = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="DirectoryWatcher")
+                self._thread.daemon = True
+                self._thread.start()
+
+    def close(self):
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def _run(self):
+        if self._backend != "poll":
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as err:
+                logging.info("Polling for folder changes, inotify is unavailable: %s", err)
+        tick = min(self._debounce, self._poll_interval) / 2
+        try:
+            while not self._stop.is_set():
+                try:
+                    self._tick(tick)
+                except Exception as err:
+                    # The folders are synced again after a pause rather than the watcher giving up.
+                    logging.error("Folder watcher error: %s", err)
+                    with self._lock:
+                        self._changed = True
+                    self._stop.wait(self._poll_interval)
+        finally:
+            if self._inotify is not None:
+                self._inotify.close()
+                self._inotify = None
+            self._watches = {}
+            self._watched = {}
+            self._polled = {}
+            with self._lock:
+                # A later watch() starts a new thread.
+                self._thread = None
+                self._changed = True
+
+    def _tick(self, timeout):
+        self._sync()
+        if self._inotify is not None:
+            ready = select.select([self._inotify.fd], [], [], timeout)[0]
+            if ready:
+                self._read()
+        else:
+            self._stop.wait(timeout)
+        if time.time() >= self._next_poll:
+            self._poll()
+            self._next_poll = time.time() + self._poll_interval
+        self._flush()
+
+    def _sync(self):
+        with self._lock:
+            if not self._changed:
+                return
+            wanted = set(self._wanted)
+            self._changed = False
+        for path in set(self._watched) - wanted:
+            wd = self._watched.pop(path)
+            self._watches.pop(wd, None)
+            self._inotify.remove(wd)
+        for path in set(self._polled) - wanted:
+            del self._polled[path]
+        for path in wanted - set(self._watched) - set(self._polled):
+            if self._inotify is not None and not is_network_path(path):
+                try:
+                    wd = self._inotify.add(path)
+                    self._watches[wd] = path
+                    self._watched[path] = wd
+                    continue
+                except OSError as err:
+                    if err.errno in (errno.ENOENT, errno.ENOTDIR):
+                        continue
+                    logging.warning("Polling %s, it could not be watched: %s", path, err)
+            snapshot = self._snapshot(path)
+            if snapshot is not None:
+                self._polled[path] = snapshot
+
+    @staticmethod
+    def _snapshot(path):
+        try:
+            mtime = os.stat(path).st_mtime
+            return mtime, set(os.listdir(path))
+        except OSError:
+            return None
+
+    def _read(self):
+        for wd, mask, name in self._inotify.read():
+            if mask & _IN_Q_OVERFLOW:
+                logging.warning("Folder change events were lost, the watched folders will be listed again")
+                for path in self._watched:
+                    self._add(path, "rescan")
+                continue
+            path = self._watches.get(wd)
+            if path is None:
+                continue
+            if mask & _IN_IGNORED:
+                del self._watches[wd]
+                if self._watched.get(path) == wd:
+                    del self._watched[path]
+            elif mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                self._add(path, "deleted")
+            elif mask & (_IN_CREATE | _IN_MOVED_TO):
+                self._add(path, "modified")
+                self._add(posixpath.join(path, name), "created", path)
+            elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                self._add(path, "modified")
+                self._add(posixpath.join(path, name), "deleted", path)
+
+    def _poll(self):
+        for path, (mtime, names) in list(self._polled.items()):
+            snapshot = self._snapshot(path)
+            if snapshot is None:
+                del self._polled[path]
+                self._add(path, "deleted")
+                continue
+            if snapshot[0] == mtime:
+                continue
+            self._polled[path] = snapshot
+            self._add(path, "modified")
+            for name in snapshot[1] - names:
+                self._add(posixpath.join(path, name), "created", path)
+            for name in names - snapshot[1]:
+                self._add(posixpath.join(path, name), "deleted", path)
+
+    def _add(self, path, kind, parent=None):
+        # A path created then deleted is deleted, deleted then created is created, either one outweighs
+        # a modification and a rescan outweighs everything. A burst of entries changing in one folder,
+        # renders writing frames, collapses into a single rescan of the folder.
+        if parent is not None:
+            if self._pending.get(parent) == "rescan":
+                return
+            self._entries[parent] += 1
+            if self._entries[parent] > WATCH_MAX_ENTRIES:
+                for entry in [entry for entry in self._pending if posixpath.dirname(entry) == parent]:
+                    del self._pending[entry]
+                path, kind = parent, "rescan"
+        previous = self._pending.get(path)
+        if previous == "rescan" or (kind == "modified" and previous in ("created", "deleted")):
+            return
+        self._pending[path] = kind
+        now = time.time()
+        if self._first is None:
+            self._first = now
+        self._last = now
+
+    def _flush(self):
+        now = time.time()
+        if not self._pending or (now - self._last < self._debounce and now - self._first < self._max_delay):
+            return
+        pending, self._pending = self._pending, collections.OrderedDict()
+        self._entries.clear()
+        self._first = self._last = None
+        events = []
+        for path, kind in pending.items():
+            mtime = None
+            if kind != "deleted":
+                try:
+                    mtime = os.stat(path).st_mtime
+                except OSError:
+                    kind = "deleted"
+            events.append(WatchEvent(path, kind, mtime))
+        try:
+            self._callback(events)
+        except Exception as err:
+            logging.error(err)